@@ -9,6 +9,10 @@ from datetime import datetime, timedelta
 
 from django.core.management.base import BaseCommand, CommandError
 
+from pipeline import http_client
+from pipeline.runs import recorded_run
+from report_dashboard.status import record_availability
+
 def extract_date_from_filename(filename):
     # ... (this function is unchanged) ...
     patterns = [
@@ -112,6 +116,7 @@ class Command(BaseCommand):
             help='Merge reports for a specific date in YYYY-MM-DD format. Defaults to today.'
         )
 
+    @recorded_run('merge_reports')
     def handle(self, *args, **options):
         # NEW: Determine the target date dynamically
         date_str_option = options.get('date')
@@ -124,6 +129,7 @@ class Command(BaseCommand):
         else:
             # Default to today if no date is provided
             target_datetime = datetime.now()
+        self.pipeline_run.target_date = target_datetime.date()
 
         # The date for finding report files
         target_date_str = target_datetime.strftime('%Y-%m-%d')
@@ -193,7 +199,7 @@ class Command(BaseCommand):
         headers = {"Content-Type": "application/json"}
         try:
             self.stdout.write(f"\nAttempting to push data to: {api_url_with_date}...")
-            response = requests.post(api_url_with_date, headers=headers, json=merged_data, timeout=30)
+            response = http_client.post(api_url_with_date, headers=headers, json=merged_data)
             if response.status_code in [200, 201]:
                 self.stdout.write(self.style.SUCCESS(f"✅ Successfully pushed data to API. Status Code: {response.status_code}"))
                 self.stdout.write(f"Response text: {response.text}")
@@ -220,6 +226,9 @@ class Command(BaseCommand):
             filename = f'merged_reports_{timestamp}.json'
 
         output_path = os.path.join(output_dir, filename)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_data, f, indent=2, ensure_ascii=False)
+        with self.timings.stage('json_write'):
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(merged_data, f, indent=2, ensure_ascii=False)
+        # Same date the file name carries (save_date, or today for timestamped runs)
+        record_availability('merge_reports', datetime.strptime(save_date, '%Y-%m-%d').date() if date_str_option else datetime.now().date())
         self.stdout.write(self.style.SUCCESS(f"\nMerged latest reports for {report_date} saved to {output_path}"))
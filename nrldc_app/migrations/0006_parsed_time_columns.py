@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nrldc_app', '0005_rename_demand_met_at_max_requirement_nrldc2cdata_demand_met_max_req_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nrldc2cdata',
+            name='time_ace_max_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nrldc2cdata',
+            name='time_ace_min_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nrldc2cdata',
+            name='time_max_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nrldc2cdata',
+            name='time_max_req_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nrldc2cdata',
+            name='time_min_demand_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='nrldc2cdata',
+            index=models.Index(fields=['time_max_at'], name='nrldc2c_time_max_at_idx'),
+        ),
+    ]
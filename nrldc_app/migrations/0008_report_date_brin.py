@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nrldc_app', '0007_backfill_parsed_times'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='nrldc2adata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='nrldc2a_report_date_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='nrldc2cdata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='nrldc2c_report_date_brin'),
+        ),
+    ]
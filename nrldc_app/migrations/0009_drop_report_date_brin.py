@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nrldc_app', '0008_report_date_brin'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='nrldc2adata',
+            name='nrldc2a_report_date_brin',
+        ),
+        migrations.RemoveIndex(
+            model_name='nrldc2cdata',
+            name='nrldc2c_report_date_brin',
+        ),
+    ]
@@ -52,6 +52,13 @@ class Nrldc2CData(models.Model):
     time_ace_max = models.CharField(max_length=50, null=True, blank=True)
     time_ace_min = models.CharField(max_length=50, null=True, blank=True)
 
+    # Parsed times of day of the text time columns (NULL when the text is not a time)
+    time_max_at = models.TimeField(null=True, blank=True)
+    time_max_req_at = models.TimeField(null=True, blank=True)
+    time_min_demand_at = models.TimeField(null=True, blank=True)
+    time_ace_max_at = models.TimeField(null=True, blank=True)
+    time_ace_min_at = models.TimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -61,3 +68,4 @@ class Nrldc2CData(models.Model):
         verbose_name = "Table 2C Data"
         verbose_name_plural = "Table 2C Data"
         unique_together = ('report_date', 'state')
+        indexes = [models.Index(fields=['time_max_at'], name='nrldc2c_time_max_at_idx')]
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import PipelineRun
+
+
+@admin.register(PipelineRun)
+class PipelineRunAdmin(admin.ModelAdmin):
+    list_display = (
+        'script_name',
+        'target_date',
+        'status',
+        'started_at',
+        'duration_seconds',
+        'bytes_downloaded',
+        'rows_written',
+    )
+    list_filter = ('status', 'script_name')
+    date_hierarchy = 'started_at'
+    ordering = ('-started_at',)
@@ -0,0 +1,158 @@
+"""
+High-volume upserts through PostgreSQL COPY, for loading years of history.
+
+copy_upsert() is the bulk counterpart of pipeline.ingest.bulk_upsert(): instead
+of building model instances and INSERT statements, rows are streamed as COPY
+text into a temporary staging table (CREATE TEMP TABLE ... AS SELECT ... WITH NO
+DATA, dropped on commit) and merged into the target table with a single
+
+    INSERT INTO target SELECT DISTINCT ON (key) ... FROM staging
+    ON CONFLICT (key) DO UPDATE SET ...
+
+Rows are consumed lazily from any iterable, so a multi-year backfill is never
+held in memory. As with bulk_upsert(), the last row per key wins, rows with an
+empty key are skipped and auto_now_add columns keep their value on update.
+"""
+import datetime
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.db.models import DateTimeField
+from django.utils import timezone
+
+from pipeline.ingest import DEFAULT_UNIQUE_FIELDS, UpsertResult
+
+STAGING_TABLE = 'copy_load_staging'
+SEQ_COLUMN = '_copy_seq'
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_text(value):
+    """One value in COPY text format (\\N for NULL)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, float):
+        return repr(value) if value == value else '\\N'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, (datetime.date, datetime.time)):
+        value = value.isoformat()
+    return str(value).translate(COPY_ESCAPES)
+
+
+class _CopyStream:
+    """Read-only file object over COPY lines, as psycopg2's copy_expert() expects."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.buffer = b''
+        self.rows = 0
+
+    def read(self, size=-1):
+        parts, length = [self.buffer], len(self.buffer)
+        while size < 0 or length < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            data = line.encode('utf-8')
+            parts.append(data)
+            length += len(data)
+            self.rows += 1
+        data = b''.join(parts)
+        if size < 0:
+            self.buffer = b''
+            return data
+        data, self.buffer = data[:size], data[size:]
+        return data
+
+
+def _columns(model):
+    """Concrete non-primary-key fields and a {name: value} dict of the values rows may omit."""
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    now = timezone.now()
+    fallback = {}
+    for f in fields:
+        if isinstance(f, DateTimeField) and (f.auto_now or f.auto_now_add):
+            fallback[f.name] = now
+        elif f.has_default():
+            fallback[f.name] = f.get_default()
+        else:
+            fallback[f.name] = None
+    return fields, fallback
+
+
+def _copy(cursor, sql, stream):
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):  # psycopg2
+        raw.copy_expert(sql, stream, size=256 * 1024)
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            while data := stream.read(256 * 1024):
+                copy.write(data)
+
+
+def copy_upsert(model, rows, unique_fields=DEFAULT_UNIQUE_FIELDS, update_fields=None, using=None):
+    """
+    COPY rows (dicts of model field values) into a staging table and upsert them into model.
+
+    unique_fields must be covered by a unique constraint on the model. update_fields
+    defaults to every column outside the key except auto_now_add ones. Returns an
+    UpsertResult; PostgreSQL only.
+    """
+    using = using or 'default'
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise ImproperlyConfigured("copy_upsert() needs PostgreSQL; use pipeline.ingest.bulk_upsert() instead.")
+
+    fields, fallback = _columns(model)
+    names = [f.name for f in fields]
+    if update_fields is None:
+        update_fields = [
+            f.name for f in fields
+            if f.name not in unique_fields and not getattr(f, 'auto_now_add', False)
+        ]
+
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    columns = [qn(f.column) for f in fields]
+    column_of = {f.name: qn(f.column) for f in fields}
+    keys = [column_of[name] for name in unique_fields]
+    column_list = ', '.join(columns)
+
+    def lines():
+        for row in rows:
+            yield '\t'.join(copy_text(row.get(name, fallback[name])) for name in names) + '\n'
+
+    stream = _CopyStream(lines())
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {table} WITH NO DATA"
+        )
+        # Staging order, so DISTINCT ON keeps the last row per key
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE} ADD COLUMN {SEQ_COLUMN} bigserial")
+        _copy(cursor, f"COPY {STAGING_TABLE} ({column_list}) FROM STDIN", stream)
+
+        key_list = ', '.join(keys)
+        not_null = ' AND '.join(f"{key} IS NOT NULL AND {key}::text <> ''" for key in keys)
+        if update_fields:
+            conflict = "DO UPDATE SET " + ', '.join(
+                f"{column_of[name]} = EXCLUDED.{column_of[name]}" for name in update_fields
+            )
+        else:
+            conflict = "DO NOTHING"
+        cursor.execute(
+            f"WITH merged AS ("
+            f"  INSERT INTO {table} ({column_list})"
+            f"  SELECT DISTINCT ON ({key_list}) {column_list} FROM {STAGING_TABLE}"
+            f"  WHERE {not_null} ORDER BY {key_list}, {SEQ_COLUMN} DESC"
+            f"  ON CONFLICT ({key_list}) {conflict}"
+            f"  RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+        inserted, updated = cursor.fetchone()
+    return UpsertResult(inserted, updated, stream.rows - inserted - updated)
@@ -0,0 +1,108 @@
+"""
+JVM-free table readers that return the same shape as tabula.read_pdf.
+
+Both readers return a list of DataFrames (one per detected table) so the region
+commands can concatenate and slice them exactly as they do with tabula output.
+Cells that are empty in the PDF become NaN, like tabula's pandas output.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _page_indexes(pages, page_count):
+    """Convert tabula's pages option ('all', int or list of 1-based ints) to 0-based indexes."""
+    if pages in (None, 'all'):
+        return list(range(page_count))
+    if isinstance(pages, (int, np.integer)):
+        pages = [pages]
+    elif isinstance(pages, str):
+        pages = [int(p) for p in pages.split(',') if p.strip()]
+    return [int(p) - 1 for p in pages if 0 < int(p) <= page_count]
+
+
+def _rows_to_frame(rows, pandas_options=None):
+    """Build a DataFrame from a list of row lists, honouring tabula's header handling."""
+    rows = [row for row in rows if row and any(cell not in (None, '') for cell in row)]
+    if not rows:
+        return None
+    width = max(len(row) for row in rows)
+    cleaned = [
+        [np.nan if cell in (None, '') else str(cell) for cell in row] + [np.nan] * (width - len(row))
+        for row in rows
+    ]
+    header = (pandas_options or {}).get('header', 'infer')
+    if header is None:
+        return pd.DataFrame(cleaned)
+    columns = [
+        f"Unnamed: {idx}" if pd.isna(cell) else cell
+        for idx, cell in enumerate(cleaned[0])
+    ]
+    return pd.DataFrame(cleaned[1:], columns=columns)
+
+
+def read_pdf_pdfplumber(pdf_path, pages='all', lattice=True, pandas_options=None, **ignored):
+    """Read tables with pdfplumber. lattice=True uses ruling lines, like tabula's lattice mode."""
+    import pdfplumber
+
+    strategy = 'lines' if lattice else 'text'
+    table_settings = {'vertical_strategy': strategy, 'horizontal_strategy': strategy}
+    tables = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for idx in _page_indexes(pages, len(pdf.pages)):
+            for rows in pdf.pages[idx].extract_tables(table_settings):
+                df = _rows_to_frame(rows, pandas_options)
+                if df is not None:
+                    tables.append(df)
+    return tables
+
+
+def _cluster(values, tolerance):
+    """Group sorted coordinates that lie within tolerance of each other; return each group's first value."""
+    anchors = []
+    for value in sorted(values):
+        if not anchors or value - anchors[-1][-1] > tolerance:
+            anchors.append([value])
+        else:
+            anchors[-1].append(value)
+    return [group[0] for group in anchors]
+
+
+def read_pdf_pypdfium2(pdf_path, pages='all', pandas_options=None, row_tolerance=3.0, column_tolerance=6.0, **ignored):
+    """
+    Read one text grid per page with pypdfium2.
+
+    PDFium has no table detection, so text runs are grouped into rows by their
+    vertical position and into columns by clustering their left edges. This is
+    closer to tabula's stream mode than lattice mode.
+    """
+    import pypdfium2 as pdfium
+
+    tables = []
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for idx in _page_indexes(pages, len(pdf)):
+            textpage = pdf[idx].get_textpage()
+            runs = []
+            for rect_idx in range(textpage.count_rects()):
+                left, bottom, right, top = textpage.get_rect(rect_idx)
+                text = textpage.get_text_bounded(left=left, bottom=bottom, right=right, top=top).strip()
+                if text:
+                    runs.append(((top + bottom) / 2, left, text))
+            if not runs:
+                continue
+
+            row_anchors = _cluster([-y for y, _, _ in runs], row_tolerance)
+            col_anchors = _cluster([x for _, x, _ in runs], column_tolerance)
+            grid = [[''] * len(col_anchors) for _ in row_anchors]
+            for y, x, text in runs:
+                r = np.searchsorted(row_anchors, -y, side='right') - 1
+                c = np.searchsorted(col_anchors, x + column_tolerance / 2, side='right') - 1
+                cell = grid[max(r, 0)][max(c, 0)]
+                grid[max(r, 0)][max(c, 0)] = f"{cell} {text}".strip()
+
+            df = _rows_to_frame(grid, pandas_options)
+            if df is not None:
+                tables.append(df)
+    finally:
+        pdf.close()
+    return tables
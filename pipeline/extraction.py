@@ -0,0 +1,254 @@
+"""
+Shared PDF table extraction for the region commands.
+
+tabula.read_pdf starts a Java VM for every call, which costs more than the
+actual table detection on our PSP reports. When a `tabula_worker` process is
+running (python manage.py tabula_worker) the PDF is submitted to it and parsed
+by a JVM that stays warm between reports. If the worker cannot be reached we
+fall back to calling tabula in this process, exactly as before. The worker
+unpickles what it receives, so it only runs with a TABULA_WORKER_AUTHKEY set
+in the environment; without one the commands read in-process.
+
+Before tabula runs, the PDF text layer is scanned for the table title markers
+so lattice detection only runs on the pages that hold the tables we keep.
+
+The engine can be switched to a JVM-free reader (pdfplumber or pypdfium2, see
+pipeline/engines.py) with the commands' --engine flag or the
+PDF_EXTRACTION_ENGINE setting. Extracted tables are cached by PDF content hash
+(pipeline/table_cache.py) unless --no-cache is given.
+"""
+import logging
+import os
+import re
+from multiprocessing.connection import Client
+
+import pandas as pd
+from django.conf import settings
+
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    PdfReader = None
+
+from pipeline.engines import read_pdf_pdfplumber, read_pdf_pypdfium2
+from pipeline.table_cache import TableCache, file_sha256
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('tabula', 'pdfplumber', 'pypdfium2')
+
+DEFAULT_WORKER_ADDRESS = ('127.0.0.1', 8765)
+# The old hardcoded default, public in this repository; never accepted as a key
+PUBLIC_WORKER_AUTHKEY = 'tabula-worker'
+
+
+class WorkerUnavailable(Exception):
+    """The tabula worker could not be reached or dropped the connection."""
+
+
+def worker_address():
+    host, port = getattr(settings, 'TABULA_WORKER_ADDRESS', DEFAULT_WORKER_ADDRESS)
+    return host, int(port)
+
+
+def worker_authkey():
+    """The worker's shared secret, or None when TABULA_WORKER_AUTHKEY is unset (or the public default)."""
+    key = str(getattr(settings, 'TABULA_WORKER_AUTHKEY', '') or '')
+    if key in ('', PUBLIC_WORKER_AUTHKEY):
+        return None
+    return key.encode('utf-8')
+
+
+def read_pdf_local(pdf_path, force_subprocess=False, **options):
+    """Run tabula in the current process (jpype if available, else a java subprocess)."""
+    from tabula.io import read_pdf
+
+    return read_pdf(pdf_path, force_subprocess=force_subprocess, **options)
+
+
+def read_pdf_via_worker(pdf_path, timeout=None, **options):
+    """Submit pdf_path to the running tabula worker and return its list of DataFrames."""
+    authkey = worker_authkey()
+    if authkey is None:
+        raise WorkerUnavailable("TABULA_WORKER_AUTHKEY is not set, so the tabula worker is not used")
+    try:
+        conn = Client(worker_address(), authkey=authkey)
+    except OSError as e:
+        raise WorkerUnavailable(f"tabula worker not reachable at {worker_address()}: {e}") from e
+
+    try:
+        conn.send({'pdf_path': os.path.abspath(pdf_path), 'options': options})
+        if timeout is not None and not conn.poll(timeout):
+            raise WorkerUnavailable(f"tabula worker did not answer within {timeout}s")
+        status, payload = conn.recv()
+    except (EOFError, OSError) as e:
+        raise WorkerUnavailable(f"tabula worker dropped the connection: {e}") from e
+    finally:
+        conn.close()
+
+    if status != 'ok':
+        raise RuntimeError(payload)
+    return payload
+
+
+def read_pdf_tabula(pdf_path, **options):
+    """
+    Read tables with tabula, preferring the warm worker.
+
+    settings.TABULA_MODE selects the strategy:
+      'auto'       - use the warm worker when it is running, otherwise read locally (default)
+      'worker'     - require the worker, fail if it is not running
+      'local'      - always read in this process
+      'subprocess' - always read in this process with a fresh java subprocess
+    """
+    mode = getattr(settings, 'TABULA_MODE', 'auto')
+
+    if mode in ('auto', 'worker'):
+        try:
+            return read_pdf_via_worker(pdf_path, timeout=getattr(settings, 'TABULA_WORKER_TIMEOUT', None), **options)
+        except WorkerUnavailable as e:
+            if mode == 'worker':
+                raise
+            logger.info("%s; falling back to in-process tabula.", e)
+
+    return read_pdf_local(pdf_path, force_subprocess=(mode == 'subprocess'), **options)
+
+
+def resolve_engine(engine=None):
+    """Return the engine name to use: the explicit one, else settings.PDF_EXTRACTION_ENGINE."""
+    engine = engine or getattr(settings, 'PDF_EXTRACTION_ENGINE', 'tabula')
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown extraction engine '{engine}'. Choose one of: {', '.join(ENGINES)}.")
+    return engine
+
+
+def add_extraction_arguments(parser):
+    """Add the --engine and --no-cache options shared by the region commands."""
+    parser.add_argument(
+        '--engine',
+        dest='engine',
+        choices=ENGINES,
+        required=False,
+        help='PDF table extraction engine. Defaults to settings.PDF_EXTRACTION_ENGINE (tabula).'
+    )
+    parser.add_argument(
+        '--no-cache',
+        dest='no_cache',
+        action='store_true',
+        help='Ignore the extracted-table cache and always re-extract the PDF.'
+    )
+
+
+def read_pdf_tables(pdf_path, engine=None, **options):
+    """
+    Drop-in replacement for tabula.read_pdf used by all region commands.
+
+    Accepts tabula's options; the pdfplumber and pypdfium2 engines honour pages,
+    lattice and pandas_options and ignore the rest.
+    """
+    engine = resolve_engine(engine)
+    if engine == 'pdfplumber':
+        return read_pdf_pdfplumber(pdf_path, **options)
+    if engine == 'pypdfium2':
+        return read_pdf_pypdfium2(pdf_path, **options)
+    return read_pdf_tabula(pdf_path, **options)
+
+
+def _normalize_text(text):
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+def find_table_pages(pdf_path, markers):
+    """
+    Locate the pages that hold the tables described by markers using the PDF text layer.
+
+    markers is a list of (start_marker, end_marker) regex pairs (end_marker may be None).
+    Each table contributes every page from the one containing its start marker up to
+    the one containing its end marker. Returns a sorted list of 1-based page numbers,
+    or None when the text layer cannot be read or a start marker is not found, in which
+    case callers should extract all pages.
+    """
+    if PdfReader is None:
+        return None
+    try:
+        reader = PdfReader(pdf_path)
+        page_texts = []
+        for page in reader.pages:
+            try:
+                page_texts.append(_normalize_text(page.extract_text() or ""))
+            except Exception:
+                page_texts.append("")
+    except Exception as e:
+        logger.warning("Could not read text layer of %s: %s", pdf_path, e)
+        return None
+
+    def first_page(pattern, start=0):
+        regex = re.compile(pattern, re.IGNORECASE)
+        for idx in range(start, len(page_texts)):
+            if regex.search(page_texts[idx]):
+                return idx
+        return None
+
+    pages = set()
+    for start_marker, end_marker in markers:
+        start_page = first_page(start_marker)
+        if start_page is None:
+            return None
+        end_page = first_page(end_marker, start_page) if end_marker else None
+        if end_page is None:
+            # Without an end marker keep the next page too, in case the table runs over.
+            end_page = min(start_page + 1, len(page_texts) - 1) if end_marker else start_page
+        pages.update(range(start_page + 1, end_page + 2))
+    return sorted(pages)
+
+
+def _tables_contain(tables, patterns):
+    """True if every pattern matches at least one cell (or column label) of the extracted tables."""
+    cells = []
+    for df in tables or []:
+        cells.extend(str(c) for c in df.columns)
+        cells.extend(df.astype(str).to_numpy().ravel().tolist())
+    if not cells:
+        return False
+    cell_series = pd.Series(cells).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return all(cell_series.str.contains(p, regex=True, case=False, na=False).any() for p in patterns)
+
+
+def read_tables_for_markers(pdf_path, markers, engine=None, use_cache=True, pdf_sha256=None, **options):
+    """
+    Extract only the pages that contain the tables described by markers.
+
+    Falls back to all pages when the text layer gives no answer, or when the targeted
+    pages do not contain every start marker once tabula has parsed them.
+    Results are served from / stored in the table cache unless use_cache is False;
+    pass pdf_sha256 when the content hash is already known to skip re-hashing.
+    """
+    engine = resolve_engine(engine)
+    if not use_cache:
+        return _read_tables_for_markers(pdf_path, markers, engine, **options)
+
+    cache = TableCache()
+    key = cache.key(pdf_sha256 or file_sha256(pdf_path), engine, markers=markers, **options)
+    tables = cache.get(key)
+    if tables is not None:
+        logger.info("Table cache hit for %s", pdf_path)
+        return tables
+
+    tables = _read_tables_for_markers(pdf_path, markers, engine, **options)
+    if tables:
+        try:
+            cache.put(key, tables)
+        except Exception as e:
+            logger.warning("Could not write table cache entry for %s: %s", pdf_path, e)
+    return tables
+
+
+def _read_tables_for_markers(pdf_path, markers, engine, **options):
+    pages = find_table_pages(pdf_path, markers)
+    if pages is not None:
+        logger.info("Extracting pages %s of %s", pages, pdf_path)
+        tables = read_pdf_tables(pdf_path, engine=engine, **dict(options, pages=pages))
+        if _tables_contain(tables, [start for start, _ in markers]):
+            return tables
+        logger.warning("Targeted pages %s of %s did not contain every table; extracting all pages.", pages, pdf_path)
+    return read_pdf_tables(pdf_path, engine=engine, **dict(options, pages='all'))
@@ -0,0 +1,108 @@
+"""
+Feed pipeline.MetricFact from the rows each command writes to its wide tables.
+
+region_facts() turns NRLDC/SRLDC/WRLDC 2A/2C rows into facts with the state as
+the entity; posoco_facts() turns POSOCO rows (one per category/fuel) into one
+fact per region column. record_facts() upserts them on the fact table's unique
+key and deletes the table's other stored facts for the (source, report_date)
+pairs the ingest covered, so rerunning a date replaces that date's values (also
+when it now yields none), and refreshes the dates'
+DailyRollup rows after commit. upsert_with_facts() writes a wide table and its
+facts in one transaction.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import Q
+
+from pipeline.ingest import bulk_upsert
+from pipeline.models import MetricFact
+from pipeline.rollups import schedule_rollup_refresh
+from pipeline.table_specs import STATE_FIELD, normalize_label
+
+FACT_KEY = ('source', 'report_date', 'entity', 'metric')
+
+
+def _value(value):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def region_facts(spec, rows):
+    """Facts for rows (dicts with report_date, state and model fields) of a region TableSpec."""
+    facts = []
+    for row in rows:
+        entity = normalize_label(row.get(STATE_FIELD) or '')
+        if not entity:
+            continue
+        for field, metric in spec.metrics.items():
+            value = _value(row.get(field))
+            if value is not None:
+                facts.append({
+                    'source': spec.region, 'report_date': row['report_date'],
+                    'entity': entity, 'metric': metric, 'value': value,
+                })
+    return facts
+
+
+def posoco_facts(spec, rows, key_field):
+    """Facts for POSOCO rows; key_field holds the row key (category / fuel_type)."""
+    facts = []
+    for row in rows:
+        metric = spec.metrics.get(row.get(key_field))
+        if metric is None:
+            continue
+        for field, entity in spec.entity_fields.items():
+            value = _value(row.get(field))
+            if value is not None:
+                facts.append({
+                    'source': 'posoco', 'report_date': row['report_date'],
+                    'entity': entity, 'metric': metric, 'value': value,
+                })
+    return facts
+
+
+def stale_facts(facts, metrics, scope):
+    """
+    Stored facts of the (source, report_date) pairs in scope whose metric is one of
+    metrics but which facts no longer contain, as (id, fact dict) pairs.
+    """
+    keys = {tuple(fact[field] for field in FACT_KEY) for fact in facts}
+    scope = set(scope)
+    if not scope or not metrics:
+        return []
+    within = Q()
+    for source, report_date in scope:
+        within |= Q(source=source, report_date=report_date)
+    stored = MetricFact.objects.filter(within, metric__in=set(metrics)).values_list('id', *FACT_KEY)
+    return [(pk, dict(zip(FACT_KEY, key))) for pk, *key in stored if tuple(key) not in keys]
+
+
+def record_facts(facts, metrics, scope):
+    """
+    Upsert facts and delete the stale ones (see stale_facts()) in one transaction.
+    metrics are the metrics the table behind facts produces, so the facts of other
+    tables of the same source and date are left alone; scope holds the (source,
+    report_date) pairs the ingest covered, whether or not they yielded facts.
+    """
+    facts = list(facts)
+    with transaction.atomic():
+        stale = stale_facts(facts, metrics, scope)
+        if stale:
+            MetricFact.objects.filter(id__in=[pk for pk, _ in stale]).delete()
+        result = bulk_upsert(MetricFact, facts, unique_fields=FACT_KEY, update_fields=['value', 'updated_at'])
+    schedule_rollup_refresh(facts + [fact for _, fact in stale])
+    return result
+
+
+def upsert_with_facts(model, rows, facts, metrics, scope, **kwargs):
+    """bulk_upsert() rows into model and record their facts (see record_facts()) in the same transaction."""
+    with transaction.atomic():
+        result = bulk_upsert(model, rows, **kwargs)
+        record_facts(facts, metrics, scope)
+    return result
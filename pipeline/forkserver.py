@@ -0,0 +1,67 @@
+"""
+Warm parent process that forks a child per job.
+
+Starting `python manage.py nrldc_project` spends seconds on django.setup() and on
+importing pandas, requests, tabula and the pipeline before any work starts.
+warm_up() pays that once in a long-lived parent: it imports PRELOAD_MODULES and
+instantiates the dashboard's management commands. start_forked() then runs a
+job in a forked child, which inherits all of it and starts in milliseconds; its
+memory, open files and any JVM it started go away when it exits.
+
+Forking needs the 'fork' start method (Linux, macOS), so fork_context() raises
+ValueError elsewhere. The parent must not hold a database connection across a
+fork: start_forked() closes them first, and the child opens its own.
+"""
+import importlib
+import logging
+import multiprocessing
+import signal
+
+from django.core.management import get_commands, load_command_class
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Heavy imports shared by the region commands
+PRELOAD_MODULES = (
+    'pandas',
+    'requests',
+    'tabula',
+    'pipeline.extraction',
+    'pipeline.ingest',
+    'pipeline.table_parser',
+    'pipeline.facts',
+)
+
+
+def warm_up(command_names):
+    """Import PRELOAD_MODULES and load the given management commands; returns {name: command instance}."""
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.info("Not preloading %s: %s", module, e)
+    commands = get_commands()
+    return {name: load_command_class(commands[name], name) for name in command_names if name in commands}
+
+
+def fork_context():
+    return multiprocessing.get_context('fork')
+
+
+def _child(target, args):
+    # Default signal handling and fresh database connections; the parent's are not ours
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    connections.close_all()
+    try:
+        target(*args)
+    finally:
+        connections.close_all()
+
+
+def start_forked(target, *args, name=None):
+    """Run target(*args) in a child forked from this (warmed-up) process and return the started Process."""
+    connections.close_all()
+    process = fork_context().Process(target=_child, args=(target, args), name=name)
+    process.start()
+    return process
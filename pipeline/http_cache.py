@@ -0,0 +1,183 @@
+"""
+On-disk HTTP cache for the report PDFs, revalidated with conditional GETs.
+
+For every URL the cache keeps the last downloaded body together with the
+response's ETag / Last-Modified. The next download of the same URL sends
+If-None-Match / If-Modified-Since; on 304 Not Modified the cached bytes are
+copied to the destination instead of being transferred again. Responses that
+carry neither validator are downloaded normally and not cached.
+
+Cache keys ignore the `cachebust` query parameter that POSOCO appends, so a
+rerun or backfill of the same file still revalidates against the old entry.
+The cache is bounded by settings.HTTP_CACHE_MAX_BYTES with least recently used
+eviction, like pipeline/table_cache.py. Hits and misses are counted in `stats`.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import Counter, namedtuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+
+from pipeline import http_client
+from pipeline.streaming import DEFAULT_CHUNK_SIZE, copy_file, stream_to_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join('downloads', 'http_cache')
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+IGNORED_QUERY_PARAMS = frozenset(['cachebust'])
+
+# Process-wide counters: 'hits', 'misses' and 'bytes' fetched from the network.
+stats = Counter()
+
+# Result of download(): where the file is, its SHA-256 and whether the cached copy was reused.
+Download = namedtuple('Download', ['path', 'sha256', 'from_cache'])
+
+
+def cache_url(url):
+    """url without the cache-busting query parameters, used as the cache key."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in IGNORED_QUERY_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class HttpCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or getattr(settings, 'HTTP_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(settings, 'HTTP_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    def key(self, url):
+        return hashlib.sha256(cache_url(url).encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return f"{base}.body", f"{base}.json"
+
+    def lookup(self, url):
+        """Validators and body path of the cached response for url, or None."""
+        body_path, meta_path = self._paths(self.key(url))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable HTTP cache entry %s: %s", meta_path, e)
+            _remove(meta_path)
+            _remove(body_path)
+            return None
+        if not os.path.exists(body_path):
+            _remove(meta_path)
+            return None
+        meta['body_path'] = body_path
+        return meta
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta and meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta and meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, response_headers, file_path):
+        """Cache file_path as the body of url if the response carried a validator."""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        body_path, meta_path = self._paths(self.key(url))
+        copy_file(file_path, body_path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                json.dump({'url': cache_url(url), 'etag': etag, 'last_modified': last_modified}, fh)
+            os.replace(tmp_path, meta_path)
+        except Exception:
+            _remove(tmp_path)
+            raise
+        self.evict()
+        return True
+
+    def touch(self, meta):
+        try:
+            os.utime(meta['body_path'])
+        except OSError:
+            pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        try:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith('.body'):
+                    continue
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except FileNotFoundError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            _remove(path[:-len('.body')] + '.json')
+            _remove(path)
+            total -= size
+            logger.info("Evicted HTTP cache entry %s", path)
+
+
+def download(url, dest_path, headers=None, cache=None, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    Stream url to dest_path through the HTTP cache and return a Download.
+
+    The body is hashed while it is written and renamed into place atomically
+    (pipeline/streaming.py). from_cache is True when the server answered 304 and
+    the cached copy was reused. Non-2xx responses raise HTTPError via
+    raise_for_status(), exactly like a plain http_client.get().
+    """
+    enabled = getattr(settings, 'HTTP_CACHE_ENABLED', True)
+    cache = cache or HttpCache()
+    meta = cache.lookup(url) if enabled else None
+    request_headers = dict(headers or {})
+    request_headers.update(cache.conditional_headers(meta))
+
+    response = http_client.get(url, headers=request_headers, stream=True, **kwargs)
+    try:
+        if response.status_code == 304 and meta:
+            sha256 = copy_file(meta['body_path'], dest_path, chunk_size)
+            cache.touch(meta)
+            stats['hits'] += 1
+            logger.info("HTTP cache hit (304) for %s", url)
+            return Download(dest_path, sha256, True)
+
+        response.raise_for_status()
+        sha256 = stream_to_file(response.iter_content(chunk_size=chunk_size), dest_path)
+    finally:
+        response.close()
+
+    stats['misses'] += 1
+    stats['bytes'] += os.path.getsize(dest_path)
+    if enabled:
+        try:
+            cache.store(url, response.headers, dest_path)
+        except OSError as e:
+            logger.warning("Could not cache %s: %s", url, e)
+    return Download(dest_path, sha256, False)
+
+
+def stats_line():
+    return f"HTTP cache: {stats['hits']} hit(s), {stats['misses']} miss(es)"
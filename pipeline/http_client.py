@@ -0,0 +1,183 @@
+"""
+Shared HTTP client for the report downloaders and merge_reports.
+
+Every host gets one keep-alive requests.Session with its own connection pool,
+so the metadata call, the PDF download and any retries reuse the same TCP/TLS
+connection. Requests get (connect, read) timeouts by default, and are retried
+with exponential backoff and full jitter on connection errors, timeouts, 429
+and 5xx responses. A per-host semaphore caps how many requests run against one
+site at a time; a streamed response (stream=True) keeps its slot until its
+body has been read to the end (or failed) or it is closed, so body downloads
+count against the cap too.
+
+Only idempotent methods are retried on errors that may have reached the
+server; pass retry_non_idempotent=True for POSTs that are safe to repeat.
+When retries run out the last response is returned (callers still call
+raise_for_status()) or the last exception is raised. Either way the
+requests.exceptions error handling in the commands keeps working.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+_lock = threading.Lock()
+_sessions = {}
+_semaphores = {}
+_pid = os.getpid()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def default_timeout():
+    return (_setting('HTTP_CONNECT_TIMEOUT', 10), _setting('HTTP_READ_TIMEOUT', 60))
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _reset_after_fork():
+    """Sessions must not be shared with a forked child (e.g. run_all's region processes)."""
+    global _pid
+    if os.getpid() != _pid:
+        _sessions.clear()
+        _semaphores.clear()
+        _pid = os.getpid()
+
+
+def session_for(url):
+    """Return the pooled keep-alive session for url's host."""
+    key = _host_key(url)
+    with _lock:
+        _reset_after_fork()
+        session = _sessions.get(key)
+        if session is None:
+            pool_size = _setting('HTTP_MAX_PER_HOST', 4)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+            _semaphores[key] = threading.BoundedSemaphore(pool_size)
+        return session
+
+
+def _semaphore_for(url):
+    session_for(url)
+    return _semaphores[_host_key(url)]
+
+
+def _hold_until_done(response, semaphore):
+    """
+    Release semaphore (once) when response's body has been read to the end or failed,
+    or when response is closed, instead of when its headers arrived. .content and
+    iter_lines() read through iter_content(), so they release it too.
+    """
+    close = response.close
+    iter_content = response.iter_content
+    once = threading.Lock()
+
+    def release():
+        if once.acquire(blocking=False):
+            semaphore.release()
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release()
+
+    def iter_content_and_release(*args, **kwargs):
+        try:
+            yield from iter_content(*args, **kwargs)
+        finally:
+            release()
+
+    response.close = close_and_release
+    response.iter_content = iter_content_and_release
+    return response
+
+
+def _send(session, semaphore, method, url, kwargs):
+    """One request holding a slot of the host's semaphore; a streamed response keeps it until read or closed."""
+    semaphore.acquire()
+    try:
+        response = session.request(method, url, **kwargs)
+    except BaseException:
+        semaphore.release()
+        raise
+    if kwargs.get('stream'):
+        # The body is still to be read over this connection
+        return _hold_until_done(response, semaphore)
+    semaphore.release()
+    return response
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number attempt (0-based): full jitter over an exponential cap."""
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), _setting('HTTP_BACKOFF_MAX', 30))
+        except (TypeError, ValueError):
+            pass
+    cap = min(_setting('HTTP_BACKOFF_MAX', 30), _setting('HTTP_BACKOFF_FACTOR', 1.0) * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def request(method, url, retries=None, retry_non_idempotent=False, **kwargs):
+    """
+    requests.request() through the host's pooled session, with timeouts and retries.
+
+    retries defaults to settings.HTTP_RETRIES; a missing or None timeout becomes
+    (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT), so no request waits forever.
+    """
+    method = method.upper()
+    retries = _setting('HTTP_RETRIES', 3) if retries is None else retries
+    if kwargs.get('timeout') is None:
+        kwargs['timeout'] = default_timeout()
+    may_repeat = method in IDEMPOTENT_METHODS or retry_non_idempotent
+    session = session_for(url)
+    semaphore = _semaphore_for(url)
+
+    attempt = 0
+    while True:
+        try:
+            response = _send(session, semaphore, method, url, kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            # A failed connect never reached the server, so it is safe to repeat for any method.
+            retryable = may_repeat or isinstance(e, requests.exceptions.ConnectTimeout)
+            if not retryable or attempt >= retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning("%s %s failed (%s); retry %d/%d in %.1fs", method, url, e, attempt + 1, retries, delay)
+        else:
+            if response.status_code not in RETRY_STATUSES or not may_repeat or attempt >= retries:
+                return response
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            logger.warning("%s %s returned %d; retry %d/%d in %.1fs", method, url, response.status_code, attempt + 1, retries, delay)
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
@@ -0,0 +1,167 @@
+"""
+Set-based writes of parsed report rows.
+
+bulk_upsert() replaces the per-row `update_or_create(report_date=..., state=...)`
+loops of the region commands: all rows of one table are written with a single
+INSERT ... ON CONFLICT (report_date, state) DO UPDATE inside one transaction,
+instead of a SELECT plus an INSERT/UPDATE round trip per state. One extra
+SELECT on the unique key tells which rows already existed, so the commands can
+still report how many rows were inserted and how many updated.
+
+split_numeric_fields() prepares rows for the typed numeric columns: numbers are
+stored as floats, and cells holding markers such as '-' keep their original text
+in the row's raw_markers JSON column instead. add_parsed_times() fills the
+`<field>_at` TimeField next to each free-text time column.
+"""
+import datetime
+import math
+from collections import Counter, namedtuple
+
+import pandas as pd
+from django.db import transaction
+
+UpsertResult = namedtuple('UpsertResult', ['inserted', 'updated', 'skipped'])
+
+DEFAULT_UNIQUE_FIELDS = ('report_date', 'state')
+
+# Process-wide count of rows created or updated by bulk_upsert(), per model label (e.g. 'nrldc_app.Nrldc2AData').
+stats = Counter()
+
+
+def split_numeric(value):
+    """
+    Return (number, raw_text) for one report cell.
+
+    '1,234.5' -> (1234.5, None); '12.5%' -> (12.5, None); '-' -> (None, '-');
+    empty values and NaN -> (None, None).
+    """
+    if value is None:
+        return None, None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (None, None) if math.isnan(value) else (float(value), None)
+    text = str(value).strip()
+    if not text or text.lower() in ('nan', 'none'):
+        return None, None
+    try:
+        number = float(text.replace(',', '').rstrip('%').strip())
+    except ValueError:
+        return None, text
+    return (None, None) if math.isnan(number) else (number, None)
+
+
+def split_numeric_fields(row, numeric_fields, raw_field='raw_markers'):
+    """Copy of row with numeric_fields as floats and any non-numeric text moved into row[raw_field]."""
+    row = dict(row)
+    raw = {}
+    for field in numeric_fields:
+        if field not in row:
+            continue
+        row[field], text = split_numeric(row[field])
+        if text is not None:
+            raw[field] = text
+    row[raw_field] = raw
+    return row
+
+
+# 'H:MM', 'HH:MM', 'HH.MM', 'HH:MM:SS', optionally followed by AM/PM ('HHMM' is rewritten to 'HH:MM' first)
+TIME_PATTERN = r'^(?P<h>\d{1,2})[:.](?P<m>\d{2})(?::(?P<s>\d{2}))?\s*(?P<ampm>[AaPp]\.?[Mm]\.?)?$'
+
+
+def parse_times(values):
+    """
+    Parse report time cells into datetime.time objects, vectorized with pandas.
+
+    Unparseable or out-of-range values become None; '24:00' is read as midnight.
+    Returns a list aligned with values.
+    """
+    text = pd.Series(list(values), dtype='object').astype('string').str.strip()
+    text = text.str.replace(r'^(\d{2})(\d{2})$', r'\1:\2', regex=True)
+    parts = text.str.extract(TIME_PATTERN)
+    hours = pd.to_numeric(parts['h'], errors='coerce')
+    minutes = pd.to_numeric(parts['m'], errors='coerce')
+    seconds = pd.to_numeric(parts['s'], errors='coerce').fillna(0)
+
+    meridiem = parts['ampm'].str.upper().str[0]
+    pm = meridiem.eq('P').fillna(False).astype(bool)
+    am = meridiem.eq('A').fillna(False).astype(bool)
+    hours = hours.mask(pm & (hours < 12), hours + 12).mask(am & (hours == 12), 0)
+    hours = hours.mask((hours == 24) & (minutes == 0) & (seconds == 0), 0)
+
+    valid = (hours.between(0, 23) & minutes.between(0, 59) & seconds.between(0, 59)).fillna(False)
+    return [
+        datetime.time(int(h), int(m), int(s)) if ok else None
+        for h, m, s, ok in zip(hours.fillna(0), minutes.fillna(0), seconds, valid)
+    ]
+
+
+def add_parsed_times(rows, time_fields, suffix='_at'):
+    """Set row[field + suffix] to the parsed time of row[field] for every row; the text is left as is."""
+    for field in time_fields:
+        parsed = parse_times(row.get(field) for row in rows)
+        for row, value in zip(rows, parsed):
+            row[f"{field}{suffix}"] = value
+    return rows
+
+
+def dedupe_rows(rows, unique_fields):
+    """
+    Drop rows with an empty key and keep the last row per key.
+
+    Later rows win, matching what a sequence of update_or_create() calls would
+    leave behind (Postgres refuses to update the same row twice in one statement).
+    Returns (rows, skipped).
+    """
+    by_key = {}
+    skipped = 0
+    for row in rows:
+        key = tuple(row.get(field) for field in unique_fields)
+        if any(value is None or value == '' for value in key):
+            skipped += 1
+            continue
+        by_key.pop(key, None)
+        by_key[key] = row
+    return list(by_key.values()), skipped
+
+
+def existing_keys(model, unique_fields, keys, using=None):
+    """The subset of keys already present in model's table, in one query."""
+    if not keys:
+        return set()
+    lookups = {f"{field}__in": {key[i] for key in keys} for i, field in enumerate(unique_fields)}
+    found = set(model.objects.using(using).filter(**lookups).values_list(*unique_fields))
+    return found & set(keys)
+
+
+def bulk_upsert(model, rows, unique_fields=DEFAULT_UNIQUE_FIELDS, update_fields=None, batch_size=500, using=None):
+    """
+    Insert or update rows (dicts of model field values) in one transaction.
+
+    unique_fields must be covered by a unique constraint on the model.
+    update_fields defaults to every concrete non-key field present in the rows,
+    so auto_now_add columns such as created_at keep their original value on update.
+    """
+    rows, skipped = dedupe_rows(rows, unique_fields)
+    if not rows:
+        return UpsertResult(0, 0, skipped)
+
+    if update_fields is None:
+        concrete = {f.name for f in model._meta.concrete_fields if not f.primary_key}
+        present = {field for row in rows for field in row}
+        update_fields = [f for f in concrete & present if f not in unique_fields]
+        update_fields.sort()
+
+    objs = [model(**row) for row in rows]
+    keys = [tuple(row[field] for field in unique_fields) for row in rows]
+    with transaction.atomic(using=using):
+        existing = existing_keys(model, unique_fields, keys, using=using)
+        model.objects.using(using).bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=bool(update_fields),
+            ignore_conflicts=not update_fields,
+            unique_fields=list(unique_fields) if update_fields else None,
+            update_fields=update_fields or None,
+        )
+    updated = len(existing)
+    stats[model._meta.label] += len(rows)
+    return UpsertResult(len(rows) - updated, updated, skipped)
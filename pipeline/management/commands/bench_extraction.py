@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.extraction import WorkerUnavailable, read_pdf_local, read_pdf_via_worker
+
+TABULA_OPTIONS = {
+    'pages': 'all',
+    'multiple_tables': True,
+    'pandas_options': {'header': None},
+    'lattice': True,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cold (java subprocess per report) vs warm (tabula_worker) extraction time per report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pdfs', nargs='+', help='One or more downloaded PSP report PDFs.')
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Number of timed runs per report and mode (default: 3).'
+        )
+
+    def time_runs(self, func, pdf_path, repeat):
+        timings = []
+        tables = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tables = func(pdf_path, **TABULA_OPTIONS)
+            timings.append(time.perf_counter() - start)
+        return timings, len(tables or [])
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+
+        # Make sure the worker is up (and warm) before any timing starts.
+        try:
+            read_pdf_via_worker(options['pdfs'][0], **TABULA_OPTIONS)
+        except WorkerUnavailable as e:
+            raise CommandError(f"❌ {e}. Start it first with: python manage.py tabula_worker")
+
+        self.stdout.write(f"{'REPORT':<40} | {'TABLES':>6} | {'COLD avg s':>10} | {'WARM avg s':>10} | {'SPEEDUP':>7}")
+        self.stdout.write("-" * 86)
+        for pdf_path in options['pdfs']:
+            cold, cold_tables = self.time_runs(
+                lambda path, **kw: read_pdf_local(path, force_subprocess=True, **kw), pdf_path, repeat
+            )
+            warm, warm_tables = self.time_runs(read_pdf_via_worker, pdf_path, repeat)
+
+            cold_avg = sum(cold) / len(cold)
+            warm_avg = sum(warm) / len(warm)
+            speedup = cold_avg / warm_avg if warm_avg else float('inf')
+            name = pdf_path if len(pdf_path) <= 40 else f"...{pdf_path[-37:]}"
+            self.stdout.write(f"{name:<40} | {cold_tables:>6} | {cold_avg:>10.2f} | {warm_avg:>10.2f} | {speedup:>6.1f}x")
+            if cold_tables != warm_tables:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️ Table count differs between modes for {pdf_path}: cold={cold_tables}, warm={warm_tables}"
+                ))
@@ -0,0 +1,97 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from nrldc_app.models import Nrldc2AData, Nrldc2CData
+from pipeline.ingest import bulk_upsert
+from pipeline.table_specs import STATE_FIELD, TABLE_SPECS
+from srldc_app.models import Srldc2AData, Srldc2CData
+from wrldc_app.models import Wrldc2AData, Wrldc2CData
+
+MODELS = {
+    ('nrldc', '2A'): Nrldc2AData, ('nrldc', '2C'): Nrldc2CData,
+    ('srldc', '2A'): Srldc2AData, ('srldc', '2C'): Srldc2CData,
+    ('wrldc', '2A'): Wrldc2AData, ('wrldc', '2C'): Wrldc2CData,
+}
+
+# Benchmark rows are written far away from real report dates and deleted afterwards.
+SCRATCH_DATE = datetime.date(1900, 1, 1)
+
+
+def synthetic_rows(spec, report_date, states, seed):
+    rows = []
+    for i in range(states):
+        row = {'report_date': report_date, STATE_FIELD: f"BENCH STATE {i:03d}"}
+        for n, field in enumerate(spec.fields):
+            if field in spec.numeric_fields:
+                row[field] = float(seed + i + n)
+            elif field in spec.string_fields and field != STATE_FIELD:
+                row[field] = f"{(seed + i) % 24:02d}:{n % 60:02d}"
+        rows.append(row)
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Compare per-row update_or_create with bulk_upsert for the 2A/2C tables (writes and deletes scratch rows)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tables', nargs='+', default=['nrldc:2A', 'nrldc:2C'],
+                            help='region:table pairs to benchmark, e.g. srldc:2A wrldc:2C (default: nrldc:2A nrldc:2C)')
+        parser.add_argument('--states', type=int, default=12, help='Rows (states) per report date (default 12).')
+        parser.add_argument('--days', type=int, default=10, help='Report dates to ingest per pass (default 10).')
+
+    def per_row(self, model, rows):
+        for row in rows:
+            defaults = {k: v for k, v in row.items() if k not in ('report_date', STATE_FIELD)}
+            model.objects.update_or_create(report_date=row['report_date'], state=row[STATE_FIELD], defaults=defaults)
+
+    def run_pass(self, label, write, model, spec, days, states, seed):
+        batches = [
+            synthetic_rows(spec, SCRATCH_DATE + datetime.timedelta(days=d), states, seed)
+            for d in range(days)
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            for rows in batches:
+                write(model, rows)
+            seconds = time.perf_counter() - start
+        return {'label': label, 'seconds': seconds, 'queries': len(ctx.captured_queries), 'rows': days * states}
+
+    def handle(self, *args, **options):
+        targets = []
+        for item in options['tables']:
+            region, _, name = item.partition(':')
+            key = (region.lower(), name.upper())
+            if key not in MODELS:
+                raise CommandError(f"Unknown table '{item}'. Choose from: {', '.join(f'{r}:{n}' for r, n in MODELS)}")
+            spec = next(s for s in TABLE_SPECS[key[0]] if s.name == key[1])
+            targets.append((item, MODELS[key], spec))
+
+        days, states = options['days'], options['states']
+        scratch_end = SCRATCH_DATE + datetime.timedelta(days=days)
+        results = []
+        for item, model, spec in targets:
+            self.stdout.write(f"⏱️ {item}: {days} dates x {states} states per pass")
+            try:
+                for method, write in (('update_or_create', self.per_row), ('bulk_upsert', bulk_upsert)):
+                    model.objects.filter(report_date__gte=SCRATCH_DATE, report_date__lt=scratch_end).delete()
+                    insert = self.run_pass('insert', write, model, spec, days, states, seed=0)
+                    update = self.run_pass('update', write, model, spec, days, states, seed=1000)
+                    for outcome in (insert, update):
+                        results.append((item, method, outcome))
+            finally:
+                model.objects.filter(report_date__gte=SCRATCH_DATE, report_date__lt=scratch_end).delete()
+
+        header = f"{'TABLE':<10} | {'METHOD':<16} | {'PASS':<6} | {'ROWS':>6} | {'QUERIES':>7} | {'SECONDS':>8} | {'ROWS/S':>9}"
+        self.stdout.write(self.style.HTTP_INFO("\n--- Ingest benchmark ---"))
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for item, method, outcome in results:
+            rate = outcome['rows'] / outcome['seconds'] if outcome['seconds'] else float('inf')
+            self.stdout.write(
+                f"{item:<10} | {method:<16} | {outcome['label']:<6} | {outcome['rows']:>6} | "
+                f"{outcome['queries']:>7} | {outcome['seconds']:>8.3f} | {rate:>9.0f}"
+            )
@@ -0,0 +1,105 @@
+import datetime
+import json
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+TABLE = 'bench_report_rows'
+
+# The report_date filters the dashboard, the skip checks and the reports issue
+QUERIES = [
+    ('day exists', f"SELECT 1 FROM {TABLE} WHERE report_date = %(day)s LIMIT 1"),
+    ('month range', f"SELECT count(*), avg(value) FROM {TABLE} WHERE report_date >= %(month_start)s AND report_date < %(month_end)s"),
+    ('year range', f"SELECT count(*), avg(value) FROM {TABLE} WHERE report_date >= %(year_start)s AND report_date < %(year_end)s"),
+]
+
+# Index layouts compared as (label, index name, CREATE INDEX statement); each one is dropped after its run
+VARIANTS = [
+    ('no index', None, None),
+    ('btree (report_date, state)', f'{TABLE}_date_state',
+     f"CREATE UNIQUE INDEX {TABLE}_date_state ON {TABLE} (report_date, state)"),
+    ('brin (report_date)', f'{TABLE}_date_brin',
+     f"CREATE INDEX {TABLE}_date_brin ON {TABLE} USING brin (report_date)"),
+]
+
+
+def _scan_nodes(plan):
+    """Node types of the plan nodes that read the benchmark table."""
+    nodes = []
+    if plan.get('Relation Name') == TABLE or plan.get('Index Name', '').startswith(TABLE):
+        nodes.append(plan['Node Type'])
+    for child in plan.get('Plans', []):
+        nodes.extend(_scan_nodes(child))
+    return nodes
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN ANALYZE report_date lookups on synthetic multi-year data without an index, with a btree and with a BRIN index (PostgreSQL only; uses a temporary table)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=5, help='Years of daily data to generate (default 5).')
+        parser.add_argument('--states', type=int, default=40, help='Rows per report date (default 40).')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query; the median is reported (default 5).')
+
+    def explain(self, cursor, sql, params, repeat):
+        times, nodes = [], []
+        for _ in range(repeat):
+            cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params)
+            result = cursor.fetchone()[0]
+            plan = (json.loads(result) if isinstance(result, str) else result)[0]
+            times.append(plan['Execution Time'])
+            nodes = _scan_nodes(plan['Plan'])
+        return statistics.median(times), ' + '.join(dict.fromkeys(nodes)) or '-'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("bench_queries needs PostgreSQL (it compares btree and BRIN plans).")
+
+        years, states, repeat = options['years'], options['states'], options['repeat']
+        end = datetime.date.today().replace(month=1, day=1)
+        start = end.replace(year=end.year - years)
+        middle = start.replace(year=start.year + years // 2)
+        params = {
+            'day': middle + datetime.timedelta(days=45),
+            'month_start': middle.replace(month=3), 'month_end': middle.replace(month=4),
+            'year_start': middle, 'year_end': middle.replace(year=middle.year + 1),
+        }
+
+        results = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {TABLE} (id bigserial PRIMARY KEY, report_date date NOT NULL, "
+                f"state varchar(100) NOT NULL, value double precision) ON COMMIT DROP"
+            )
+            # Insert in date order, as the daily pipeline appends rows
+            cursor.execute(
+                f"INSERT INTO {TABLE} (report_date, state, value) "
+                f"SELECT d::date, 'STATE ' || s, random() * 1000 "
+                f"FROM generate_series(%s::date, %s::date - 1, interval '1 day') AS d, generate_series(1, %s) AS s "
+                f"ORDER BY d, s",
+                [start, end, states],
+            )
+            rows = cursor.rowcount
+            self.stdout.write(f"⏱️ {rows} synthetic rows ({start} .. {end - datetime.timedelta(days=1)}, {states} per day)")
+
+            for label, index_name, create_sql in VARIANTS:
+                index_bytes = 0
+                if create_sql:
+                    cursor.execute(create_sql)
+                    cursor.execute("SELECT pg_relation_size(%s::regclass)", [index_name])
+                    index_bytes = cursor.fetchone()[0]
+                cursor.execute(f"ANALYZE {TABLE}")
+                for name, sql in QUERIES:
+                    ms, nodes = self.explain(cursor, sql, params, repeat)
+                    results.append((label, index_bytes, name, ms, nodes))
+                if index_name:
+                    cursor.execute(f"DROP INDEX {index_name}")
+            transaction.set_rollback(True)
+
+        header = f"{'INDEX':<28} | {'SIZE':>9} | {'QUERY':<12} | {'MEDIAN MS':>9} | PLAN"
+        self.stdout.write(self.style.HTTP_INFO("\n--- report_date query benchmark ---"))
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for label, index_bytes, name, ms, nodes in results:
+            self.stdout.write(f"{label:<28} | {index_bytes / 1024:>7.0f}kB | {name:<12} | {ms:>9.3f} | {nodes}")
@@ -0,0 +1,76 @@
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.forkserver import fork_context, start_forked, warm_up
+
+
+def _ready(command, name):
+    """Forked child: get the command to where `manage.py <name> --help` gets it, then exit."""
+    command.create_parser('manage.py', name)
+
+
+class Command(BaseCommand):
+    help = ('Compare job startup time of a fresh `python manage.py <command>` process with a child '
+            'forked from a warmed-up parent (pipeline/forkserver.py)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--command', dest='command_name', default='nrldc_project',
+                            help='Management command to start (default: nrldc_project).')
+        parser.add_argument('--runs', type=int, default=5, help='Starts per mode (default 5).')
+
+    def cold_start(self, manage_py, name):
+        start = time.perf_counter()
+        # --help stops right after Django setup and the command import, before any work
+        completed = subprocess.run([sys.executable, str(manage_py), name, '--help'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if completed.returncode:
+            raise CommandError(f"❌ manage.py {name} --help failed: {completed.stderr.strip()}")
+        return (time.perf_counter() - start) * 1000
+
+    def warm_start(self, command, name):
+        start = time.perf_counter()
+        process = start_forked(_ready, command, name)
+        process.join()
+        if process.exitcode:
+            raise CommandError(f"❌ Forked child exited with code {process.exitcode}.")
+        return (time.perf_counter() - start) * 1000
+
+    def handle(self, *args, **options):
+        name = options['command_name']
+        runs = max(1, options['runs'])
+        manage_py = Path(settings.BASE_DIR) / 'manage.py'
+        try:
+            fork_context()
+        except ValueError:
+            raise CommandError("❌ The warm runner needs the 'fork' start method (Linux or macOS).")
+
+        start = time.perf_counter()
+        command = warm_up([name]).get(name)
+        warm_up_ms = (time.perf_counter() - start) * 1000
+        if command is None:
+            raise CommandError(f"❌ Unknown command '{name}'.")
+
+        results = [
+            ('fresh process', [self.cold_start(manage_py, name) for _ in range(runs)]),
+            ('warm fork', [self.warm_start(command, name) for _ in range(runs)]),
+        ]
+
+        header = f"{'MODE':<13} | {'RUNS':>4} | {'MEAN MS':>9} | {'P50 MS':>9} | {'MIN MS':>9} | {'MAX MS':>9}"
+        self.stdout.write(self.style.HTTP_INFO(f"\n--- {name} startup ---"))
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for label, times in results:
+            self.stdout.write(
+                f"{label:<13} | {len(times):>4} | {statistics.mean(times):>9.1f} | {statistics.median(times):>9.1f} | "
+                f"{min(times):>9.1f} | {max(times):>9.1f}"
+            )
+
+        cold, warm = (statistics.median(times) for _, times in results)
+        self.stdout.write(f"\nOne-off warm-up of the parent (imports, command load): {warm_up_ms:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"✅ Warm fork starts {cold / warm if warm else 0:.0f}x faster ({cold:.0f} ms -> {warm:.1f} ms)."))
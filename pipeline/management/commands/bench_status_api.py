@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = 'Measure dashboard_status_api latency and new database connections per request with and without connection reuse'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Requests per mode (default 50).')
+        parser.add_argument('--host', default='localhost', help='Host header sent with the requests (must be in ALLOWED_HOSTS).')
+
+    def run_mode(self, client, url, count):
+        opened = []
+        on_connect = lambda **kwargs: opened.append(1)
+        connection_created.connect(on_connect)
+        latencies = []
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                # The WSGI handler closes unusable or expired connections at both ends of a request;
+                # the test client skips that, so do it here.
+                close_old_connections()
+                response = client.get(url)
+                close_old_connections()
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    self.stdout.write(self.style.WARNING(f"⚠️ {url} answered {response.status_code}"))
+        finally:
+            connection_created.disconnect(on_connect)
+        return latencies, len(opened)
+
+    def handle(self, *args, **options):
+        url = reverse('dashboard_status_api')
+        client = Client(HTTP_HOST=options['host'])
+        count = max(1, options['requests'])
+        mode = getattr(settings, 'POSTGRES_CONN_MODE', 'none')
+
+        if mode == 'pool':
+            # The pool cannot be switched off in a running process
+            modes = [('pool', None)]
+            self.stdout.write("ℹ️ Pool mode is configured; run again with POSTGRES_CONN_MODE=none for the baseline.")
+        else:
+            max_age = connection.settings_dict.get('CONN_MAX_AGE') or 600
+            modes = [('none', 0), ('persistent', max_age)]
+
+        results = []
+        for label, max_age in modes:
+            if max_age is not None:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+            client.get(url)  # warm-up: URL resolution, template and code imports
+            latencies, opened = self.run_mode(client, url, count)
+            results.append((label, latencies, opened))
+        connection.close()
+
+        header = f"{'MODE':<11} | {'REQUESTS':>8} | {'NEW CONNS':>9} | {'MEAN MS':>8} | {'P50 MS':>8} | {'P95 MS':>8}"
+        self.stdout.write(self.style.HTTP_INFO(f"\n--- {url} latency ---"))
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for label, latencies, opened in results:
+            p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+            self.stdout.write(
+                f"{label:<11} | {len(latencies):>8} | {opened:>9} | {statistics.mean(latencies):>8.2f} | "
+                f"{statistics.median(latencies):>8.2f} | {p95:>8.2f}"
+            )
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+import time
+from collections import Counter
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.extraction import ENGINES, read_tables_for_markers
+from pipeline.table_specs import TABLE_SPECS
+
+# Tables each region command keeps, as (label, (start_marker, end_marker))
+REGION_TABLES = {
+    region: [(spec.name, spec.markers) for spec in specs]
+    for region, specs in TABLE_SPECS.items()
+}
+
+# Same options the region commands pass to tabula
+REGION_OPTIONS = {
+    'nrldc': {'multiple_tables': True, 'pandas_options': {'header': None}, 'lattice': True},
+    'srldc': {'multiple_tables': True, 'pandas_options': {'header': None}, 'lattice': True},
+    'wrldc': {'multiple_tables': True, 'pandas_options': {'header': None}, 'lattice': True},
+    'posoco': {'multiple_tables': True, 'lattice': True},
+}
+
+
+def _normalize(frame):
+    return frame.astype(str).replace(r'\s+', ' ', regex=True).apply(lambda col: col.str.strip())
+
+
+def table_cells(tables, start_marker, end_marker):
+    """
+    Return a Counter of the non-empty cell texts of one table.
+
+    With an end marker the table runs from the start marker row to the end marker row
+    of all tables concatenated (as the 2A/2C parsers do); without one it is the single
+    extracted table that contains the start marker (as the POSOCO parser does).
+    """
+    start_re = re.compile(start_marker, re.IGNORECASE)
+    frames = [_normalize(df) for df in tables if not df.empty]
+    if end_marker is None:
+        for frame in frames:
+            if frame.apply(lambda col: col.str.contains(start_re, na=False)).to_numpy().any():
+                return Counter(v for v in frame.to_numpy().ravel() if v and v != 'nan')
+        return None
+
+    if not frames:
+        return None
+    combined = pd.concat(frames, ignore_index=True).fillna('')
+    hits = combined.apply(lambda col: col.str.contains(start_re, na=False)).any(axis=1).to_numpy()
+    if not hits.any():
+        return None
+    start = int(hits.argmax())
+    end_re = re.compile(end_marker, re.IGNORECASE)
+    end_hits = combined.iloc[start + 1:].apply(lambda col: col.str.contains(end_re, na=False)).any(axis=1).to_numpy()
+    end = start + 1 + int(end_hits.argmax()) if end_hits.any() else len(combined)
+    return Counter(v for v in combined.iloc[start:end].to_numpy().ravel() if v and v != 'nan')
+
+
+def parity(reference, candidate):
+    """Share of the reference cells (with multiplicity) that the candidate also produced."""
+    if not reference:
+        return None
+    if not candidate:
+        return 0.0
+    return sum((reference & candidate).values()) / sum(reference.values())
+
+
+class Command(BaseCommand):
+    help = 'Compare extraction speed and output parity of the tabula, pdfplumber and pypdfium2 engines per region'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pdfs', nargs='+', help='Downloaded PSP report PDFs (nrldc_*.pdf, srldc_*.pdf, wrldc_*.pdf, posoco_*.pdf).')
+        parser.add_argument(
+            '--region',
+            choices=sorted(REGION_TABLES),
+            required=False,
+            help='Region of the PDFs. If omitted, it is taken from the file name prefix.'
+        )
+        parser.add_argument(
+            '--engines',
+            nargs='+',
+            choices=ENGINES,
+            default=list(ENGINES),
+            help='Engines to compare; tabula is always the parity reference.'
+        )
+        parser.add_argument('--json-out', dest='json_out', required=False, help='Optional path to write the report as JSON.')
+
+    def region_for(self, pdf_path, region):
+        if region:
+            return region
+        prefix = os.path.basename(pdf_path).split('_')[0].lower()
+        if prefix not in REGION_TABLES:
+            raise CommandError(f"❌ Cannot tell the region of {pdf_path}; pass --region.")
+        return prefix
+
+    def handle(self, *args, **options):
+        engines = ['tabula'] + [e for e in options['engines'] if e != 'tabula']
+        report = []
+
+        for pdf_path in options['pdfs']:
+            region = self.region_for(pdf_path, options.get('region'))
+            markers = [m for _, m in REGION_TABLES[region]]
+            reference = None
+
+            self.stdout.write(self.style.NOTICE(f"\n{pdf_path} ({region.upper()})"))
+            self.stdout.write(f"{'ENGINE':<10} | {'SECONDS':>8} | {'TABLES':>6} | " + " | ".join(f"{label:>12}" for label, _ in REGION_TABLES[region]))
+            self.stdout.write("-" * (34 + 15 * len(markers)))
+
+            for engine in engines:
+                start = time.perf_counter()
+                try:
+                    tables = read_tables_for_markers(pdf_path, markers, engine=engine, use_cache=False, **REGION_OPTIONS[region])
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f"{engine:<10} | failed: {e}"))
+                    report.append({'pdf': pdf_path, 'region': region, 'engine': engine, 'error': str(e)})
+                    continue
+                elapsed = time.perf_counter() - start
+
+                cells = [table_cells(tables, s, e) for s, e in markers]
+                if engine == 'tabula':
+                    reference = cells
+                scores = [
+                    parity(reference[i], cells[i]) if reference else None
+                    for i in range(len(markers))
+                ]
+                score_text = [
+                    ("missing" if cells[i] is None else "n/a") if scores[i] is None else f"{scores[i] * 100:.1f}%"
+                    for i in range(len(markers))
+                ]
+                self.stdout.write(f"{engine:<10} | {elapsed:>8.2f} | {len(tables):>6} | " + " | ".join(f"{t:>12}" for t in score_text))
+                report.append({
+                    'pdf': pdf_path,
+                    'region': region,
+                    'engine': engine,
+                    'seconds': round(elapsed, 3),
+                    'tables': len(tables),
+                    'parity': {label: scores[i] for i, (label, _) in enumerate(REGION_TABLES[region])},
+                })
+
+        self.stdout.write("\nParity = share of tabula's cell values per table that the engine reproduced.")
+        if options.get('json_out'):
+            with open(options['json_out'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=4)
+            self.stdout.write(self.style.SUCCESS(f"✅ Report saved to: {options['json_out']}"))
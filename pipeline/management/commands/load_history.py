@@ -0,0 +1,140 @@
+import datetime
+import json
+import os
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from nrldc_app.models import Nrldc2AData, Nrldc2CData
+from pipeline.copy_load import copy_upsert
+from pipeline.facts import FACT_KEY, region_facts
+from pipeline.ingest import add_parsed_times, split_numeric_fields
+from pipeline.models import MetricFact
+from pipeline.rollups import refresh_daily_rollups
+from pipeline.table_specs import STATE_FIELD, TABLE_SPECS
+from srldc_app.models import Srldc2AData, Srldc2CData
+from wrldc_app.models import Wrldc2AData, Wrldc2CData
+
+REGION_MODELS = {
+    ('nrldc', '2A'): Nrldc2AData, ('nrldc', '2C'): Nrldc2CData,
+    ('srldc', '2A'): Srldc2AData, ('srldc', '2C'): Srldc2CData,
+    ('wrldc', '2A'): Wrldc2AData, ('wrldc', '2C'): Wrldc2CData,
+}
+REGIONS = ('nrldc', 'srldc', 'wrldc')
+# srldc_project and wrldc_project name the JSON after the run date but store its rows under the day before
+JSON_DATE_LAG = {'nrldc': 0, 'srldc': 1, 'wrldc': 1}
+
+
+def _parse_date(value):
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}'. Please use YYYY-MM-DD.")
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return str(value).strip()
+
+
+def find_reports(directory, region, date_from=None, date_to=None):
+    """
+    (report_date, path) of every <region>_DDMMYYYY.json under directory, oldest date first; reruns
+    of a date sort by mtime. report_date is the date the region command stored the file's rows under.
+    """
+    pattern = re.compile(rf'^{region}_(\d{{8}})\.json$')
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            match = pattern.match(name)
+            if not match:
+                continue
+            try:
+                file_date = datetime.datetime.strptime(match.group(1), '%d%m%Y').date()
+            except ValueError:
+                continue
+            report_date = file_date - datetime.timedelta(days=JSON_DATE_LAG[region])
+            if (date_from and report_date < date_from) or (date_to and report_date > date_to):
+                continue
+            path = os.path.join(root, name)
+            found.append((report_date, os.path.getmtime(path), path))
+    return [(report_date, path) for report_date, _, path in sorted(found)]
+
+
+def report_rows(spec, reports):
+    """Yield the database rows of spec's table from the combined JSON files, one file at a time."""
+    for report_date, path in reports:
+        with open(path, 'r', encoding='utf-8') as fh:
+            records = json.load(fh).get(spec.json_key) or []
+        rows = []
+        for record in records:
+            row = {field: _text(record.get(field)) if field in spec.string_fields else record.get(field) for field in spec.fields}
+            row = split_numeric_fields(row, spec.numeric_fields)
+            row['report_date'] = report_date
+            row[STATE_FIELD] = _text(record.get(STATE_FIELD))
+            rows.append(row)
+        yield from add_parsed_times(rows, spec.time_fields)
+
+
+class Command(BaseCommand):
+    help = ('Load years of NRLDC/SRLDC/WRLDC history from the combined JSON files with PostgreSQL COPY '
+            'into a staging table, then upsert into the 2A/2C tables and MetricFact')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', dest='directory', default='downloads',
+                            help='Directory searched recursively for <region>_DDMMYYYY.json files (default: downloads).')
+        parser.add_argument('--regions', nargs='+', choices=REGIONS, default=list(REGIONS), help='Regions to load (default: all).')
+        parser.add_argument('--from', dest='date_from', help='First report date (YYYY-MM-DD).')
+        parser.add_argument('--to', dest='date_to', help='Last report date (YYYY-MM-DD).')
+        parser.add_argument('--no-facts', action='store_true', help='Skip MetricFact and DailyRollup (run rebuild_facts later).')
+
+    def load(self, label, model, rows, **kwargs):
+        start = time.perf_counter()
+        result = copy_upsert(model, rows, **kwargs)
+        seconds = time.perf_counter() - start
+        staged = sum(result)
+        self.stdout.write(
+            f"  {label:<24} {staged:>9} rows | {result.inserted:>8} created | {result.updated:>8} updated | "
+            f"{result.skipped:>6} skipped | {seconds:>7.2f}s | {staged / seconds if seconds else 0:>9.0f} rows/s"
+        )
+        return staged, seconds
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("load_history needs PostgreSQL (it loads with COPY FROM STDIN).")
+        if not os.path.isdir(options['directory']):
+            raise CommandError(f"❌ Directory not found: {options['directory']}")
+        date_from = _parse_date(options['date_from']) if options.get('date_from') else None
+        date_to = _parse_date(options['date_to']) if options.get('date_to') else None
+
+        total_rows, total_seconds = 0, 0.0
+        for region in options['regions']:
+            reports = find_reports(options['directory'], region, date_from, date_to)
+            if not reports:
+                self.stdout.write(self.style.WARNING(f"⚠️ {region.upper()}: no {region}_DDMMYYYY.json files found."))
+                continue
+            self.stdout.write(f"📚 {region.upper()}: {len(reports)} report file(s), {reports[0][0]} .. {reports[-1][0]}")
+
+            for spec in TABLE_SPECS[region]:
+                model = REGION_MODELS[(region, spec.name)]
+                try:
+                    with transaction.atomic():
+                        loaded = [self.load(spec.label, model, report_rows(spec, reports))]
+                        if not options['no_facts']:
+                            facts = (fact for row in report_rows(spec, reports) for fact in region_facts(spec, [row]))
+                            loaded.append(self.load(f"{spec.label} facts", MetricFact, facts,
+                                                    unique_fields=FACT_KEY, update_fields=['value', 'updated_at']))
+                except Exception as e:
+                    raise CommandError(f"❌ Loading {region.upper()} {spec.label} failed: {e}")
+                total_rows += sum(rows for rows, _ in loaded)
+                total_seconds += sum(seconds for _, seconds in loaded)
+
+            if not options['no_facts']:
+                refreshed = refresh_daily_rollups(report_date for report_date, _ in reports)
+                self.stdout.write(f"  🧮 {refreshed} daily rollup(s) refreshed")
+
+        rate = total_rows / total_seconds if total_seconds else 0
+        self.stdout.write(self.style.SUCCESS(f"✅ Loaded {total_rows} rows in {total_seconds:.2f}s ({rate:.0f} rows/s)"))
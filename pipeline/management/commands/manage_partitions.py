@@ -0,0 +1,54 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from pipeline import partitioning
+
+
+class Command(BaseCommand):
+    help = ('Maintain the monthly report_date partitions of the report tables: create the coming months, '
+            'optionally convert unpartitioned tables and detach old months into an archive schema (PostgreSQL only)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true', help='Convert tables that are not partitioned yet.')
+        parser.add_argument('--months-ahead', type=int, default=None,
+                            help='Future months to keep created. Defaults to settings.PARTITION_MONTHS_AHEAD.')
+        parser.add_argument('--retain-months', type=int, default=None,
+                            help='Detach monthly partitions older than this many months (default: keep everything).')
+        parser.add_argument('--archive-schema', default=None,
+                            help='Schema detached partitions are moved to. Defaults to settings.PARTITION_ARCHIVE_SCHEMA.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("manage_partitions needs PostgreSQL (declarative partitioning).")
+
+        months_ahead = options['months_ahead']
+        if months_ahead is None:
+            months_ahead = getattr(settings, 'PARTITION_MONTHS_AHEAD', partitioning.DEFAULT_MONTHS_AHEAD)
+        archive_schema = options['archive_schema'] or getattr(settings, 'PARTITION_ARCHIVE_SCHEMA', partitioning.DEFAULT_ARCHIVE_SCHEMA)
+        cutoff = None
+        if options['retain_months'] is not None:
+            if options['retain_months'] < 1:
+                raise CommandError("--retain-months must be at least 1.")
+            this_month = partitioning.month_start(datetime.date.today())
+            cutoff = partitioning.add_months(this_month, -options['retain_months'])
+
+        if options['convert']:
+            for table in partitioning.convert_all(connection, months_ahead=months_ahead):
+                self.stdout.write(self.style.SUCCESS(f"✅ {table}: converted to monthly partitions"))
+
+        for table in partitioning.report_tables():
+            with transaction.atomic(), connection.cursor() as cursor:
+                if not partitioning.is_partitioned(cursor, table):
+                    self.stdout.write(self.style.WARNING(f"⚠️ {table} is not partitioned (use --convert)."))
+                    continue
+                created = partitioning.ensure_partitions(cursor, table, months_ahead)
+                detached = partitioning.detach_partitions(cursor, table, cutoff, archive_schema) if cutoff else []
+            message = f"🗂️ {table}: {len(created)} partition(s) created"
+            if created:
+                message += f" ({', '.join(created)})"
+            if cutoff:
+                message += f", {len(detached)} detached before {cutoff} into schema '{archive_schema}'"
+            self.stdout.write(message)
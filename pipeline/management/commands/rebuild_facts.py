@@ -0,0 +1,77 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from nrldc_app.models import Nrldc2AData, Nrldc2CData
+from pipeline.facts import posoco_facts, record_facts, region_facts
+from pipeline.table_specs import TABLE_SPECS
+from posoco.models import PosocoTableA, PosocoTableG
+from srldc_app.models import Srldc2AData, Srldc2CData
+from wrldc_app.models import Wrldc2AData, Wrldc2CData
+
+REGION_MODELS = {
+    ('nrldc', '2A'): Nrldc2AData, ('nrldc', '2C'): Nrldc2CData,
+    ('srldc', '2A'): Srldc2AData, ('srldc', '2C'): Srldc2CData,
+    ('wrldc', '2A'): Wrldc2AData, ('wrldc', '2C'): Wrldc2CData,
+}
+POSOCO_MODELS = {'A': (PosocoTableA, 'category'), 'G': (PosocoTableG, 'fuel_type')}
+
+
+def _parse_date(value):
+    try:
+        return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}'. Please use YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = 'Rebuild MetricFact rows from the region and POSOCO tables (backfill for history written before the fact table existed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', help='First report date (YYYY-MM-DD). Defaults to the earliest row.')
+        parser.add_argument('--to', dest='date_to', help='Last report date (YYYY-MM-DD). Defaults to the latest row.')
+        parser.add_argument('--sources', nargs='+', choices=list(TABLE_SPECS), default=list(TABLE_SPECS),
+                            help='Sources to rebuild (default: all).')
+        parser.add_argument('--batch-days', type=int, default=31, help='Report dates written per transaction (default 31).')
+
+    def tables(self, sources):
+        """(label, source, model, fields to read, function turning rows into facts, metrics) for every table of sources."""
+        for source in sources:
+            for spec in TABLE_SPECS[source]:
+                if source == 'posoco':
+                    model, key_field = POSOCO_MODELS[spec.name]
+                    fields = [key_field, *spec.entity_fields]
+                    yield f"POSOCO {spec.label}", source, model, fields, lambda rows, spec=spec, key_field=key_field: posoco_facts(spec, rows, key_field), spec.metrics.values()
+                else:
+                    model = REGION_MODELS[(source, spec.name)]
+                    fields = ['state', *spec.metrics]
+                    yield f"{source.upper()} {spec.label}", source, model, fields, lambda rows, spec=spec: region_facts(spec, rows), spec.metrics.values()
+
+    def handle(self, *args, **options):
+        date_from = _parse_date(options['date_from']) if options.get('date_from') else None
+        date_to = _parse_date(options['date_to']) if options.get('date_to') else None
+        step = datetime.timedelta(days=max(1, options['batch_days']))
+
+        for label, source, model, fields, to_facts, metrics in self.tables(options['sources']):
+            queryset = model.objects.all()
+            if date_from:
+                queryset = queryset.filter(report_date__gte=date_from)
+            if date_to:
+                queryset = queryset.filter(report_date__lte=date_to)
+            bounds = queryset.aggregate(first=Min('report_date'), last=Max('report_date'))
+            first, last = bounds['first'], bounds['last']
+            if first is None:
+                self.stdout.write(f"⚠️ {label}: no rows in range.")
+                continue
+
+            written = 0
+            start = first
+            while start <= last:
+                end = start + step
+                rows = list(queryset.filter(report_date__gte=start, report_date__lt=end).values('report_date', *fields))
+                # Every date with rows is rebuilt, including its facts that the rows no longer yield
+                scope = {(source, row['report_date']) for row in rows}
+                written += sum(record_facts(to_facts(rows), metrics, scope)[:2])
+                start = end
+            self.stdout.write(self.style.SUCCESS(f"✅ {label}: {written} facts written for {first} .. {last}"))
@@ -0,0 +1,243 @@
+import datetime
+import multiprocessing
+import queue
+import sys
+import time
+import traceback
+
+import django
+from django.conf import settings
+from django.core.management import call_command, get_commands, load_command_class
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from pipeline.extraction import add_extraction_arguments
+from pipeline.timing import STAGES, StageTimer
+
+# Region -> management command, in the order they appear on the dashboard
+REGION_COMMANDS = {
+    'nrldc': 'nrldc_project',
+    'srldc': 'srldc_project',
+    'wrldc': 'wrldc_project',
+    'posoco': 'posoco',
+}
+
+
+class _PrefixedStream:
+    """Line-buffered text stream that prefixes every line, so parallel region output stays readable."""
+
+    def __init__(self, stream, prefix):
+        self.stream = stream
+        self.prefix = prefix
+        self.pending = ''
+
+    def write(self, text):
+        self.pending += text
+        *lines, self.pending = self.pending.split('\n')
+        for line in lines:
+            self.stream.write(f"{self.prefix}{line}\n")
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.stream.write(f"{self.prefix}{self.pending}")
+            self.pending = ''
+        self.stream.flush()
+
+    def isatty(self):
+        return False
+
+
+def _run_region(region, command_options, results):
+    """Process target: run one region command and report its status and stage timings."""
+    django.setup()
+    # Never reuse a database connection inherited from the parent process.
+    connections.close_all()
+    sys.stdout = _PrefixedStream(sys.__stdout__, f"[{region.upper()}] ")
+
+    command_name = REGION_COMMANDS[region]
+    start = time.perf_counter()
+    status, error = 'SUCCESS', ''
+    command = None
+    try:
+        command = load_command_class(get_commands()[command_name], command_name)
+        call_command(command, **command_options)
+    except BaseException as e:
+        status, error = 'FAILED', str(e) or e.__class__.__name__
+        traceback.print_exc(file=sys.stdout)
+    finally:
+        sys.stdout.flush()
+        timings = getattr(command, 'timings', None) or StageTimer()
+        results.put({
+            'region': region,
+            'status': status,
+            'error': error,
+            'seconds': time.perf_counter() - start,
+            'timings': timings.as_dict(),
+        })
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run the NRLDC, SRLDC, WRLDC and POSOCO pipelines concurrently (one process per region), then merge_reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            dest='date',
+            required=False,
+            help='Report date in YYYY-MM-DD format, passed to every region command and merge_reports. Defaults to today.'
+        )
+        parser.add_argument(
+            '--regions',
+            nargs='+',
+            choices=list(REGION_COMMANDS),
+            default=list(REGION_COMMANDS),
+            help='Regions to run (default: all).'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=None,
+            help='Seconds each region may run before it is terminated. Defaults to settings.RUN_ALL_REGION_TIMEOUT.'
+        )
+        parser.add_argument('--skip-merge', dest='skip_merge', action='store_true', help='Do not run merge_reports afterwards.')
+        add_extraction_arguments(parser)
+
+    def mark_job(self, script_name, status, message):
+        """Mirror the outcome onto the dashboard's AutomationJob row; never fail the pipeline for it."""
+        from report_dashboard.models import AutomationJob
+
+        try:
+            job, _ = AutomationJob.objects.get_or_create(script_name=script_name)
+            job.status = status
+            job.log_message = message
+            now = timezone.now()
+            if status == AutomationJob.Status.RUNNING:
+                job.last_run_time = now
+            elif status == AutomationJob.Status.SUCCESS:
+                job.last_success_time = now
+            job.save()
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(f"⚠️ Could not update dashboard status for {script_name}: {e}"))
+
+    def run_regions(self, regions, command_options, timeout):
+        ctx = multiprocessing.get_context()
+        results = ctx.Queue()
+        # Children must open their own connections.
+        connections.close_all()
+
+        processes = {}
+        for region in regions:
+            process = ctx.Process(target=_run_region, args=(region, command_options, results), name=f"run_all-{region}")
+            process.start()
+            processes[region] = process
+            self.stdout.write(f"🚀 Started {REGION_COMMANDS[region]} (pid {process.pid})")
+
+        outcomes = {}
+        deadline = time.monotonic() + timeout
+        while len(outcomes) < len(processes) and time.monotonic() < deadline:
+            try:
+                outcome = results.get(timeout=min(1.0, max(0.0, deadline - time.monotonic())))
+                outcomes[outcome['region']] = outcome
+            except queue.Empty:
+                if not any(p.is_alive() for r, p in processes.items() if r not in outcomes):
+                    # Every remaining process died without reporting; drain anything still in flight.
+                    try:
+                        outcome = results.get(timeout=1.0)
+                        outcomes[outcome['region']] = outcome
+                        continue
+                    except queue.Empty:
+                        break
+
+        for region, process in processes.items():
+            if region not in outcomes and process.is_alive():
+                process.terminate()
+                process.join(5)
+                outcomes[region] = {
+                    'region': region, 'status': 'TIMEOUT', 'error': f'terminated after {timeout:.0f}s',
+                    'seconds': timeout, 'timings': {},
+                }
+            else:
+                process.join(5)
+                outcomes.setdefault(region, {
+                    'region': region, 'status': 'FAILED', 'error': f'exited with code {process.exitcode}',
+                    'seconds': 0.0, 'timings': {},
+                })
+        return outcomes
+
+    def write_summary(self, outcomes, regions, wall_seconds):
+        self.stdout.write(self.style.HTTP_INFO("\n--- Per-stage timings (seconds) ---"))
+        header = f"{'REGION':<8} | {'STATUS':<8} | {'TOTAL':>7} | " + " | ".join(f"{s:>10}" for s in STAGES)
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for region in regions:
+            outcome = outcomes[region]
+            cells = " | ".join(
+                f"{outcome['timings'][s]:>10.2f}" if s in outcome['timings'] else f"{'-':>10}"
+                for s in STAGES
+            )
+            line = f"{region.upper():<8} | {outcome['status']:<8} | {outcome['seconds']:>7.2f} | {cells}"
+            style = self.style.SUCCESS if outcome['status'] == 'SUCCESS' else self.style.ERROR
+            self.stdout.write(style(line))
+            if outcome['error']:
+                self.stdout.write(f"{'':<8}   ↳ {outcome['error']}")
+
+        serial = sum(outcomes[r]['seconds'] for r in regions)
+        self.stdout.write(f"\nRegions wall time: {wall_seconds:.2f}s (sum of region times: {serial:.2f}s)")
+
+    def handle(self, *args, **options):
+        date_str = options.get('date')
+        if date_str:
+            try:
+                datetime.datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                raise CommandError("Date format is incorrect. Please use YYYY-MM-DD.")
+
+        timeout = options.get('timeout') or getattr(settings, 'RUN_ALL_REGION_TIMEOUT', 900)
+        regions = [r for r in REGION_COMMANDS if r in options['regions']]
+        command_options = {'engine': options.get('engine'), 'no_cache': options.get('no_cache', False)}
+        if date_str:
+            command_options['date'] = date_str
+
+        if getattr(settings, 'PARTITION_REPORT_TABLES', False):
+            # Keep the coming months' partitions in place; rows still land in the default partition otherwise
+            try:
+                call_command('manage_partitions')
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"⚠️ Partition maintenance failed: {e}"))
+
+        for region in regions:
+            self.mark_job(REGION_COMMANDS[region], 'RUNNING', 'Started by run_all...')
+
+        start = time.perf_counter()
+        outcomes = self.run_regions(regions, command_options, timeout)
+        wall_seconds = time.perf_counter() - start
+
+        for region in regions:
+            outcome = outcomes[region]
+            status = 'SUCCESS' if outcome['status'] == 'SUCCESS' else 'FAILED'
+            message = f"run_all: {outcome['status']} in {outcome['seconds']:.1f}s"
+            if outcome['error']:
+                message += f" - {outcome['error']}"
+            self.mark_job(REGION_COMMANDS[region], status, message)
+
+        self.write_summary(outcomes, regions, wall_seconds)
+
+        if options.get('skip_merge'):
+            return
+
+        self.stdout.write(self.style.HTTP_INFO("\n--- merge_reports ---"))
+        self.mark_job('merge_reports', 'RUNNING', 'Started by run_all...')
+        merge_start = time.perf_counter()
+        try:
+            call_command('merge_reports', **({'date': date_str} if date_str else {}))
+        except Exception as e:
+            self.mark_job('merge_reports', 'FAILED', f"run_all: {e}")
+            raise CommandError(f"❌ merge_reports failed: {e}")
+        merge_seconds = time.perf_counter() - merge_start
+        self.mark_job('merge_reports', 'SUCCESS', f"run_all: SUCCESS in {merge_seconds:.1f}s")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Pipeline finished in {wall_seconds + merge_seconds:.2f}s (merge {merge_seconds:.2f}s)."
+        ))
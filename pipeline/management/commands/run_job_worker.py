@@ -0,0 +1,197 @@
+import datetime
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from multiprocessing.connection import wait
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from pipeline.forkserver import fork_context, start_forked, warm_up
+from report_dashboard.jobs import SCRIPT_NAMES
+
+
+def _execute(request, commands, worker):
+    """Run one claimed request with the preloaded commands and store its outcome."""
+    from report_dashboard.jobs import finish
+
+    print(f"▶️ [{worker}] #{request.pk} {request.script_name} {request.run_date or 'today'}", flush=True)
+    started = time.perf_counter()
+    error = None
+    try:
+        command = commands.get(request.script_name)
+        if command is None:
+            raise CommandError(f"Unknown script '{request.script_name}'.")
+        call_command(command, **({'date': request.run_date} if request.run_date else {}))
+    except BaseException as e:
+        error = str(e) or e.__class__.__name__
+        traceback.print_exc(file=sys.stdout)
+        if isinstance(e, KeyboardInterrupt):
+            finish(request, started, error)
+            raise
+    finally:
+        sys.stdout.flush()
+    try:
+        finish(request, started, error)
+    except Exception as e:
+        print(f"⚠️ [{worker}] Could not store the result of #{request.pk}: {e}", flush=True)
+        connections.close_all()
+    print(f"{'❌' if error else '✅'} [{worker}] #{request.pk} {request.script_name} "
+          f"in {time.perf_counter() - started:.1f}s", flush=True)
+
+
+def _work(worker, poll_seconds):
+    """Process target: claim queued requests and run them one at a time, forever."""
+    from report_dashboard.jobs import claim_next
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    django.setup()
+    # Never reuse a database connection inherited from the parent process.
+    connections.close_all()
+    commands = warm_up(SCRIPT_NAMES)
+
+    while True:
+        try:
+            request = claim_next(worker)
+        except Exception as e:
+            print(f"⚠️ [{worker}] Could not read the job queue: {e}", flush=True)
+            connections.close_all()
+            time.sleep(poll_seconds)
+            continue
+        if request is None:
+            time.sleep(poll_seconds)
+            continue
+        _execute(request, commands, worker)
+
+
+class Command(BaseCommand):
+    help = ('Run dashboard job requests from the queue in a bounded pool of worker processes '
+            'that keep Django and the extraction libraries loaded')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes, i.e. jobs run at once. Defaults to settings.JOB_WORKERS.')
+        parser.add_argument('--poll', type=float, default=None,
+                            help='Seconds an idle worker waits before checking the queue again. Defaults to settings.JOB_POLL_SECONDS.')
+        parser.add_argument('--fork-per-job', dest='fork_per_job', action='store_true', default=None,
+                            help='Fork a fresh child of the warmed-up parent for every job instead of reusing '
+                                 'long-lived workers. Defaults to settings.JOB_FORK_PER_JOB.')
+
+    def worker_name(self, index):
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    def start_worker(self, ctx, index, poll_seconds):
+        worker = self.worker_name(index)
+        # Not a daemon: run_all starts processes of its own
+        process = ctx.Process(target=_work, args=(worker, poll_seconds), name=f"job-worker-{index}")
+        process.start()
+        return worker, process
+
+    def serve_workers(self, pool, workers, poll_seconds):
+        """Keep `workers` long-lived worker processes running, restarting any that die."""
+        from report_dashboard.jobs import fail_abandoned
+
+        ctx = multiprocessing.get_context()
+        for index in range(workers):
+            pool[index] = self.start_worker(ctx, index, poll_seconds)
+        self.stdout.write(self.style.SUCCESS(f"✅ {workers} job worker(s) running, polling every {poll_seconds}s. Ctrl+C to stop."))
+
+        while True:
+            time.sleep(1.0)
+            for index, (worker, process) in list(pool.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                self.stdout.write(self.style.WARNING(f"⚠️ {worker} exited with code {process.exitcode}; restarting."))
+                fail_abandoned(f'Worker exited with code {process.exitcode}.', worker=worker)
+                connections.close_all()
+                pool[index] = self.start_worker(ctx, index, poll_seconds)
+
+    def serve_forked(self, pool, workers, poll_seconds, commands):
+        """Claim requests in this process and fork one warm child per request, at most `workers` at a time."""
+        from report_dashboard.jobs import claim_next, fail_abandoned
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Forking a warm child per job, {workers} at a time, polling every {poll_seconds}s. Ctrl+C to stop."
+        ))
+        while True:
+            for index, (worker, process) in list(pool.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                del pool[index]
+                if process.exitcode:
+                    fail_abandoned(f'Job process exited with code {process.exitcode}.', worker=worker)
+
+            free = [index for index in range(workers) if index not in pool]
+            if not free:
+                wait([process.sentinel for _, process in pool.values()], timeout=poll_seconds)
+                continue
+
+            worker = self.worker_name(free[0])
+            try:
+                request = claim_next(worker)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"⚠️ Could not read the job queue: {e}"))
+                request = None
+            if request is None:
+                connections.close_all()
+                time.sleep(poll_seconds)
+                continue
+            pool[free[0]] = (worker, start_forked(_execute, request, commands, worker, name=f"job-{request.pk}"))
+
+    def handle(self, *args, **options):
+        from report_dashboard.jobs import fail_abandoned, fail_orphaned
+
+        workers = options.get('workers') or getattr(settings, 'JOB_WORKERS', 2)
+        poll_seconds = options.get('poll') or getattr(settings, 'JOB_POLL_SECONDS', 2.0)
+        fork_per_job = options.get('fork_per_job')
+        if fork_per_job is None:
+            fork_per_job = getattr(settings, 'JOB_FORK_PER_JOB', False)
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+        if fork_per_job:
+            try:
+                fork_context()
+            except ValueError:
+                raise CommandError("❌ --fork-per-job needs the 'fork' start method (Linux or macOS).")
+
+        # Only requests of exited workers on this host, or older than any job runs; other instances keep theirs
+        max_age = datetime.timedelta(hours=getattr(settings, 'JOB_ABANDONED_AFTER_HOURS', 6))
+        abandoned = fail_orphaned('Worker stopped before the job finished.', socket.gethostname(), max_age)
+        if abandoned:
+            self.stdout.write(self.style.WARNING(f"⚠️ Marked {abandoned} interrupted job(s) as failed."))
+
+        # Load once here; forked workers and jobs inherit the imported modules
+        start = time.perf_counter()
+        commands = warm_up(SCRIPT_NAMES)
+        self.stdout.write(f"🔥 Preloaded {len(commands)} command(s) in {time.perf_counter() - start:.2f}s")
+        # Children must open their own connections.
+        connections.close_all()
+
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+        # Stop the workers too when a service manager sends SIGTERM
+        signal.signal(signal.SIGTERM, stop)
+
+        pool = {}
+        try:
+            if fork_per_job:
+                self.serve_forked(pool, workers, poll_seconds, commands)
+            else:
+                self.serve_workers(pool, workers, poll_seconds)
+        except KeyboardInterrupt:
+            self.stdout.write("🛑 Stopping workers...")
+        finally:
+            for worker, process in pool.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join(10)
+                fail_abandoned('Worker stopped before the job finished.', worker=worker)
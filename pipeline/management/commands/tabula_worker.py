@@ -0,0 +1,85 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Listener
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.extraction import read_pdf_local, worker_address, worker_authkey
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run a long-lived tabula worker that keeps the JVM warm for nrldc_project, srldc_project, wrldc_project and posoco'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Number of PDFs extracted concurrently inside the warm JVM (default: 4).'
+        )
+        parser.add_argument(
+            '--warmup-pdf',
+            dest='warmup_pdf',
+            required=False,
+            help='Optional PDF to extract once at startup so the first real report is already warm.'
+        )
+
+    def warm_up(self, warmup_pdf=None):
+        from tabula.backend import TabulaVm
+
+        vm = TabulaVm(java_options=['-Djava.awt.headless=true', '-Dfile.encoding=UTF8'], silent=True)
+        if not vm.tabula:
+            self.stdout.write(self.style.WARNING(
+                "⚠️ jpype is not available; the worker will still serve requests but each one spawns java."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ JVM started via jpype."))
+
+        if warmup_pdf:
+            tables = read_pdf_local(warmup_pdf, pages='all', multiple_tables=True, pandas_options={'header': None}, lattice=True)
+            self.stdout.write(self.style.SUCCESS(f"✅ Warm-up extraction found {len(tables)} tables in {warmup_pdf}."))
+
+    def serve_connection(self, conn):
+        try:
+            request = conn.recv()
+            pdf_path = request['pdf_path']
+            try:
+                tables = read_pdf_local(pdf_path, **request.get('options', {}))
+                conn.send(('ok', tables))
+                logger.info("Extracted %d tables from %s", len(tables or []), pdf_path)
+            except Exception as e:
+                conn.send(('error', f"Tabula extraction failed for {pdf_path}: {e}"))
+                logger.error("Tabula extraction failed for %s: %s", pdf_path, e)
+        except (EOFError, OSError) as e:
+            logger.warning("Client connection dropped: %s", e)
+        finally:
+            conn.close()
+
+    def handle(self, *args, **options):
+        authkey = worker_authkey()
+        if authkey is None:
+            # Requests are unpickled, so the key is all that stops other local users from running code here
+            raise CommandError("❌ Set TABULA_WORKER_AUTHKEY to a random secret (shared with the commands) before starting the worker.")
+        if "JAVA_HOME" not in os.environ:
+            self.stdout.write(self.style.WARNING("JAVA_HOME environment variable not set. tabula-py may fail."))
+
+        self.warm_up(options.get('warmup_pdf'))
+
+        address = worker_address()
+        with Listener(address, authkey=authkey) as listener, \
+                ThreadPoolExecutor(max_workers=max(1, options['threads'])) as pool:
+            self.stdout.write(self.style.SUCCESS(f"🚀 Tabula worker listening on {address[0]}:{address[1]}"))
+            try:
+                while True:
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        # Bad authkey or a client that hung up during the handshake
+                        logger.warning("Rejected worker connection: %s", e)
+                        continue
+                    pool.submit(self.serve_connection, conn)
+            except KeyboardInterrupt:
+                self.stdout.write("🛑 Tabula worker stopped.")
@@ -0,0 +1,63 @@
+"""
+One-pass index of table title markers in the combined tabula frame.
+
+The region parsers used to walk every row with iterrows() and run a regex over
+each row, once for the start marker and again for the end marker of every table.
+MarkerIndex stacks all cells into one string array, runs each marker regex once
+over the distinct cell texts, and keeps a per-row hit vector per marker, so every
+table can be sliced from precomputed row offsets.
+
+Offsets are positional (iloc) row numbers of the frame the index was built from.
+"""
+import numpy as np
+import pandas as pd
+
+
+class MarkerIndex:
+    def __init__(self, df, patterns):
+        values = df.to_numpy(dtype=object)
+        n_rows = values.shape[0]
+        cells = (
+            pd.Series(values.ravel(), dtype=object)
+            .astype(str)
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.strip()
+        )
+        # NaN cells come through astype(str) as 'nan'; they can never hold a marker.
+        cells = cells.mask(cells.isin(['nan', 'None']), '')
+        distinct, inverse = np.unique(cells.to_numpy(dtype=str), return_inverse=True)
+        distinct = pd.Series(distinct)
+
+        self.n_rows = n_rows
+        self.row_hits = {}
+        for pattern in dict.fromkeys(p for p in patterns if p):
+            matched = distinct.str.contains(pattern, regex=True, case=False, na=False).to_numpy()
+            if n_rows and values.shape[1]:
+                self.row_hits[pattern] = matched[inverse].reshape(values.shape).any(axis=1)
+            else:
+                self.row_hits[pattern] = np.zeros(n_rows, dtype=bool)
+
+    def _hits(self, pattern):
+        if pattern not in self.row_hits:
+            raise KeyError(f"Marker {pattern!r} was not indexed")
+        return self.row_hits[pattern]
+
+    def first(self, pattern, start=0):
+        """Positional offset of the first row at or after start that matches pattern, or None."""
+        hits = self._hits(pattern)[start:]
+        if not hits.any():
+            return None
+        return start + int(hits.argmax())
+
+    def span(self, start_marker, end_marker=None, end_search_offset=1):
+        """
+        Return (start, end) offsets of a table.
+
+        end is the first row matching end_marker at or after start + end_search_offset,
+        or None when there is no end marker or it is not found. start is None when the
+        start marker is not found.
+        """
+        start = self.first(start_marker)
+        if start is None or not end_marker:
+            return start, None
+        return start, self.first(end_marker, start + end_search_offset)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=16)),
+                ('report_date', models.DateField()),
+                ('entity', models.CharField(max_length=100)),
+                ('metric', models.CharField(max_length=64)),
+                ('value', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'report_date', 'entity'], name='metricfact_metric_date_idx'), models.Index(fields=['entity', 'metric', 'report_date'], name='metricfact_entity_metric_idx')],
+                'unique_together': {('source', 'report_date', 'entity', 'metric')},
+            },
+        ),
+    ]
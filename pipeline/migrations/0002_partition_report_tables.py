@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:40
+
+from django.conf import settings
+from django.db import migrations
+
+from pipeline import partitioning
+
+
+def partition_report_tables(apps, schema_editor):
+    """Opt-in: only with settings.PARTITION_REPORT_TABLES on PostgreSQL (manage_partitions --convert does it later)."""
+    connection = schema_editor.connection
+    if not getattr(settings, 'PARTITION_REPORT_TABLES', False) or connection.vendor != 'postgresql':
+        return
+    months_ahead = getattr(settings, 'PARTITION_MONTHS_AHEAD', partitioning.DEFAULT_MONTHS_AHEAD)
+    partitioning.convert_all(connection, apps, months_ahead)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0001_initial'),
+        ('nrldc_app', '0008_report_date_brin'),
+        ('srldc_app', '0006_report_date_brin'),
+        ('wrldc_app', '0011_report_date_brin'),
+        ('posoco', '0008_report_date_brin'),
+    ]
+
+    operations = [
+        # Partitioned tables cannot be converted back in place; reversing leaves them partitioned
+        migrations.RunPython(partition_report_tables, migrations.RunPython.noop),
+    ]
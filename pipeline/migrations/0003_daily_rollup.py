@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0002_partition_report_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('report_date', models.DateField(primary_key=True, serialize=False)),
+                ('energy_met_mu', models.FloatField(blank=True, null=True)),
+                ('requirement_mu', models.FloatField(blank=True, null=True)),
+                ('shortage_mu', models.FloatField(blank=True, null=True)),
+                ('generation_mu', models.FloatField(blank=True, null=True)),
+                ('thermal_mu', models.FloatField(blank=True, null=True)),
+                ('hydro_mu', models.FloatField(blank=True, null=True)),
+                ('gas_mu', models.FloatField(blank=True, null=True)),
+                ('solar_mu', models.FloatField(blank=True, null=True)),
+                ('wind_mu', models.FloatField(blank=True, null=True)),
+                ('other_mu', models.FloatField(blank=True, null=True)),
+                ('regions', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0003_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('script_name', models.CharField(max_length=100)),
+                ('target_date', models.DateField(blank=True, null=True)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('duration_seconds', models.FloatField()),
+                ('status', models.CharField(choices=[('SUCCESS', 'Success'), ('SKIPPED', 'Skipped'), ('FAILED', 'Failed')], max_length=20)),
+                ('error', models.TextField(blank=True, default='')),
+                ('metadata_seconds', models.FloatField(blank=True, null=True)),
+                ('download_seconds', models.FloatField(blank=True, null=True)),
+                ('extract_seconds', models.FloatField(blank=True, null=True)),
+                ('parse_seconds', models.FloatField(blank=True, null=True)),
+                ('db_write_seconds', models.FloatField(blank=True, null=True)),
+                ('json_write_seconds', models.FloatField(blank=True, null=True)),
+                ('bytes_downloaded', models.BigIntegerField(default=0)),
+                ('rows_written', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['script_name', 'started_at'], name='pipelinerun_script_idx')],
+            },
+        ),
+    ]
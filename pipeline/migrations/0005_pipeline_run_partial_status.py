@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pipeline', '0004_pipeline_run'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pipelinerun',
+            name='status',
+            field=models.CharField(choices=[('SUCCESS', 'Success'), ('SKIPPED', 'Skipped'), ('PARTIAL', 'Partial'), ('FAILED', 'Failed')], max_length=20),
+        ),
+    ]
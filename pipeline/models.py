@@ -0,0 +1,94 @@
+from django.db import models
+
+
+class MetricFact(models.Model):
+    """
+    One value from any report in a narrow (source, report_date, entity, metric) layout.
+
+    The region and POSOCO tables keep their own wide layouts; every ingest also
+    writes its values here under the canonical metric names declared on the table
+    specs (pipeline/table_specs.py), so cross-region questions are a single query.
+    """
+    source = models.CharField(max_length=16)      # nrldc, srldc, wrldc or posoco
+    report_date = models.DateField()
+    entity = models.CharField(max_length=100)     # state / region label, upper-cased
+    metric = models.CharField(max_length=64)      # canonical name, e.g. solar_mu, max_demand_mw
+    value = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} | {self.report_date} | {self.entity} | {self.metric} = {self.value}"
+
+    class Meta:
+        unique_together = ('source', 'report_date', 'entity', 'metric')
+        indexes = [
+            # "metric X for every entity over a date range"
+            models.Index(fields=['metric', 'report_date', 'entity'], name='metricfact_metric_date_idx'),
+            # "history of one entity's metric"
+            models.Index(fields=['entity', 'metric', 'report_date'], name='metricfact_entity_metric_idx'),
+        ]
+
+
+class DailyRollup(models.Model):
+    """
+    Per-day totals across the regions, recomputed from MetricFact for the affected
+    dates whenever an ingest commits (pipeline/rollups.py). Read by primary key.
+    """
+    report_date = models.DateField(primary_key=True)
+
+    # Sums over the state rows of NRLDC, SRLDC and WRLDC (MU)
+    energy_met_mu = models.FloatField(null=True, blank=True)
+    requirement_mu = models.FloatField(null=True, blank=True)
+    shortage_mu = models.FloatField(null=True, blank=True)
+    generation_mu = models.FloatField(null=True, blank=True)
+    thermal_mu = models.FloatField(null=True, blank=True)
+    hydro_mu = models.FloatField(null=True, blank=True)
+    gas_mu = models.FloatField(null=True, blank=True)
+    solar_mu = models.FloatField(null=True, blank=True)
+    wind_mu = models.FloatField(null=True, blank=True)
+    other_mu = models.FloatField(null=True, blank=True)
+
+    # {"nrldc": {metric: subtotal}, ..., "posoco": {"NR": {metric: value}, ..., "ALL INDIA": {...}}}
+    regions = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Daily rollup {self.report_date}"
+
+
+class PipelineRun(models.Model):
+    """
+    One run of a region command or merge_reports with its per-stage timings
+    (pipeline/timing.py STAGES), written when the run ends (pipeline/runs.py).
+    """
+    class Status(models.TextChoices):
+        SUCCESS = 'SUCCESS', 'Success'
+        SKIPPED = 'SKIPPED', 'Skipped'
+        PARTIAL = 'PARTIAL', 'Partial'
+        FAILED = 'FAILED', 'Failed'
+
+    script_name = models.CharField(max_length=100)
+    target_date = models.DateField(null=True, blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_seconds = models.FloatField()
+    status = models.CharField(max_length=20, choices=Status.choices)
+    error = models.TextField(blank=True, default='')
+
+    # Seconds spent in each stage; null when the run never reached it
+    metadata_seconds = models.FloatField(null=True, blank=True)
+    download_seconds = models.FloatField(null=True, blank=True)
+    extract_seconds = models.FloatField(null=True, blank=True)
+    parse_seconds = models.FloatField(null=True, blank=True)
+    db_write_seconds = models.FloatField(null=True, blank=True)
+    json_write_seconds = models.FloatField(null=True, blank=True)
+
+    bytes_downloaded = models.BigIntegerField(default=0)
+    rows_written = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.script_name} {self.target_date or ''} {self.status} ({self.duration_seconds:.1f}s)"
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [models.Index(fields=['script_name', 'started_at'], name='pipelinerun_script_idx')]
@@ -0,0 +1,211 @@
+"""
+Monthly range partitioning of the report tables by report_date (PostgreSQL, opt-in).
+
+Every region table grows by a fixed number of rows per day and most reads touch
+recent dates. With settings.PARTITION_REPORT_TABLES enabled, migration
+pipeline 0002 (or `manage.py manage_partitions --convert` later) rebuilds each
+table in PARTITIONED_MODELS as a declarative partitioned table:
+
+  <table>            PARTITION BY RANGE (report_date), primary key (id, report_date)
+  <table>_pYYYYMM    one partition per month, [first day, first day of next month)
+  <table>_default    catches dates outside every monthly partition
+
+Indexes and unique constraints are recreated on the parent under their original
+names, so the ORM and later migrations see the same table. The unique keys
+already contain report_date; Postgres requires that for partitioned tables.
+
+ensure_partitions() creates the coming months' partitions (run_all calls it
+before every run) and moves any rows that fell into the default partition.
+detach_partitions() detaches months older than a cutoff and moves them into an
+archive schema, where they stay queryable by SQL but are out of the ORM's reach
+and of autovacuum on the live table.
+"""
+import datetime
+import logging
+import re
+
+from django.apps import apps as global_apps
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_MODELS = (
+    'nrldc_app.Nrldc2AData', 'nrldc_app.Nrldc2CData',
+    'srldc_app.Srldc2AData', 'srldc_app.Srldc2CData',
+    'wrldc_app.Wrldc2AData', 'wrldc_app.Wrldc2CData',
+    'posoco.PosocoTableA', 'posoco.PosocoTableG',
+)
+PARTITION_KEY = 'report_date'
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_ARCHIVE_SCHEMA = 'archive'
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def report_tables(apps=None):
+    """db_table of every partitioned model (historical models inside migrations)."""
+    apps = apps or global_apps
+    return [apps.get_model(label)._meta.db_table for label in PARTITIONED_MODELS]
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [table])
+    row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def monthly_partitions(cursor, table):
+    """{month: partition name} of the monthly partitions attached to table."""
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s)",
+        [table],
+    )
+    pattern = re.compile(rf'^{re.escape(table)}_p(\d{{4}})(\d{{2}})$')
+    found = {}
+    for (name,) in cursor.fetchall():
+        match = pattern.match(name)
+        if match:
+            found[datetime.date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return found
+
+
+def create_partition(cursor, table, month):
+    """
+    Attach the partition for month, moving its rows out of the default partition
+    first (a partition cannot be attached while the default one holds its dates).
+    """
+    qn = cursor.db.ops.quote_name
+    name = partition_name(table, month)
+    start, end = month, add_months(month, 1)
+    cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS)")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(table + '_default')} "
+        f"WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) "
+        f"INSERT INTO {qn(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    # DDL takes no bind parameters; ISO dates are safe literals
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    return name
+
+
+def _constraints_and_indexes(cursor, table):
+    cursor.execute(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u') ORDER BY contype",
+        [table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT i.indexname, i.indexdef FROM pg_indexes i "
+        "WHERE i.schemaname = current_schema() AND i.tablename = %s AND i.indexname NOT IN "
+        "(SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s))",
+        [table, table],
+    )
+    return constraints, cursor.fetchall()
+
+
+def convert_table(cursor, table, months_ahead=DEFAULT_MONTHS_AHEAD):
+    """Rebuild table as a monthly-partitioned table with the same rows, indexes and id sequence."""
+    qn = cursor.db.ops.quote_name
+    if is_partitioned(cursor, table):
+        return False
+
+    constraints, indexes = _constraints_and_indexes(cursor, table)
+    for name, kind, definition in constraints:
+        if kind == 'u' and PARTITION_KEY not in definition:
+            raise ValueError(f"{table}: unique constraint {name} ({definition}) does not include {PARTITION_KEY}")
+    cursor.execute(
+        "SELECT attidentity, pg_get_serial_sequence(%s, 'id') FROM pg_attribute "
+        "WHERE attrelid = to_regclass(%s) AND attname = 'id'",
+        [table, table],
+    )
+    identity, sequence = cursor.fetchone()
+
+    old = f"{table}_unpartitioned"
+    cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+    cursor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+        f"PARTITION BY RANGE ({PARTITION_KEY})"
+    )
+    cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+    cursor.execute(f"SELECT min({PARTITION_KEY}) FROM {qn(old)}")
+    first = cursor.fetchone()[0]
+    this_month = month_start(datetime.date.today())
+    month = month_start(first) if first else this_month
+    while month <= add_months(this_month, months_ahead):
+        create_partition(cursor, table, month)
+        month = add_months(month, 1)
+
+    cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+    if identity:
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false) FROM {qn(table)}",
+            [table],
+        )
+    elif sequence:
+        # serial column: the copied default still uses the old sequence; keep it alive
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.id")
+    cursor.execute(f"DROP TABLE {qn(old)}")
+
+    for name, kind, definition in constraints:
+        if kind == 'p':
+            definition = f"PRIMARY KEY (id, {PARTITION_KEY})"
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+    for name, definition in indexes:
+        cursor.execute(definition)
+    return True
+
+
+def ensure_partitions(cursor, table, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """Create the missing monthly partitions from this month to months_ahead; returns their names."""
+    existing = monthly_partitions(cursor, table)
+    this_month = month_start(today or datetime.date.today())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(this_month, offset)
+        if month not in existing:
+            created.append(create_partition(cursor, table, month))
+    return created
+
+
+def detach_partitions(cursor, table, before, archive_schema=DEFAULT_ARCHIVE_SCHEMA):
+    """Detach the monthly partitions ending on or before `before` and move them into archive_schema."""
+    qn = cursor.db.ops.quote_name
+    detached = []
+    for month, name in sorted(monthly_partitions(cursor, table).items()):
+        if add_months(month, 1) > before:
+            continue
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        if archive_schema:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {qn(archive_schema)}")
+            cursor.execute(f"ALTER TABLE {qn(name)} SET SCHEMA {qn(archive_schema)}")
+        detached.append(name)
+    return detached
+
+
+def convert_all(connection, apps=None, months_ahead=DEFAULT_MONTHS_AHEAD):
+    """Convert every report table that is not partitioned yet; returns the converted table names."""
+    converted = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for table in report_tables(apps):
+            if convert_table(cursor, table, months_ahead):
+                logger.info("Partitioned %s by month of %s", table, PARTITION_KEY)
+                converted.append(table)
+    return converted
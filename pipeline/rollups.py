@@ -0,0 +1,82 @@
+"""
+Daily all-India rollups maintained from pipeline.MetricFact.
+
+record_facts() schedules refresh_daily_rollups() with transaction.on_commit()
+for the report dates it touched, so a region ingest recomputes only its own
+dates, and only once its rows are committed. A refresh is a grouped query over
+that day's facts: state rows are summed per region source (the REGION / WR
+/ TOTAL rows that already total a region are left out) and the region
+subtotals are added up into the DailyRollup columns; POSOCO's per-region
+values are kept as reported. Readers then fetch one row by primary key.
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Sum
+
+from pipeline.ingest import bulk_upsert
+from pipeline.models import DailyRollup, MetricFact
+
+logger = logging.getLogger(__name__)
+
+# MetricFact metric names summed into the DailyRollup column of the same name
+ROLLUP_METRICS = (
+    'energy_met_mu', 'requirement_mu', 'shortage_mu', 'generation_mu',
+    'thermal_mu', 'hydro_mu', 'gas_mu', 'solar_mu', 'wind_mu', 'other_mu',
+)
+REGION_SOURCES = ('nrldc', 'srldc', 'wrldc')
+# Row labels that already total a region's states
+AGGREGATE_ENTITIES = frozenset(['REGION', 'TOTAL', 'REGION TOTAL', 'GRAND TOTAL', 'NR', 'SR', 'WR', 'ER', 'NER'])
+DATES_PER_QUERY = 366
+
+
+def build_rollups(dates):
+    """{report_date: DailyRollup field values} for the dates that have facts."""
+    subtotals = defaultdict(lambda: defaultdict(dict))
+    sums = (
+        MetricFact.objects
+        .filter(report_date__in=dates, source__in=REGION_SOURCES, metric__in=ROLLUP_METRICS)
+        .exclude(entity__in=AGGREGATE_ENTITIES)
+        .values_list('report_date', 'source', 'metric')
+        .annotate(total=Sum('value'))
+        .order_by()
+    )
+    for report_date, source, metric, total in sums:
+        subtotals[report_date][source][metric] = total
+
+    posoco = MetricFact.objects.filter(report_date__in=dates, source='posoco').values_list('report_date', 'entity', 'metric', 'value')
+    for report_date, entity, metric, value in posoco:
+        subtotals[report_date]['posoco'].setdefault(entity, {})[metric] = value
+
+    rollups = {}
+    for report_date, regions in subtotals.items():
+        row = {'report_date': report_date, 'regions': {source: dict(values) for source, values in sorted(regions.items())}}
+        for metric in ROLLUP_METRICS:
+            values = [regions[source][metric] for source in REGION_SOURCES if metric in regions.get(source, {})]
+            row[metric] = sum(values) if values else None
+        rollups[report_date] = row
+    return rollups
+
+
+def refresh_daily_rollups(dates):
+    """Recompute the DailyRollup rows of dates; dates left without facts lose their rollup."""
+    dates = sorted(set(dates))
+    for start in range(0, len(dates), DATES_PER_QUERY):
+        chunk = dates[start:start + DATES_PER_QUERY]
+        rollups = build_rollups(chunk)
+        with transaction.atomic():
+            bulk_upsert(
+                DailyRollup, list(rollups.values()), unique_fields=('report_date',),
+                update_fields=[*ROLLUP_METRICS, 'regions', 'updated_at'],
+            )
+            DailyRollup.objects.filter(report_date__in=[d for d in chunk if d not in rollups]).delete()
+    return len(dates)
+
+
+def schedule_rollup_refresh(facts):
+    """Refresh the rollups of the dates in facts once the surrounding transaction commits."""
+    dates = {fact['report_date'] for fact in facts if fact['metric'] in ROLLUP_METRICS or fact['source'] == 'posoco'}
+    if dates:
+        # robust: a failed refresh is logged instead of failing the ingest that already committed
+        transaction.on_commit(lambda: refresh_daily_rollups(dates), robust=True)
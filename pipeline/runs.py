@@ -0,0 +1,120 @@
+"""
+Run history of the region commands and merge_reports (pipeline.PipelineRun).
+
+A command's handle() is decorated with @recorded_run('<script>'). The command
+finds an unsaved PipelineRun on self.pipeline_run, sets its target_date once
+known, and sets status SKIPPED when there was nothing to do. A command that
+could not save some of its tables raises TablesNotSaved, which stores the run
+as PARTIAL when other tables were saved and FAILED otherwise. When handle()
+returns or raises, the run is stored with its outcome, the stage durations of
+self.timings (a fresh StageTimer per run), and the bytes downloaded
+(pipeline.http_cache.stats) and report table rows written (pipeline.ingest.stats,
+leaving out MetricFact and DailyRollup) in between.
+Storing the run never fails the command.
+
+stage_summary() gives the p50/p95 of every stage per script for the dashboard's
+history page.
+"""
+import functools
+import logging
+import time
+
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from pipeline import http_cache, ingest
+from pipeline.models import PipelineRun
+from pipeline.timing import STAGES, StageTimer
+
+logger = logging.getLogger(__name__)
+
+STAGE_FIELDS = {stage: f"{stage}_seconds" for stage in STAGES}
+
+
+class TablesNotSaved(CommandError):
+    """Raised once every table was attempted: errors lists the failures, saved counts the tables stored."""
+    def __init__(self, errors, saved=0):
+        self.errors = list(errors)
+        self.saved = saved
+        super().__init__(f"❌ Could not save {len(self.errors)} table(s) to the database: {'; '.join(self.errors)}")
+
+
+def report_rows_written():
+    """Rows bulk_upsert() has written to the report tables in this process; the pipeline app's own tables are left out."""
+    return sum(count for label, count in ingest.stats.items() if not label.startswith('pipeline.'))
+
+
+def recorded_run(script_name):
+    """Decorator for a command's handle() that stores a PipelineRun for every call."""
+    def decorator(handle):
+        @functools.wraps(handle)
+        def wrapper(self, *args, **options):
+            # A worker process reuses command instances, so start every run with empty timings
+            self.timings = StageTimer()
+            run = self.pipeline_run = PipelineRun(script_name=script_name, started_at=timezone.now())
+            bytes_before, rows_before = http_cache.stats['bytes'], report_rows_written()
+            start = time.perf_counter()
+            try:
+                return handle(self, *args, **options)
+            except BaseException as e:
+                partial = isinstance(e, TablesNotSaved) and e.saved
+                run.status = PipelineRun.Status.PARTIAL if partial else PipelineRun.Status.FAILED
+                run.error = str(e) or e.__class__.__name__
+                raise
+            finally:
+                run.status = run.status or PipelineRun.Status.SUCCESS
+                run.duration_seconds = round(time.perf_counter() - start, 3)
+                run.finished_at = timezone.now()
+                run.bytes_downloaded = http_cache.stats['bytes'] - bytes_before
+                run.rows_written = report_rows_written() - rows_before
+                durations = self.timings.as_dict()
+                for stage, field in STAGE_FIELDS.items():
+                    setattr(run, field, durations.get(stage))
+                try:
+                    run.save()
+                except Exception as e:
+                    logger.warning("Could not store the %s run history: %s", script_name, e)
+        return wrapper
+    return decorator
+
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile (like PostgreSQL percentile_cont) of values, or None if empty."""
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def stage_summary(runs):
+    """
+    Per script: run counts and the p50/p95 of the total and of every stage over its
+    successful runs. runs is an iterable of PipelineRun values() dicts.
+    """
+    by_script = {}
+    for run in runs:
+        by_script.setdefault(run['script_name'], []).append(run)
+
+    summary = []
+    for script_name, script_runs in sorted(by_script.items()):
+        succeeded = [run for run in script_runs if run['status'] == PipelineRun.Status.SUCCESS]
+
+        def spread(field):
+            values = [run[field] for run in succeeded if run[field] is not None]
+            return {'p50': percentile(values, 0.5), 'p95': percentile(values, 0.95)}
+
+        summary.append({
+            'script_name': script_name,
+            'runs': len(script_runs),
+            'succeeded': len(succeeded),
+            'failed': sum(run['status'] == PipelineRun.Status.FAILED for run in script_runs),
+            'partial': sum(run['status'] == PipelineRun.Status.PARTIAL for run in script_runs),
+            'total': spread('duration_seconds'),
+            'stages': [dict(stage=stage, **spread(field)) for stage, field in STAGE_FIELDS.items()],
+            'bytes_downloaded': spread('bytes_downloaded'),
+            'rows_written': spread('rows_written'),
+        })
+    return summary
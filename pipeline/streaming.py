@@ -0,0 +1,49 @@
+"""
+Streaming file writes with on-the-fly SHA-256 hashing.
+
+stream_to_file() writes an iterable of byte chunks (e.g. response.iter_content())
+to a temporary file next to dest_path, hashes each chunk as it is written and
+renames the file into place with os.replace() once everything has been written.
+A partially downloaded file therefore never appears under the final name, the
+whole PDF is never held in memory, and the digest can be handed to
+read_tables_for_markers(pdf_sha256=...) so the table cache does not read the
+file a second time.
+"""
+import hashlib
+import os
+import tempfile
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+def stream_to_file(chunks, dest_path):
+    """Write chunks to dest_path atomically and return the SHA-256 hex digest of the bytes."""
+    directory = os.path.dirname(os.path.abspath(dest_path))
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            for chunk in chunks:
+                if chunk:
+                    digest.update(chunk)
+                    fh.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return digest.hexdigest()
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            yield chunk
+
+
+def copy_file(src, dest_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Atomically copy src to dest_path; returns the SHA-256 hex digest."""
+    return stream_to_file(read_chunks(src, chunk_size), dest_path)
@@ -0,0 +1,102 @@
+"""
+On-disk cache of the raw tables extracted from a PDF.
+
+Entries are keyed by the SHA-256 of the PDF bytes, PARSER_VERSION, the engine and
+the extraction options, so re-running a date whose PDF is unchanged (or re-parsing
+after a column-mapping fix) skips table extraction entirely. Bump PARSER_VERSION
+whenever the extraction step itself changes in a way that alters its output.
+
+The cache is bounded by settings.TABLE_CACHE_MAX_BYTES; the least recently used
+entries are evicted first (a hit refreshes the entry's modification time).
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+PARSER_VERSION = '1'
+
+DEFAULT_CACHE_DIR = os.path.join('downloads', 'table_cache')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TableCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or getattr(settings, 'TABLE_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(settings, 'TABLE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    def key(self, pdf_sha256, engine, **options):
+        extra = hashlib.sha256(repr(sorted(options.items())).encode('utf-8')).hexdigest()[:16]
+        return f"{pdf_sha256}-v{PARSER_VERSION}-{engine}-{extra}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                tables = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Discarding unreadable table cache entry %s: %s", path, e)
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return tables
+
+    def put(self, key, tables):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                pickle.dump(tables, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        try:
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except FileNotFoundError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            logger.info("Evicted table cache entry %s", path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
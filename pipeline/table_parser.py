@@ -0,0 +1,160 @@
+"""
+Shared interpreter for the table specs in pipeline/table_specs.py.
+
+The region commands concatenate the tables returned by the extraction engine,
+build one MarkerIndex over the result and hand each TableSpec to extract_table()
+and prepare_rows(). POSOCO's self-contained tables go through
+find_posoco_tables() and posoco_table_dict() instead.
+"""
+import pandas as pd
+
+from pipeline.markers import MarkerIndex
+from pipeline.table_specs import POSOCO_ROW_KEYS, STATE_FIELD, normalize_label
+
+
+def combine_tables(tables):
+    """Concatenate the extracted tables and drop fully empty rows."""
+    frames = [df for df in tables if df is not None]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True).dropna(axis=0, how='all')
+
+
+def build_marker_index(df, specs):
+    """One MarkerIndex covering the start and end markers of all specs."""
+    return MarkerIndex(df, [marker for spec in specs for marker in spec.markers])
+
+
+def combine_header_rows(headers_df):
+    """Fallback header for specs without columns: join the two header rows cell by cell."""
+    top = headers_df.iloc[0].astype(str).str.replace('\n', ' ', regex=False).str.strip().fillna('')
+    bottom = headers_df.iloc[1].astype(str).str.replace('\n', ' ', regex=False).str.strip().fillna('')
+    columns = []
+    for idx, (t_col, b_col) in enumerate(zip(top, bottom)):
+        if not t_col and not b_col:
+            columns.append(f"Unnamed_{idx}")
+        elif not b_col:
+            columns.append(t_col)
+        elif not t_col:
+            columns.append(b_col)
+        elif not b_col.startswith(t_col):
+            columns.append(f"{t_col} {b_col}".strip())
+        else:
+            columns.append(b_col)
+    return columns
+
+
+def extract_table(df, spec, marker_index=None):
+    """
+    Slice spec's table out of the combined frame and name its columns.
+
+    Returns None when the start marker is not found, otherwise a DataFrame (possibly
+    empty) holding the data rows with spec.columns assigned positionally. Extra
+    columns beyond spec.columns are dropped; fully empty rows and columns are removed.
+    """
+    if marker_index is None:
+        marker_index = MarkerIndex(df, spec.markers)
+    start, end = marker_index.span(spec.start_marker, spec.end_marker, end_search_offset=spec.end_search_offset)
+    if start is None:
+        return None
+
+    data_start = start + spec.data_offset
+    data = df.iloc[data_start:end].copy()
+    if spec.compact_columns:
+        data = data.dropna(axis=0, how='all').dropna(axis=1, how='all')
+
+    columns = spec.columns
+    if not columns:
+        header_rows = df.iloc[start + 1:data_start]
+        if len(header_rows) < 2:
+            return data.dropna(axis=0, how='all').dropna(axis=1, how='all').reset_index(drop=True)
+        columns = combine_header_rows(header_rows)
+
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+
+    width = min(len(columns), data.shape[1])
+    data = data.iloc[:, :width]
+    data.columns = [str(c).strip() for c in columns[:width]]
+    data = data.loc[:, ~data.columns.duplicated(keep='first')]
+    return data.dropna(axis=0, how='all').dropna(axis=1, how='all').reset_index(drop=True)
+
+
+def filter_states(frame, spec):
+    """
+    Keep the rows whose state is one of spec.states.
+
+    Returns (frame, lenient) where lenient is True when no row matched exactly and
+    spec.lenient_states was used instead.
+    """
+    if not spec.states or STATE_FIELD not in frame.columns:
+        return frame, False
+    labels = frame[STATE_FIELD].astype(str)
+    filtered = frame[labels.map(normalize_label).isin(spec.states)].copy()
+    if filtered.empty and not frame.empty and spec.lenient_states is not None:
+        return frame[labels.str.contains(spec.lenient_states, na=False)].copy(), True
+    return filtered, False
+
+
+def prepare_rows(frame, spec):
+    """
+    Rename spec's header columns to model fields, keep only mapped fields (in
+    mapping order) and filter rows by state.
+
+    Returns (frame, lenient) as filter_states does.
+    """
+    renamed = frame.rename(columns=spec.column_mapping)
+    renamed = renamed[[field for field in spec.fields if field in renamed.columns]]
+    filtered, lenient = filter_states(renamed, spec)
+    if spec.states and STATE_FIELD in filtered.columns:
+        filtered = filtered.dropna(subset=[STATE_FIELD])
+    return filtered, lenient
+
+
+def model_defaults(row, spec, to_float, to_string):
+    """Build update_or_create defaults for one prepared row using spec's field types."""
+    defaults = {}
+    for field in spec.fields:
+        if field == STATE_FIELD:
+            continue
+        value = row.get(field)
+        if field in spec.numeric_fields:
+            defaults[field] = to_float(value)
+        elif field in spec.string_fields:
+            defaults[field] = to_string(value)
+        else:
+            defaults[field] = value
+    return defaults
+
+
+def find_posoco_tables(tables, specs):
+    """
+    Return {spec.name: DataFrame} for each POSOCO spec whose first_column_text
+    appears in the first column of an extracted table. Earlier specs take
+    precedence when a table matches several.
+    """
+    found = {}
+    for df in tables:
+        if df.empty or len(df.columns) == 0:
+            continue
+        first_col = df.iloc[:, 0].astype(str)
+        for spec in specs:
+            if first_col.str.contains(spec.first_column_text, regex=False).any():
+                found[spec.name] = df
+                break
+        if len(found) == len(specs):
+            break
+    return found
+
+
+def posoco_table_dict(df, spec, row_keys=POSOCO_ROW_KEYS):
+    """Key each row of a POSOCO table by the short key of its first-column label."""
+    df = df.set_index(df.columns[0]).dropna(how='all')
+    result = {}
+    for original_key, row in df.iterrows():
+        if spec.collapse_whitespace:
+            clean_key = ' '.join(str(original_key).replace('\r', ' ').split())
+        else:
+            clean_key = str(original_key).strip()
+        result[row_keys.short_key(clean_key)] = row.dropna().to_dict()
+    return result
@@ -0,0 +1,454 @@
+"""
+Declarative description of every table the region commands keep.
+
+Each region used to carry its own copies of the marker regexes, header names,
+column mappings and state lists, rebuilt on every call. They are declared here
+once and compiled at import time (state lookups, lenient state regexes and the
+POSOCO row-label rules); pipeline/table_parser.py interprets them for all four
+commands.
+
+TableSpec fields:
+  markers            (start_marker, end_marker) regexes; also used for page targeting
+  columns            header names assigned positionally to the data columns
+  column_mapping     header name -> model field (identity when omitted)
+  data_offset        rows from the start marker row to the first data row
+  end_search_offset  rows after the start marker where the end marker search begins
+  compact_columns    drop empty columns before naming them (WRLDC's tables carry
+                     spacer columns that are not in the header)
+  states             accepted row labels; other rows are dropped when given
+  lenient_states     regex tried when no row matches states exactly
+  numeric_fields / string_fields   how the model fields are coerced
+  time_fields        text time-of-day fields that also get a parsed `<field>_at` TimeField
+  metrics            model field -> canonical metric name stored in pipeline.MetricFact
+
+Canonical metrics end in their unit: energy in MU (thermal_mu, solar_mu, energy_met_mu,
+drawal_actual_mu, ...) and power in MW (max_demand_mw, ace_max_mw, ...), so the same
+quantity has one name whatever each report calls its column.
+"""
+import re
+
+STATE_FIELD = 'state'
+
+
+def normalize_label(value):
+    """Upper-case, whitespace-collapsed form of a row label used for state matching."""
+    return re.sub(r'\s+', ' ', str(value).strip().upper()).replace('–', '-')
+
+
+class TableSpec:
+    def __init__(
+        self,
+        region,
+        name,
+        start_marker,
+        end_marker=None,
+        columns=(),
+        column_mapping=None,
+        data_offset=3,
+        end_search_offset=1,
+        compact_columns=False,
+        states=(),
+        lenient_states=None,
+        numeric_fields=(),
+        string_fields=(),
+        time_fields=(),
+        metrics=None,
+    ):
+        self.region = region
+        self.name = name
+        self.label = f"Table {name[0]}({name[1:]})"
+        self.json_key = f"{region}_table_{name}"
+        self.markers = (start_marker, end_marker)
+        self.columns = list(columns)
+        self.column_mapping = dict(column_mapping) if column_mapping else {c: c for c in self.columns}
+        self.fields = list(self.column_mapping.values())
+        self.data_offset = data_offset
+        self.end_search_offset = end_search_offset
+        self.compact_columns = compact_columns
+        self.states = frozenset(normalize_label(s) for s in states)
+        self.lenient_states = re.compile(lenient_states, re.IGNORECASE) if lenient_states else None
+        self.numeric_fields = frozenset(numeric_fields)
+        self.string_fields = frozenset(string_fields)
+        self.time_fields = tuple(time_fields)
+        self.metrics = dict(metrics or {})
+
+    @property
+    def start_marker(self):
+        return self.markers[0]
+
+    @property
+    def end_marker(self):
+        return self.markers[1]
+
+    def __repr__(self):
+        return f"<TableSpec {self.json_key}>"
+
+
+class PosocoTableSpec:
+    """A POSOCO table: found by a literal in its first column and keyed by its row labels."""
+
+    def __init__(
+        self, name, json_key, first_column_text, page_marker, collapse_whitespace=False, empty_keys=(), time_rows=(),
+        metrics=None, entity_fields=None,
+    ):
+        self.name = name
+        self.label = f"Table {name}"
+        self.json_key = json_key
+        self.first_column_text = first_column_text
+        self.markers = (page_marker, None)
+        self.collapse_whitespace = collapse_whitespace
+        self.empty_keys = list(empty_keys)
+        # Row keys whose region values are times of day (stored in the `<region>_at` columns)
+        self.time_rows = frozenset(time_rows)
+        # Row key -> canonical metric, and model column -> entity, for pipeline.MetricFact
+        self.metrics = dict(metrics or {})
+        self.entity_fields = dict(entity_fields or {})
+
+    def __repr__(self):
+        return f"<PosocoTableSpec {self.json_key}>"
+
+
+class RowKeyRules:
+    """
+    Maps POSOCO row labels to short keys.
+
+    rules is an ordered list of ('exact' | 'prefix', text, key). Exact labels are a
+    dict lookup; the prefixes are compiled into one anchored alternation whose
+    first matching branch wins, so the rule order is kept. Unmatched labels are
+    returned unchanged.
+    """
+
+    def __init__(self, rules):
+        self.exact = {}
+        prefix_keys = []
+        prefixes = []
+        for kind, text, key in rules:
+            if kind == 'exact':
+                self.exact.setdefault(text, key)
+            else:
+                prefixes.append(f"({re.escape(text)})")
+                prefix_keys.append(key)
+        self.prefix_keys = prefix_keys
+        self.prefix_re = re.compile('^(?:' + '|'.join(prefixes) + ')') if prefixes else None
+
+    def short_key(self, label):
+        key = label.strip()
+        if key in self.exact:
+            return self.exact[key]
+        if self.prefix_re is not None:
+            match = self.prefix_re.match(key)
+            if match:
+                return self.prefix_keys[match.lastindex - 1]
+        return key
+
+
+# ---------------------------------------------------------------------------
+# NRLDC
+# ---------------------------------------------------------------------------
+
+NRLDC_2A = TableSpec(
+    'nrldc', '2A',
+    start_marker=r".*2\s*\(A\)\s*State's\s*Load\s*Deails.*",
+    end_marker=r"2\s*\(B\)\s*State\s*Demand\s*Met\s*\(Peak\s*and\s*off-Peak\s*Hrs\)",
+    columns=[
+        'State', 'Thermal', 'Hydro', 'Gas/Naptha/Diesel', 'Solar', 'Wind', 'Others(Biomass/Co-gen etc.)',
+        'Total', 'Drawal Sch (Net MU)', 'Act Drawal (Net MU)', 'UI (Net MU)', 'Requirement (Net MU)',
+        'Shortage (Net MU)', 'Consumption (Net MU)',
+    ],
+    column_mapping={
+        'State': 'state',
+        'Thermal': 'thermal',
+        'Hydro': 'hydro',
+        'Gas/Naptha/Diesel': 'gas_naptha_diesel',
+        'Solar': 'solar',
+        'Wind': 'wind',
+        'Others(Biomass/Co-gen etc.)': 'other_biomass',
+        'Total': 'total',
+        'Drawal Sch (Net MU)': 'drawal_sch',
+        'Act Drawal (Net MU)': 'act_drawal',
+        'UI (Net MU)': 'ui',
+        'Requirement (Net MU)': 'requirement',
+        'Shortage (Net MU)': 'shortage',
+        'Consumption (Net MU)': 'consumption',
+    },
+    numeric_fields=[
+        'thermal', 'hydro', 'gas_naptha_diesel', 'solar', 'wind', 'other_biomass', 'total',
+        'drawal_sch', 'act_drawal', 'ui', 'requirement', 'shortage', 'consumption',
+    ],
+    metrics={
+        'thermal': 'thermal_mu', 'hydro': 'hydro_mu', 'gas_naptha_diesel': 'gas_mu', 'solar': 'solar_mu',
+        'wind': 'wind_mu', 'other_biomass': 'other_mu', 'total': 'generation_mu',
+        'drawal_sch': 'drawal_schedule_mu', 'act_drawal': 'drawal_actual_mu', 'ui': 'ui_mu',
+        'requirement': 'requirement_mu', 'shortage': 'shortage_mu', 'consumption': 'energy_met_mu',
+    },
+)
+
+NRLDC_2C = TableSpec(
+    'nrldc', '2C',
+    start_marker=r"2\s*\(C\)\s*State's\s*Demand\s*Met\s*in\s*MWs.*",
+    end_marker=r"3\s*\(A\)\s*StateEntities\s*Generation:",
+    columns=[
+        'State', 'Maximum Demand Met of the day', 'Time', 'Shortage during maximum demand',
+        'Requirement at maximum demand', 'Maximum requirement of the day', 'Time.1',
+        'Shortage during maximum requirement', 'Demand Met at maximum Requirement', 'Min Demand Met',
+        'Time.2', 'ACE_MAX', 'ACE_MIN', 'Time.3', 'Time.4',
+    ],
+    column_mapping={
+        'State': 'state',
+        'Maximum Demand Met of the day': 'max_demand',
+        'Time': 'time_max',
+        'Shortage during maximum demand': 'shortage_during',
+        'Requirement at maximum demand': 'req_max_demand',
+        'Maximum requirement of the day': 'max_req_day',
+        'Time.1': 'time_max_req',
+        'Shortage during maximum requirement': 'shortage_max_req',
+        'Demand Met at maximum Requirement': 'demand_met_max_req',
+        'Min Demand Met': 'min_demand_met',
+        'Time.2': 'time_min_demand',
+        'ACE_MAX': 'ace_max',
+        'ACE_MIN': 'ace_min',
+        'Time.3': 'time_ace_max',
+        'Time.4': 'time_ace_min',
+    },
+    numeric_fields=[
+        'max_demand', 'shortage_during', 'req_max_demand', 'max_req_day', 'shortage_max_req',
+        'demand_met_max_req', 'min_demand_met', 'ace_max', 'ace_min',
+    ],
+    string_fields=['time_max', 'time_max_req', 'time_min_demand', 'time_ace_max', 'time_ace_min'],
+    time_fields=['time_max', 'time_max_req', 'time_min_demand', 'time_ace_max', 'time_ace_min'],
+    metrics={
+        'max_demand': 'max_demand_mw',
+        'shortage_during': 'shortage_at_max_demand_mw',
+        'req_max_demand': 'requirement_at_max_demand_mw',
+        'max_req_day': 'max_requirement_mw',
+        'shortage_max_req': 'shortage_at_max_requirement_mw',
+        'demand_met_max_req': 'demand_met_at_max_requirement_mw',
+        'min_demand_met': 'min_demand_mw',
+        'ace_max': 'ace_max_mw',
+        'ace_min': 'ace_min_mw',
+    },
+)
+
+# ---------------------------------------------------------------------------
+# SRLDC
+# ---------------------------------------------------------------------------
+
+SRLDC_2A = TableSpec(
+    'srldc', '2A',
+    start_marker=r".*2\s*\(A\)State['’]?s\s*Load\s*Deails\s*\(At\s*State\s*Periphery\)\s*in\s*MUs.*",
+    end_marker=r".*2\s*\(B\)\s*State['’]?s\s*Demand\s*Met\s*in\s*MWs\s*and\s*day\s*energy\s*forecast\s*and\s*deviation\s*particulars.*",
+    columns=[
+        'STATE', 'THERMAL', 'HYDRO', 'GAS/DIESEL/NAPTHA', 'WIND', 'SOLAR', 'OTHERS',
+        'Net SCH (Net Mu)', 'Drawal (Net Mu)', 'UI (Net Mu)', 'Availability (Net MU)',
+        'Demand Met (Net MU)', 'Shortage # (Net MU)',
+    ],
+    column_mapping={
+        'STATE': 'state',
+        'THERMAL': 'thermal',
+        'HYDRO': 'hydro',
+        'GAS/DIESEL/NAPTHA': 'gas_naptha_diesel',
+        'SOLAR': 'solar',
+        'WIND': 'wind',
+        'OTHERS': 'others',
+        'Net SCH (Net Mu)': 'net_sch',
+        'Drawal (Net Mu)': 'drawal',
+        'UI (Net Mu)': 'ui',
+        'Availability (Net MU)': 'availability',
+        'Demand Met (Net MU)': 'demand_met',
+        'Shortage # (Net MU)': 'shortage',
+    },
+    states=["ANDHRA PRADESH", "KARNATAKA", "KERALA", "PONDICHERRY", "TAMILNADU", "TELANGANA", "REGION"],
+    lenient_states=r"ANDHRA PRADESH|KARNATAKA|KERALA|PONDICHERRY|TAMILNADU|TELANGANA|REGION",
+    numeric_fields=[
+        'thermal', 'hydro', 'gas_naptha_diesel', 'solar', 'wind', 'others', 'net_sch', 'drawal',
+        'ui', 'availability', 'demand_met', 'shortage',
+    ],
+    metrics={
+        'thermal': 'thermal_mu', 'hydro': 'hydro_mu', 'gas_naptha_diesel': 'gas_mu', 'solar': 'solar_mu',
+        'wind': 'wind_mu', 'others': 'other_mu', 'net_sch': 'drawal_schedule_mu',
+        'drawal': 'drawal_actual_mu', 'ui': 'ui_mu', 'availability': 'availability_mu',
+        'demand_met': 'energy_met_mu', 'shortage': 'shortage_mu',
+    },
+)
+
+# The extracted 2(C) table has no separate ACE_MIN/Time.4 columns: 'Min Demand Met'
+# and 'Time.2' hold the ACE minimum and its time.
+SRLDC_2C = TableSpec(
+    'srldc', '2C',
+    start_marker=r"2\s*\(C\)\s*State's\s*Demand\s*Met\s*in\s*MWs.*",
+    end_marker=r"3\s*\(A\)\s*StateEntities\s*Generation:",
+    columns=[
+        'State', 'Maximum Demand Met of the day', 'Time', 'Shortage during maximum demand',
+        'Requirement at maximum demand', 'Maximum requirement of the day', 'Time.1',
+        'Shortage during maximum requirement', 'Demand Met at maximum Requirement', 'Min Demand Met',
+        'Time.2', 'ACE_MAX', 'Time.3',
+    ],
+    column_mapping={
+        'State': 'state',
+        'Maximum Demand Met of the day': 'max_demand',
+        'Time': 'time',
+        'Shortage during maximum demand': 'shortage_max_demand',
+        'Requirement at maximum demand': 'req_max_demand',
+        'Demand Met at maximum Requirement': 'demand_max_req',
+        'Time.1': 'time_max_req',
+        'Shortage during maximum requirement': 'shortage_max_req',
+        'Maximum requirement of the day': 'max_req_day',
+        'Min Demand Met': 'ace_min',
+        'Time.2': 'time_ace_min',
+        'ACE_MAX': 'ace_max',
+        'Time.3': 'time_ace_max',
+    },
+    states=["AP", "KAR", "KER", "PONDY", "TN", "TG", "REGION"],
+    lenient_states=r"AP|KAR|KER|PONDY|TN|TG|REGION",
+    numeric_fields=[
+        'max_demand', 'shortage_max_demand', 'req_max_demand', 'demand_max_req', 'shortage_max_req',
+        'max_req_day', 'ace_min', 'ace_max',
+    ],
+    string_fields=['time', 'time_max_req', 'time_ace_min', 'time_ace_max'],
+    time_fields=['time', 'time_max_req', 'time_ace_min', 'time_ace_max'],
+    metrics={
+        'max_demand': 'max_demand_mw',
+        'shortage_max_demand': 'shortage_at_max_demand_mw',
+        'req_max_demand': 'requirement_at_max_demand_mw',
+        'max_req_day': 'max_requirement_mw',
+        'shortage_max_req': 'shortage_at_max_requirement_mw',
+        'demand_max_req': 'demand_met_at_max_requirement_mw',
+        'ace_max': 'ace_max_mw',
+        'ace_min': 'ace_min_mw',
+    },
+)
+
+# ---------------------------------------------------------------------------
+# WRLDC
+# ---------------------------------------------------------------------------
+
+WRLDC_2A = TableSpec(
+    'wrldc', '2A',
+    start_marker=r"2\(A\)\s*.*LOAD DETAILS.*IN MU",
+    # The end marker is table 2B, "Demand Met in MW"
+    end_marker=r"2\(B\).*Demand Met in MW",
+    columns=[
+        'State', 'Thermal', 'Hydro', 'Gas', 'Wind', 'Solar', 'Others', 'Total', 'Net SCH',
+        'Drawal', 'UI', 'Availability', 'Requirement', 'Shortage', 'Consumption',
+    ],
+    column_mapping={
+        'State': 'state', 'Thermal': 'thermal', 'Hydro': 'hydro',
+        'Gas': 'gas', 'Wind': 'wind', 'Solar': 'solar', 'Others': 'others',
+        'Total': 'total', 'Net SCH': 'net_sch', 'Drawal': 'drawal',
+        'UI': 'ui', 'Availability': 'availability', 'Requirement': 'requirement',
+        'Shortage': 'shortage', 'Consumption': 'consumption',
+    },
+    data_offset=2,
+    end_search_offset=2,
+    compact_columns=True,
+    states=[
+        "BALCO", "CHHATTISGARH", "DNHDDPDCL", "AMNSIL", "GOA", "GUJARAT",
+        "MADHYA PRADESH", "MAHARASHTRA", "RIL JAMNAGAR", "REGION", "WR",
+    ],
+    numeric_fields=[
+        'thermal', 'hydro', 'gas', 'wind', 'solar', 'others', 'total', 'net_sch', 'drawal',
+        'ui', 'availability', 'requirement', 'shortage', 'consumption',
+    ],
+    string_fields=['state'],
+    metrics={
+        'thermal': 'thermal_mu', 'hydro': 'hydro_mu', 'gas': 'gas_mu', 'wind': 'wind_mu',
+        'solar': 'solar_mu', 'others': 'other_mu', 'total': 'generation_mu',
+        'net_sch': 'drawal_schedule_mu', 'drawal': 'drawal_actual_mu', 'ui': 'ui_mu',
+        'availability': 'availability_mu', 'requirement': 'requirement_mu',
+        'shortage': 'shortage_mu', 'consumption': 'energy_met_mu',
+    },
+)
+
+WRLDC_2C = TableSpec(
+    'wrldc', '2C',
+    start_marker=r"2\(C\)\s*/\s*State's Demand Met in MW.*",
+    end_marker=r"3\(A\)\s*StateEntities\s*Generation:",
+    columns=[
+        'state', 'max_demand_day', 'time', 'shortage_max_demand', 'req_max_demand',
+        'ace_max', 'time_ace_max', 'ace_min', 'time_ace_min',
+    ],
+    data_offset=2,
+    end_search_offset=2,
+    compact_columns=True,
+    states=[
+        "BALCO", "CHHATTISGARH", "DNHDDPDCL", "AMNSIL", "GOA", "GUJARAT",
+        "MADHYA PRADESH", "MAHARASHTRA", "RIL JAMNAGAR", "WR",
+    ],
+    numeric_fields=['max_demand_day', 'shortage_max_demand', 'req_max_demand', 'ace_max', 'ace_min'],
+    string_fields=['state', 'time', 'time_ace_max', 'time_ace_min'],
+    time_fields=['time', 'time_ace_max', 'time_ace_min'],
+    metrics={
+        'max_demand_day': 'max_demand_mw',
+        'shortage_max_demand': 'shortage_at_max_demand_mw',
+        'req_max_demand': 'requirement_at_max_demand_mw',
+        'ace_max': 'ace_max_mw',
+        'ace_min': 'ace_min_mw',
+    },
+)
+
+# ---------------------------------------------------------------------------
+# POSOCO (NLDC all-India report)
+# ---------------------------------------------------------------------------
+
+POSOCO_TABLE_A = PosocoTableSpec(
+    'A', 'posoco_table_a',
+    first_column_text="Demand Met during Evening Peak",
+    page_marker=r"Demand Met during Evening Peak",
+    collapse_whitespace=True,
+    empty_keys=[
+        'demand_evening_peak', 'peak_shortage', 'energy', 'hydro', 'wind', 'solar',
+        'energy_shortage', 'max_demand_day', 'time_of_max_demand',
+    ],
+    time_rows=['time_of_max_demand'],
+    metrics={
+        'demand_evening_peak': 'evening_peak_demand_mw', 'peak_shortage': 'peak_shortage_mw',
+        'energy': 'energy_met_mu', 'hydro': 'hydro_mu', 'wind': 'wind_mu', 'solar': 'solar_mu',
+        'energy_shortage': 'shortage_mu', 'max_demand_day': 'max_demand_mw',
+    },
+    entity_fields={'nr': 'NR', 'wr': 'WR', 'sr': 'SR', 'er': 'ER', 'ner': 'NER', 'total': 'ALL INDIA'},
+)
+
+POSOCO_TABLE_G = PosocoTableSpec(
+    'G', 'posoco_table_g',
+    first_column_text="Coal",
+    page_marker=r"\bCoal\b",
+    empty_keys=['coal', 'lignite', 'hydro', 'nuclear', 'gas_naptha_diesel', 'res_total', 'total'],
+    # 'hydro' is left out: Table A already reports hydro_mu for every region.
+    metrics={
+        'coal': 'coal_mu', 'lignite': 'lignite_mu', 'nuclear': 'nuclear_mu',
+        'gas_naptha_diesel': 'gas_mu', 'res_total': 'res_mu', 'total': 'generation_mu',
+    },
+    entity_fields={'nr': 'NR', 'wr': 'WR', 'sr': 'SR', 'er': 'ER', 'ner': 'NER', 'all_india': 'ALL INDIA'},
+)
+
+# Most specific labels first; the first matching rule wins.
+POSOCO_ROW_KEYS = RowKeyRules([
+    ('prefix', "Demand Met during Evening Peak", 'demand_evening_peak'),
+    ('prefix', "Energy Shortage", 'energy_shortage'),
+    ('prefix', "Maximum Demand Met During the Day", 'max_demand_day'),
+    ('prefix', "Time Of Maximum Demand Met", 'time_of_max_demand'),
+    ('prefix', "Peak Shortage", 'peak_shortage'),
+    ('prefix', "Energy Met", 'energy'),
+    ('prefix', "Hydro Gen", 'hydro'),
+    ('prefix', "Wind Gen", 'wind'),
+    ('prefix', "Solar Gen", 'solar'),
+    ('exact', "Coal", 'coal'),
+    ('exact', "Lignite", 'lignite'),
+    ('exact', "Hydro", 'hydro'),
+    ('exact', "Nuclear", 'nuclear'),
+    ('exact', "Gas, Naptha & Diesel", 'gas_naptha_diesel'),
+    ('prefix', "RES", 'res_total'),
+    ('exact', "Total", 'total'),
+])
+
+TABLE_SPECS = {
+    'nrldc': [NRLDC_2A, NRLDC_2C],
+    'srldc': [SRLDC_2A, SRLDC_2C],
+    'wrldc': [WRLDC_2A, WRLDC_2C],
+    'posoco': [POSOCO_TABLE_A, POSOCO_TABLE_G],
+}
+
+
+def region_markers(region):
+    """(start_marker, end_marker) pairs of every table kept for region, for page targeting."""
+    return [spec.markers for spec in TABLE_SPECS[region]]
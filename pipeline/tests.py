@@ -0,0 +1,592 @@
+import datetime
+import importlib
+import io
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from nrldc_app.models import Nrldc2AData
+from pipeline import extraction, http_cache, http_client
+from pipeline.facts import record_facts, upsert_with_facts
+from pipeline.ingest import (
+    DEFAULT_UNIQUE_FIELDS, UpsertResult, add_parsed_times, bulk_upsert, dedupe_rows, parse_times, split_numeric,
+    split_numeric_fields,
+)
+from pipeline.management.commands.load_history import find_reports, report_rows
+from pipeline.models import MetricFact, PipelineRun
+from pipeline.runs import STAGE_FIELDS, TablesNotSaved, percentile, recorded_run, stage_summary
+from pipeline.table_parser import (
+    build_marker_index, combine_tables, extract_table, find_posoco_tables, posoco_table_dict, prepare_rows,
+)
+from pipeline.table_specs import (
+    NRLDC_2A, NRLDC_2C, POSOCO_ROW_KEYS, POSOCO_TABLE_A, POSOCO_TABLE_G, SRLDC_2A, SRLDC_2C, WRLDC_2A,
+)
+from pipeline.timing import StageTimer
+from srldc_app.management.commands.srldc_project import Command as SrldcCommand
+from srldc_app.models import Srldc2AData
+from wrldc_app.management.commands.wrldc_project import Command as WrldcCommand
+from wrldc_app.models import Wrldc2AData
+
+NaN = np.nan
+
+
+def frame(rows, width):
+    """DataFrame of rows padded with NaN to width columns, like a tabula frame with header=None."""
+    return pd.DataFrame([list(row) + [NaN] * (width - len(row)) for row in rows])
+
+
+class RegionTableSpecTests(SimpleTestCase):
+    def test_nrldc_2a_data_starts_three_rows_below_the_title(self):
+        df = frame([
+            ["Some earlier table"],
+            ["2(A) State's Load Deails (At State Periphery) in MUs"],
+            ["State", "Thermal", "Hydro"],
+            ["", "(Net MU)"],
+            ["PUNJAB", "100.5", "20", "1", "2", "3", "4", "130.5", "50", "49", "-1", "180", "0", "179.5"],
+            ["HARYANA", "90", "10", "0", "1", "2", "3", "106", "60", "61", "1", "167", "0", "167"],
+            ["2(B) State Demand Met (Peak and off-Peak Hrs)"],
+            ["PUNJAB", "999"],
+        ], 15)
+
+        table = extract_table(df, NRLDC_2A, build_marker_index(df, [NRLDC_2A, NRLDC_2C]))
+        rows, lenient = prepare_rows(table, NRLDC_2A)
+
+        self.assertFalse(lenient)
+        self.assertEqual(list(rows['state']), ['PUNJAB', 'HARYANA'])
+        self.assertEqual(list(rows.columns), NRLDC_2A.fields)
+        self.assertEqual(rows.iloc[0]['thermal'], '100.5')
+        self.assertEqual(rows.iloc[1]['consumption'], '167')
+
+    def test_missing_start_marker_returns_none(self):
+        df = frame([["nothing here"], ["PUNJAB", "1"]], 3)
+        self.assertIsNone(extract_table(df, NRLDC_2C))
+
+    def test_srldc_2a_keeps_listed_states_only(self):
+        df = frame([
+            ["2(A)State's Load Deails (At State Periphery) in MUs"],
+            ["STATE", "THERMAL"],
+            ["", ""],
+            ["ANDHRA PRADESH", "10"],
+            ["Tamilnadu", "20"],
+            ["Total", "30"],
+            ["2(B) State's Demand Met in MWs and day energy forecast and deviation particulars"],
+        ], 13)
+
+        rows, lenient = prepare_rows(extract_table(df, SRLDC_2A), SRLDC_2A)
+
+        self.assertFalse(lenient)
+        self.assertEqual(list(rows['state']), ['ANDHRA PRADESH', 'Tamilnadu'])
+
+    def test_srldc_2c_falls_back_to_lenient_states(self):
+        df = frame([
+            ["2(C) State's Demand Met in MWs"],
+            ["State"],
+            [""],
+            ["AP (Andhra)", "9000", "19:30"],
+            ["TN state", "15000", "1530"],
+            ["Remarks", "x"],
+            ["3(A) StateEntities Generation:"],
+        ], 13)
+
+        rows, lenient = prepare_rows(extract_table(df, SRLDC_2C), SRLDC_2C)
+
+        self.assertTrue(lenient)
+        self.assertEqual(list(rows['state']), ['AP (Andhra)', 'TN state'])
+        self.assertEqual(list(rows['time']), ['19:30', '1530'])
+
+    def test_wrldc_2a_drops_spacer_columns_before_naming(self):
+        values = [str(v) for v in range(1, 15)]
+        spaced = ["GUJARAT"] + [cell for value in values for cell in (value, NaN)]
+        df = frame([
+            ["2(A) STATE'S LOAD DETAILS (AT STATE PERIPHERY) IN MU"],
+            ["State", "Thermal"],
+            spaced,
+            ["WR"] + [cell for value in values for cell in (value, NaN)],
+            ["2(B) State's Demand Met in MW"],
+        ], 30)
+
+        rows, _ = prepare_rows(extract_table(df, WRLDC_2A), WRLDC_2A)
+
+        self.assertEqual(list(rows['state']), ['GUJARAT', 'WR'])
+        self.assertEqual(rows.iloc[0]['thermal'], '1')
+        self.assertEqual(rows.iloc[0]['consumption'], '14')
+
+    def test_combine_tables_skips_missing_and_empty_rows(self):
+        combined = combine_tables([frame([["a"], [NaN]], 2), None, frame([["b"]], 2)])
+        self.assertEqual(list(combined[0]), ['a', 'b'])
+
+
+class PosocoTableTests(SimpleTestCase):
+    def test_row_key_rules(self):
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Demand Met during Evening Peak hrs(MW) (at 20:00 hrs)"), 'demand_evening_peak')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Energy Shortage (MU)"), 'energy_shortage')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Energy Met (MU)"), 'energy')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Hydro Gen (MU)"), 'hydro')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key(" Hydro "), 'hydro')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Gas, Naptha & Diesel"), 'gas_naptha_diesel')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("RES (Wind, Solar, Biomass & Others)"), 'res_total')
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Total"), 'total')
+        # Exact rules do not match longer labels
+        self.assertEqual(POSOCO_ROW_KEYS.short_key("Total Generation"), 'Total Generation')
+
+    def test_tables_found_by_first_column_and_keyed_by_row_label(self):
+        table_a = pd.DataFrame([
+            ["Demand Met during Evening Peak hrs(MW)", "50000", "60000"],
+            ["Energy\r Met (MU)", "1100", "1300"],
+            ["Time Of Maximum Demand Met", "19:45", NaN],
+        ], columns=['label', 'NR', 'WR'])
+        table_g = pd.DataFrame([["Coal", "800", "900"], ["Total", "1000", "1100"]], columns=['label', 'NR', 'WR'])
+        other = pd.DataFrame([["Something else", "1"]], columns=['label', 'NR'])
+
+        found = find_posoco_tables([other, table_g, table_a], [POSOCO_TABLE_A, POSOCO_TABLE_G])
+        self.assertIs(found['A'], table_a)
+        self.assertIs(found['G'], table_g)
+
+        keyed = posoco_table_dict(found['A'], POSOCO_TABLE_A)
+        self.assertEqual(keyed['demand_evening_peak'], {'NR': '50000', 'WR': '60000'})
+        self.assertEqual(keyed['energy'], {'NR': '1100', 'WR': '1300'})
+        self.assertEqual(keyed['time_of_max_demand'], {'NR': '19:45'})
+        self.assertEqual(posoco_table_dict(found['G'], POSOCO_TABLE_G)['coal'], {'NR': '800', 'WR': '900'})
+
+
+def fake_response(status=200, body=b'', headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    return response
+
+
+class TabulaWorkerAuthkeyTests(SimpleTestCase):
+    def test_worker_refuses_to_start_without_a_secret(self):
+        for key in ('', 'tabula-worker'):
+            with override_settings(TABULA_WORKER_AUTHKEY=key):
+                self.assertIsNone(extraction.worker_authkey())
+                with self.assertRaisesMessage(CommandError, 'TABULA_WORKER_AUTHKEY'):
+                    call_command('tabula_worker')
+
+    def test_commands_read_locally_without_a_secret(self):
+        with override_settings(TABULA_WORKER_AUTHKEY=''), mock.patch.object(extraction, 'Client') as client:
+            with self.assertRaises(extraction.WorkerUnavailable):
+                extraction.read_pdf_via_worker('report.pdf')
+        client.assert_not_called()
+
+    @override_settings(TABULA_WORKER_AUTHKEY='s3cret')
+    def test_configured_secret_is_used(self):
+        self.assertEqual(extraction.worker_authkey(), b's3cret')
+
+
+class HttpClientTests(SimpleTestCase):
+    def test_streamed_response_holds_the_host_slot_until_closed(self):
+        url = 'https://stream-slot.example/report.pdf'
+        with mock.patch.object(requests.Session, 'request', return_value=fake_response(body=b'pdf')):
+            response = http_client.get(url, stream=True)
+            semaphore = http_client._semaphore_for(url)
+            held = semaphore._value
+            response.close()
+            response.close()
+
+        self.assertEqual(held, http_client._setting('HTTP_MAX_PER_HOST', 4) - 1)
+        self.assertEqual(semaphore._value, http_client._setting('HTTP_MAX_PER_HOST', 4))
+
+    def test_streamed_response_releases_the_slot_once_read(self):
+        limit = http_client._setting('HTTP_MAX_PER_HOST', 4)
+        url = 'https://stream-read.example/report.pdf'
+        semaphore = http_client._semaphore_for(url)
+        with mock.patch.object(requests.Session, 'request', side_effect=lambda *a, **k: fake_response(body=b'pdf' * 100)):
+            self.assertEqual(http_client.get(url, stream=True).content, b'pdf' * 100)
+            self.assertEqual(semaphore._value, limit)
+
+            response = http_client.get(url, stream=True)
+            chunks = list(response.iter_content(64))
+            self.assertEqual(semaphore._value, limit)
+            response.close()
+
+        self.assertEqual(b''.join(chunks), b'pdf' * 100)
+        self.assertEqual(semaphore._value, limit)
+
+    def test_streamed_response_releases_the_slot_when_reading_fails(self):
+        url = 'https://stream-error.example/report.pdf'
+        response = fake_response(body=b'pdf')
+        response.raw = mock.Mock(stream=mock.Mock(side_effect=requests.exceptions.ChunkedEncodingError('cut')))
+        with mock.patch.object(requests.Session, 'request', return_value=response):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                http_client.get(url, stream=True).content
+        self.assertEqual(http_client._semaphore_for(url)._value, http_client._setting('HTTP_MAX_PER_HOST', 4))
+
+    def test_plain_response_releases_the_slot_at_once(self):
+        url = 'https://plain-slot.example/list'
+        with mock.patch.object(requests.Session, 'request', return_value=fake_response(body=b'{}')):
+            http_client.get(url)
+        self.assertEqual(http_client._semaphore_for(url)._value, http_client._setting('HTTP_MAX_PER_HOST', 4))
+
+    def test_failed_request_releases_the_slot(self):
+        url = 'https://failing-slot.example/list'
+        error = requests.exceptions.ConnectionError('down')
+        with mock.patch.object(requests.Session, 'request', side_effect=error):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                http_client.get(url, retries=0)
+        self.assertEqual(http_client._semaphore_for(url)._value, http_client._setting('HTTP_MAX_PER_HOST', 4))
+
+
+class HttpCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = http_cache.HttpCache(directory=os.path.join(self.tmp.name, 'cache'))
+        self.dest = os.path.join(self.tmp.name, 'out', 'report.pdf')
+
+    def download(self, url, response):
+        with mock.patch.object(http_cache.http_client, 'get', return_value=response) as get:
+            result = http_cache.download(url, self.dest, cache=self.cache)
+        return result, get.call_args.kwargs['headers']
+
+    def test_validators_are_stored_and_sent_back(self):
+        url = 'https://posoco.example/psp.pdf'
+        first, sent = self.download(url, fake_response(body=b'v1', headers={'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+
+        self.assertEqual(sent, {})
+        self.assertFalse(first.from_cache)
+        meta = self.cache.lookup(url)
+        self.assertEqual((meta['etag'], meta['last_modified']), ('"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT'))
+
+        _, sent = self.download(url, fake_response(status=304))
+        self.assertEqual(sent, {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+    def test_not_modified_reuses_the_cached_body(self):
+        url = 'https://posoco.example/psp.pdf'
+        first, _ = self.download(url, fake_response(body=b'report bytes', headers={'ETag': '"abc"'}))
+        os.remove(self.dest)
+
+        second, _ = self.download(url, fake_response(status=304))
+
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.sha256, first.sha256)
+        with open(self.dest, 'rb') as fh:
+            self.assertEqual(fh.read(), b'report bytes')
+
+    def test_response_without_validators_is_not_cached(self):
+        url = 'https://nrldc.example/psp.pdf'
+        self.download(url, fake_response(body=b'x'))
+        self.assertIsNone(self.cache.lookup(url))
+
+    def test_cachebust_is_ignored_in_the_key(self):
+        self.assertEqual(
+            http_cache.cache_url('https://POSOCO.example/f.pdf?id=7&cachebust=123'),
+            'https://posoco.example/f.pdf?id=7',
+        )
+        self.download('https://posoco.example/f.pdf?cachebust=1', fake_response(body=b'x', headers={'ETag': '"e"'}))
+        self.assertIsNotNone(self.cache.lookup('https://posoco.example/f.pdf?cachebust=2'))
+
+    def test_interrupted_download_leaves_no_partial_file(self):
+        os.makedirs(os.path.dirname(self.dest))
+        with open(self.dest, 'wb') as fh:
+            fh.write(b'previous')
+
+        def broken_body(chunk_size=1, decode_unicode=False):
+            yield b'half of the'
+            raise requests.exceptions.ChunkedEncodingError('connection dropped')
+
+        response = fake_response(headers={'ETag': '"new"'})
+        response.iter_content = broken_body
+        with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+            self.download('https://wrldc.example/psp.pdf', response)
+
+        with open(self.dest, 'rb') as fh:
+            self.assertEqual(fh.read(), b'previous')
+        self.assertEqual(os.listdir(os.path.dirname(self.dest)), ['report.pdf'])
+        self.assertIsNone(self.cache.lookup('https://wrldc.example/psp.pdf'))
+
+
+class SplitNumericTests(SimpleTestCase):
+    def test_numbers(self):
+        self.assertEqual(split_numeric('1,234.5'), (1234.5, None))
+        self.assertEqual(split_numeric(' 12.5% '), (12.5, None))
+        self.assertEqual(split_numeric(7), (7.0, None))
+
+    def test_empty_values(self):
+        for value in (None, '', '  ', 'nan', np.nan):
+            self.assertEqual(split_numeric(value), (None, None), value)
+
+    def test_markers_go_to_raw_markers(self):
+        row = split_numeric_fields({'state': 'PUNJAB', 'thermal': '-', 'hydro': 'N/A', 'gas': '1,234.5'},
+                                   ['thermal', 'hydro', 'gas', 'solar'])
+
+        self.assertEqual(row, {'state': 'PUNJAB', 'thermal': None, 'hydro': None, 'gas': 1234.5,
+                               'raw_markers': {'thermal': '-', 'hydro': 'N/A'}})
+
+    def test_migration_copies_match(self):
+        for module in ('posoco.migrations.0004_numeric_columns_backfill', 'wrldc_app.migrations.0007_numeric_columns_backfill'):
+            frozen = importlib.import_module(module).split_numeric
+            for value in ('1,234.5', '12.5%', '-', 'N/A', '', None):
+                self.assertEqual(frozen(value), split_numeric(value), (module, value))
+
+
+class ParseTimesTests(SimpleTestCase):
+    cases = {
+        '14:30': datetime.time(14, 30),
+        '9:05': datetime.time(9, 5),
+        '09.05': datetime.time(9, 5),
+        '1430': datetime.time(14, 30),
+        ' 0005 ': datetime.time(0, 5),
+        '23:59:30': datetime.time(23, 59, 30),
+        '24:00': datetime.time(0, 0),
+        '2:15 PM': datetime.time(14, 15),
+        '12:10 a.m.': datetime.time(0, 10),
+        '24:30': None,
+        '12:60': None,
+        '930': None,
+        '-': None,
+        'N/A': None,
+        '': None,
+        None: None,
+    }
+
+    def test_parse_times(self):
+        self.assertEqual(dict(zip(self.cases, parse_times(self.cases))), self.cases)
+
+    def test_add_parsed_times_keeps_the_text(self):
+        rows = [{'time': '1430', 'time_max': '24:00'}, {'time': 'garbage'}]
+
+        add_parsed_times(rows, ['time', 'time_max'])
+
+        self.assertEqual(rows, [
+            {'time': '1430', 'time_max': '24:00', 'time_at': datetime.time(14, 30), 'time_max_at': datetime.time(0, 0)},
+            {'time': 'garbage', 'time_at': None, 'time_max_at': None},
+        ])
+
+    def test_migration_copies_match(self):
+        for module in ('nrldc_app.migrations.0007_backfill_parsed_times', 'posoco.migrations.0007_backfill_parsed_times',
+                       'srldc_app.migrations.0005_backfill_parsed_times', 'wrldc_app.migrations.0010_backfill_parsed_times'):
+            parse_time = importlib.import_module(module).parse_time
+            self.assertEqual({value: parse_time(value) for value in self.cases}, self.cases, module)
+
+
+class BulkUpsertTests(TestCase):
+    day = datetime.date(2025, 1, 15)
+
+    def test_counts_inserted_and_updated_rows(self):
+        Nrldc2AData.objects.create(report_date=self.day, state='PUNJAB', thermal=1.0)
+
+        result = bulk_upsert(Nrldc2AData, [
+            {'report_date': self.day, 'state': 'PUNJAB', 'thermal': 2.0},
+            {'report_date': self.day, 'state': 'HARYANA', 'thermal': 3.0},
+        ])
+
+        self.assertEqual(result, UpsertResult(inserted=1, updated=1, skipped=0))
+        self.assertEqual(dict(Nrldc2AData.objects.values_list('state', 'thermal')), {'PUNJAB': 2.0, 'HARYANA': 3.0})
+
+    def test_last_row_per_key_wins(self):
+        result = bulk_upsert(Nrldc2AData, [
+            {'report_date': self.day, 'state': 'PUNJAB', 'thermal': 1.0},
+            {'report_date': self.day, 'state': 'HARYANA', 'thermal': 5.0},
+            {'report_date': self.day, 'state': 'PUNJAB', 'thermal': 9.0},
+        ])
+
+        self.assertEqual(result, UpsertResult(inserted=2, updated=0, skipped=0))
+        self.assertEqual(Nrldc2AData.objects.get(state='PUNJAB').thermal, 9.0)
+
+    def test_rows_without_state_are_skipped_and_counted(self):
+        rows = [
+            {'report_date': self.day, 'state': None, 'thermal': 1.0},
+            {'report_date': self.day, 'state': '', 'thermal': 2.0},
+            {'report_date': self.day, 'state': 'DELHI', 'thermal': 3.0},
+        ]
+        self.assertEqual(dedupe_rows(rows, DEFAULT_UNIQUE_FIELDS), ([rows[2]], 2))
+
+        result = bulk_upsert(Nrldc2AData, rows)
+
+        self.assertEqual(result, UpsertResult(inserted=1, updated=0, skipped=2))
+        self.assertEqual(Nrldc2AData.objects.count(), 1)
+
+    def test_update_keeps_created_at(self):
+        original = Nrldc2AData.objects.create(report_date=self.day, state='PUNJAB', thermal=1.0)
+        created_at = original.created_at - datetime.timedelta(days=3)
+        Nrldc2AData.objects.filter(pk=original.pk).update(created_at=created_at)
+
+        bulk_upsert(Nrldc2AData, [{'report_date': self.day, 'state': 'PUNJAB', 'thermal': 4.0}])
+
+        row = Nrldc2AData.objects.get(pk=original.pk)
+        self.assertEqual((row.thermal, row.created_at), (4.0, created_at))
+
+
+class RecordFactsTests(TestCase):
+    day = datetime.date(2025, 1, 15)
+
+    def fact(self, entity, metric, value, source='nrldc', report_date=day):
+        return {'source': source, 'report_date': report_date, 'entity': entity, 'metric': metric, 'value': value}
+
+    def stored(self):
+        return set(MetricFact.objects.values_list('source', 'report_date', 'entity', 'metric', 'value'))
+
+    def record(self, facts, scope_sources=('nrldc',), report_date=day):
+        return record_facts(facts, ['solar_mu'], [(source, report_date) for source in scope_sources])
+
+    def test_rerun_deletes_facts_missing_from_the_new_batch(self):
+        other_day = self.day - datetime.timedelta(days=1)
+        self.record([self.fact('PUNJAB', 'solar_mu', 5.0, report_date=other_day)], report_date=other_day)
+        record_facts([
+            self.fact('PUNJAB', 'solar_mu', 1.0), self.fact('HARYANA', 'solar_mu', 2.0),
+            self.fact('PUNJAB', 'max_demand_mw', 900.0),
+        ], ['solar_mu', 'max_demand_mw'], [('nrldc', self.day)])
+        self.record([self.fact('PUNJAB', 'solar_mu', 1.5)])
+
+        # Other dates and metrics of other tables (max_demand_mw) are kept
+        self.assertEqual(self.stored(), {
+            ('nrldc', self.day, 'PUNJAB', 'solar_mu', 1.5),
+            ('nrldc', other_day, 'PUNJAB', 'solar_mu', 5.0),
+            ('nrldc', self.day, 'PUNJAB', 'max_demand_mw', 900.0),
+        })
+
+    def test_rerun_without_facts_clears_the_date(self):
+        self.record([self.fact('PUNJAB', 'solar_mu', 1.0), self.fact('HARYANA', 'solar_mu', 2.0)])
+
+        self.record([])
+
+        self.assertEqual(self.stored(), set())
+
+    def test_other_sources_are_kept(self):
+        self.record([self.fact('PUNJAB', 'solar_mu', 1.0), self.fact('NR', 'solar_mu', 7.0, source='posoco')],
+                    scope_sources=('nrldc', 'posoco'))
+        self.record([self.fact('HARYANA', 'solar_mu', 2.0)])
+
+        self.assertEqual(self.stored(), {
+            ('nrldc', self.day, 'HARYANA', 'solar_mu', 2.0),
+            ('posoco', self.day, 'NR', 'solar_mu', 7.0),
+        })
+
+
+class RecordedRunTests(TestCase):
+    class Command:
+        @recorded_run('nrldc_project')
+        def handle(self, outcome=None):
+            with self.timings.stage('parse'):
+                pass
+            if outcome == 'skip':
+                self.pipeline_run.status = PipelineRun.Status.SKIPPED
+            elif outcome == 'write':
+                day = datetime.date(2024, 1, 15)
+                rows = [{'report_date': day, 'state': state, 'thermal': 1.0} for state in ('PUNJAB', 'HARYANA')]
+                facts = [{'source': 'nrldc', 'report_date': day, 'entity': row['state'], 'metric': 'thermal', 'value': 1.0}
+                         for row in rows]
+                upsert_with_facts(Nrldc2AData, rows, facts, ['thermal'], [('nrldc', day)])
+            elif outcome is not None:
+                raise outcome
+
+    def run_command(self, outcome=None):
+        try:
+            self.Command().handle(outcome=outcome)
+        except Exception:
+            pass
+        return PipelineRun.objects.latest('id')
+
+    def test_status_of_each_outcome(self):
+        self.assertEqual(self.run_command().status, PipelineRun.Status.SUCCESS)
+        self.assertEqual(self.run_command('skip').status, PipelineRun.Status.SKIPPED)
+
+        run = self.run_command(TablesNotSaved(['Table 2C: connection lost'], saved=1))
+        self.assertEqual(run.status, PipelineRun.Status.PARTIAL)
+        self.assertIn('Table 2C: connection lost', run.error)
+
+        self.assertEqual(self.run_command(TablesNotSaved(['Table 2A: x', 'Table 2C: y'])).status, PipelineRun.Status.FAILED)
+        run = self.run_command(ValueError('bad pdf'))
+        self.assertEqual((run.status, run.error), (PipelineRun.Status.FAILED, 'bad pdf'))
+        self.assertIsNotNone(run.parse_seconds)
+
+    def test_exception_is_reraised(self):
+        with self.assertRaises(ValueError):
+            self.Command().handle(outcome=ValueError('bad pdf'))
+
+    def test_rows_written_counts_report_rows_not_facts(self):
+        self.assertEqual(self.run_command('write').rows_written, 2)
+        self.assertEqual(MetricFact.objects.count(), 2)
+        self.assertEqual(self.run_command().rows_written, 0)
+
+
+class StageSummaryTests(SimpleTestCase):
+    def run_values(self, status, duration, script_name='nrldc_project', **stages):
+        values = {'script_name': script_name, 'status': status, 'duration_seconds': duration,
+                  'bytes_downloaded': 100, 'rows_written': 10}
+        values.update({field: stages.get(stage) for stage, field in STAGE_FIELDS.items()})
+        return values
+
+    def test_percentile(self):
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+        self.assertEqual(percentile([4.0, 1.0, 3.0, 2.0], 0.5), 2.5)
+        self.assertAlmostEqual(percentile([1.0, 2.0, 3.0, 4.0, 5.0], 0.95), 4.8)
+
+    def test_only_successful_runs_count_towards_percentiles(self):
+        runs = [self.run_values(PipelineRun.Status.SUCCESS, seconds, parse=seconds / 10) for seconds in (1.0, 2.0, 3.0)]
+        runs += [
+            self.run_values(PipelineRun.Status.FAILED, 60.0),
+            self.run_values(PipelineRun.Status.PARTIAL, 50.0),
+            self.run_values(PipelineRun.Status.SKIPPED, 0.1),
+            self.run_values(PipelineRun.Status.SUCCESS, 9.0, script_name='posoco'),
+        ]
+
+        nrldc, posoco = stage_summary(runs)
+
+        self.assertEqual([nrldc['script_name'], posoco['script_name']], ['nrldc_project', 'posoco'])
+        self.assertEqual((nrldc['runs'], nrldc['succeeded'], nrldc['failed'], nrldc['partial']), (6, 3, 1, 1))
+        self.assertEqual(nrldc['total']['p50'], 2.0)
+        self.assertAlmostEqual(nrldc['total']['p95'], 2.9)
+        parse = next(stage for stage in nrldc['stages'] if stage['stage'] == 'parse')
+        self.assertAlmostEqual(parse['p50'], 0.2)
+        download = next(stage for stage in nrldc['stages'] if stage['stage'] == 'download')
+        self.assertEqual(download, {'stage': 'download', 'p50': None, 'p95': None})
+        self.assertEqual(posoco['total'], {'p50': 9.0, 'p95': 9.0})
+
+
+class LoadHistoryReportTests(TestCase):
+    """The JSON a region command writes loads back under the report_date the command stored."""
+    run_date = datetime.date(2025, 1, 16)
+
+    def round_trip(self, command, region, spec, model, df):
+        command.timings = StageTimer()
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, f"report_{self.run_date.isoformat()}_10-00-00")
+            os.makedirs(output_dir)
+            with mock.patch(f"{region}_app.management.commands.{region}_project.read_tables_for_markers", return_value=[df]):
+                try:
+                    command.extract_tables_from_pdf('report.pdf', output_dir, self.run_date - datetime.timedelta(days=1))
+                except TablesNotSaved:
+                    pass
+            reports = find_reports(tmp, region)
+            loaded = list(report_rows(spec, reports))
+
+        self.assertEqual([os.path.basename(path) for _, path in reports], [f"{region}_16012025.json"])
+        self.assertEqual([report_date for report_date, _ in reports], [datetime.date(2025, 1, 15)])
+        fields = ['report_date', 'state', *spec.metrics]
+        stored = list(model.objects.order_by('id').values(*fields))
+        self.assertTrue(stored)
+        self.assertEqual([{field: row[field] for field in fields} for row in loaded], stored)
+
+    def test_srldc_json(self):
+        df = frame([
+            ["2(A)State's Load Deails (At State Periphery) in MUs"],
+            ["STATE", "THERMAL"],
+            ["", ""],
+            ["ANDHRA PRADESH", "10", "2", "0", "1", "0", "0", "13", "40", "41", "1", "54", "0", "54"],
+            ["KARNATAKA", "20", "5", "0", "2", "3", "0", "30", "50", "50", "0", "80", "0", "80"],
+            ["2(B) State's Demand Met in MWs and day energy forecast and deviation particulars"],
+        ], 14)
+        self.round_trip(SrldcCommand(), 'srldc', SRLDC_2A, Srldc2AData, df)
+
+    def test_wrldc_json(self):
+        values = [str(v) for v in range(1, 15)]
+        df = frame([
+            ["2(A) STATE'S LOAD DETAILS (AT STATE PERIPHERY) IN MU"],
+            ["State", "Thermal"],
+            ["GUJARAT"] + [cell for value in values for cell in (value, NaN)],
+            ["MAHARASHTRA"] + [cell for value in values for cell in (value, NaN)],
+            ["2(B) State's Demand Met in MW"],
+        ], 30)
+        self.round_trip(WrldcCommand(), 'wrldc', WRLDC_2A, Wrldc2AData, df)
@@ -0,0 +1,37 @@
+"""
+Per-stage wall-clock timing for the report commands.
+
+Each region command keeps a StageTimer on self.timings and wraps its work in
+`with self.timings.stage('download'): ...`. Stages that run several times (for
+example parse and db_write once per table) are accumulated. run_all collects
+the timers of all regions into one summary.
+"""
+import time
+from contextlib import contextmanager
+
+STAGES = ('metadata', 'download', 'extract', 'parse', 'db_write', 'json_write')
+
+
+class StageTimer:
+    def __init__(self):
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def total(self):
+        return sum(self.durations.values())
+
+    def as_dict(self):
+        """Durations in seconds, known stages first in pipeline order."""
+        ordered = {name: round(self.durations[name], 3) for name in STAGES if name in self.durations}
+        ordered.update({name: round(value, 3) for name, value in self.durations.items() if name not in ordered})
+        return ordered
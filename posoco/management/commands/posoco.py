@@ -1,12 +1,21 @@
 from django.core.management.base import BaseCommand
 import os
 import requests
-import tabula
 import json
 import re
 import tempfile
 from datetime import datetime, timedelta
 from posoco.models import PosocoTableA, PosocoTableG
+from pipeline import http_cache, http_client
+from pipeline.extraction import add_extraction_arguments, read_tables_for_markers
+from pipeline.facts import posoco_facts, upsert_with_facts
+from pipeline.ingest import parse_times, split_numeric_fields
+from pipeline.models import PipelineRun
+from pipeline.runs import TablesNotSaved, recorded_run
+from pipeline.table_parser import find_posoco_tables, posoco_table_dict
+from pipeline.table_specs import TABLE_SPECS, region_markers
+from pipeline.timing import StageTimer
+from report_dashboard.status import record_availability
 import pandas as pd
 # new import for reading PDF content
 try:
@@ -19,6 +28,9 @@ API_URL = "https://webapi.grid-india.in/api/v1/file"
 BASE_URL = "https://webcdn.grid-india.in/"
 SAVE_DIR = "downloads/POSOCO"
 
+# Table A and Table G as declared in pipeline/table_specs.py
+POSOCO_TABLES = TABLE_SPECS['posoco']
+
 # --- payload: initial (today) - but we will fall back if API returns nothing ---
 payload = {
     "_source": "GRDW",
@@ -76,10 +88,10 @@ def _parse_date_from_string(s):
         return None
 
 
-def _post_and_get_retdata(api_url, payload, timeout=30):
-    """POST and return parsed JSON (or None on failure)."""
+def _post_and_get_retdata(api_url, payload, timeout=None):
+    """POST and return parsed JSON (or None on failure). The file-list query is safe to retry."""
     try:
-        resp = requests.post(api_url, json=payload, timeout=timeout)
+        resp = http_client.post(api_url, json=payload, timeout=timeout, retry_non_idempotent=True)
         resp.raise_for_status()
         return resp.json()
     except requests.exceptions.RequestException as e:
@@ -90,19 +102,25 @@ def _post_and_get_retdata(api_url, payload, timeout=30):
         return None
 
 
-def _download_to_temp(url, timeout=60):
-    """Download URL to a temporary file and return its path (or None)."""
+def _download_to_temp(url, directory=None, timeout=None):
+    """
+    Stream URL to a temporary file in directory (so the final os.replace stays on one
+    filesystem) and return (path, sha256), or (None, None) on failure.
+    """
+    tmp_path = None
     try:
-        r = requests.get(url, stream=True, timeout=timeout)
-        r.raise_for_status()
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        with open(tmp.name, "wb") as fh:
-            for chunk in r.iter_content(1024):
-                fh.write(chunk)
-        return tmp.name
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".pdf")
+        os.close(fd)
+        download = http_cache.download(url, tmp_path, timeout=timeout)
+        if download.from_cache:
+            print(f"♻️ {url} not modified since last download; reused cached copy.")
+        print(f"📦 {http_cache.stats_line()}")
+        return download.path, download.sha256
     except Exception as e:
         print(f"❌ Error downloading temp PDF {url}: {e}")
-        return None
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None, None
 
 
 def _extract_report_date_from_pdf(pdf_path):
@@ -149,7 +167,7 @@ def _extract_report_date_from_pdf(pdf_path):
 
 
 # ---------- New: fetch_report_for_target_date_with_fill ----------
-def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_dir, target_date, lookback_days=7):
+def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_dir, target_date, lookback_days=7, timings=None):
     """
     Policy:
       - If a PDF for report_date == target_date exists and is valid, download and save as posoco_<target_date>.pdf
@@ -158,9 +176,12 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
       - Else look back by report_date up to lookback_days and pick the latest previous report; save it named as posoco_<target_date>.pdf.
     Returns: (local_pdf_path_or_None, metadata_or_None)
     metadata = { 'selected_report_date': date, 'selected_posting_date': date, 'title': str, 'filepath': str, 'mime': str }
+    timings is an optional StageTimer that receives the metadata and download stages.
     """
+    timings = timings or StageTimer()
     try:
-        resp = _post_and_get_retdata(api_url, {"_source": payload.get("_source", "GRDW"), "_type": payload.get("_type", "DAILY_PSP_REPORT")})
+        with timings.stage('metadata'):
+            resp = _post_and_get_retdata(api_url, {"_source": payload.get("_source", "GRDW"), "_type": payload.get("_type", "DAILY_PSP_REPORT")})
         if not resp or not resp.get("retData"):
             print("❌ No retData from API.")
             return None, None
@@ -230,7 +251,8 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
                 download_url = base_url.rstrip("/") + "/" + fp.lstrip("/")
                 if "?" not in download_url:
                     download_url = download_url + f"?cachebust={int(datetime.now().timestamp())}"
-                tmp = _download_to_temp(download_url)
+                with timings.stage('download'):
+                    tmp, sha256 = _download_to_temp(download_url, report_dir)
                 if not tmp:
                     continue
                 printed = _extract_report_date_from_pdf(tmp)
@@ -238,7 +260,7 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
                     if printed == r["report_date"]:
                         dest = os.path.join(report_dir, f"posoco_{target_date.strftime('%d%m%Y')}.pdf")
                         os.replace(tmp, dest)
-                        meta = {"selected_report_date": r["report_date"], "selected_posting_date": r["posting_date"], "title": r["title"], "filepath": fp, "mime": r["mime"]}
+                        meta = {"selected_report_date": r["report_date"], "selected_posting_date": r["posting_date"], "title": r["title"], "filepath": fp, "mime": r["mime"], "sha256": sha256}
                         print(f"✅ Exact match downloaded and saved as {dest}")
                         return dest, meta
                     else:
@@ -252,7 +274,7 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
                     # accept exact-match even if printed date couldn't be extracted
                     dest = os.path.join(report_dir, f"posoco_{target_date.strftime('%d%m%Y')}.pdf")
                     os.replace(tmp, dest)
-                    meta = {"selected_report_date": r["report_date"], "selected_posting_date": r["posting_date"], "title": r["title"], "filepath": fp, "mime": r["mime"]}
+                    meta = {"selected_report_date": r["report_date"], "selected_posting_date": r["posting_date"], "title": r["title"], "filepath": fp, "mime": r["mime"], "sha256": sha256}
                     print(f"⚠️ Exact match PDF lacked printed date but Title matches — saved as {dest}")
                     return dest, meta
 
@@ -264,14 +286,15 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
             download_url = base_url.rstrip("/") + "/" + fp.lstrip("/")
             if "?" not in download_url:
                 download_url = download_url + f"?cachebust={int(datetime.now().timestamp())}"
-            tmp = _download_to_temp(download_url)
+            with timings.stage('download'):
+                tmp, sha256 = _download_to_temp(download_url, report_dir)
             if not tmp:
                 print("❌ Failed to download chosen posted candidate.")
                 return None, None
             # IMPORTANT: save file named by target_date as user asked
             dest = os.path.join(report_dir, f"posoco_{target_date.strftime('%d%m%Y')}.pdf")
             os.replace(tmp, dest)
-            meta = {"selected_report_date": chosen["report_date"], "selected_posting_date": chosen["posting_date"], "title": chosen["title"], "filepath": fp, "mime": chosen["mime"]}
+            meta = {"selected_report_date": chosen["report_date"], "selected_posting_date": chosen["posting_date"], "title": chosen["title"], "filepath": fp, "mime": chosen["mime"], "sha256": sha256}
             print(f"✅ Selected most-recent posted-by-{target_date} report (actual report_date={chosen['report_date']}, posting_date={chosen['posting_date']}) and saved as {dest}")
             return dest, meta
 
@@ -285,13 +308,14 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
                 download_url = base_url.rstrip("/") + "/" + fp.lstrip("/")
                 if "?" not in download_url:
                     download_url = download_url + f"?cachebust={int(datetime.now().timestamp())}"
-                tmp = _download_to_temp(download_url)
+                with timings.stage('download'):
+                    tmp, sha256 = _download_to_temp(download_url, report_dir)
                 if not tmp:
                     continue
                 # Save using requested target_date filename (user requested)
                 dest = os.path.join(report_dir, f"posoco_{target_date.strftime('%d%m%Y')}.pdf")
                 os.replace(tmp, dest)
-                meta = {"selected_report_date": chosen["report_date"], "selected_posting_date": chosen["posting_date"], "title": chosen["title"], "filepath": fp, "mime": chosen["mime"]}
+                meta = {"selected_report_date": chosen["report_date"], "selected_posting_date": chosen["posting_date"], "title": chosen["title"], "filepath": fp, "mime": chosen["mime"], "sha256": sha256}
                 print(f"ℹ️ No report posted by {target_date}; fetched previous report {chosen['report_date']} and saved AS {dest}")
                 return dest, meta
 
@@ -308,113 +332,37 @@ def fetch_report_for_target_date_with_fill(api_url, base_url, payload, report_di
 # (omitted here to keep file concise; original versions can be restored if needed)
 
 # --- THIS FUNCTION HAS BEEN UPDATED: accepts desired_date but DOES NOT CHANGE TABLE SELECTION LOGIC ---
-def extract_tables_from_pdf(pdf_file, report_dir, timestamp, desired_date=None):
+def extract_tables_from_pdf(pdf_file, report_dir, timestamp, desired_date=None, engine=None, use_cache=True, timings=None, pdf_sha256=None):
     """
     Extracts tables, renames headings, and saves as JSON.
     This version uses flexible matching to handle unpredictable keys.
     """
-    # This helper function provides the flexible matching logic
-    def get_short_key_simple(long_key):
-        key = long_key.strip()
-        
-        # We check for the most specific keys first to avoid errors
-        if key.startswith("Demand Met during Evening Peak"):
-            return "demand_evening_peak"
-        if key.startswith("Energy Shortage"):
-            return "energy_shortage"
-        if key.startswith("Maximum Demand Met During the Day"):
-            return "max_demand_day"
-        if key.startswith("Time Of Maximum Demand Met"):
-            return "time_of_max_demand"
-        if key.startswith("Peak Shortage"):
-            return "peak_shortage"
-        if key.startswith("Energy Met"):
-            return "energy"
-        if key.startswith("Hydro Gen"):
-            return "hydro"
-        if key.startswith("Wind Gen"):
-            return "wind"
-        if key.startswith("Solar Gen"):
-            return "solar"
-        if key == "Coal":
-            return "coal"
-        if key == "Lignite":
-            return "lignite"
-        if key == "Hydro":
-            return "hydro"
-        if key == "Nuclear":
-            return "nuclear"
-        if key == "Gas, Naptha & Diesel":
-            return "gas_naptha_diesel"
-        if key.startswith("RES"):
-            return "res_total"
-        if key == "Total":
-            return "total"
-            
-        return key # Fallback to the original key if no match is found
-
+    timings = timings or StageTimer()
     try:
-        tables = tabula.read_pdf(pdf_file, pages="all", multiple_tables=True, lattice=True)
+        with timings.stage('extract'):
+            tables = read_tables_for_markers(
+                pdf_file, region_markers('posoco'),
+                engine=engine, use_cache=use_cache, pdf_sha256=pdf_sha256, multiple_tables=True, lattice=True
+            )
     except Exception as e:
-        print(f"❌ Error reading PDF with Tabula: {e}")
+        print(f"❌ Error reading PDF tables: {e}")
         tables = []
 
     final_json = {"POSOCO": {"posoco_table_a": [], "posoco_table_g": []}}
 
-    # Initialize variables to hold the found tables
-    table_a_df = None
-    table_g_df = None
-
-    # Loop through all extracted tables to find the ones we need
-    for df in tables:
-        # Skip empty or invalid dataframes
-        if df.empty or len(df.columns) == 0:
-            continue
+    # Identify Table A ("Demand Met during Evening Peak") and Table G ("Coal") by their first column
+    with timings.stage('parse'):
+        found = find_posoco_tables(tables, POSOCO_TABLES)
 
-        # Convert the first column to string type for reliable searching
-        first_col_str = df.iloc[:, 0].astype(str)
-
-        # Identify Table A by looking for a unique phrase in its first column
-        if any("Demand Met during Evening Peak" in s for s in first_col_str):
-            print("✅ Found Table A by its content.")
-            table_a_df = df
-
-        # Identify Table G by looking for "Coal", a unique keyword for the fuel table
-        elif any("Coal" in s for s in first_col_str):
-            print("✅ Found Table G by its content.")
-            table_g_df = df
-
-        # If we have found both tables, we can stop searching
-        if table_a_df is not None and table_g_df is not None:
-            break
-
-    # Process Table A if it was found
-    if table_a_df is not None:
-        table_a_df = table_a_df.set_index(table_a_df.columns[0]).dropna(how='all')
-        table_a_dict = {}
-        for original_key, row in table_a_df.iterrows():
-            clean_key = ' '.join(str(original_key).replace('\r', ' ').split())
-            short_key = get_short_key_simple(clean_key) # Use the new simple function
-            table_a_dict[short_key] = row.dropna().to_dict()
-        final_json["POSOCO"]["posoco_table_a"].append(table_a_dict)
-
-    # Process Table G if it was found
-    if table_g_df is not None:
-        table_g_df = table_g_df.set_index(table_g_df.columns[0]).dropna(how='all')
-        table_g_dict = {}
-        for original_key, row in table_g_df.iterrows():
-            clean_key = str(original_key).strip()
-            short_key = get_short_key_simple(clean_key) # Use the new simple function
-            table_g_dict[short_key] = row.dropna().to_dict()
-        final_json["POSOCO"]["posoco_table_g"].append(table_g_dict)
+        for spec in POSOCO_TABLES:
+            if spec.name in found:
+                print(f"✅ Found {spec.label} by its content.")
+                final_json["POSOCO"][spec.json_key].append(posoco_table_dict(found[spec.name], spec))
 
     # Check if BOTH tables were not found, and if so, use the empty template.
-    if table_a_df is None and table_g_df is None:
+    if not found:
         final_json = {
-            "POSOCO": {
-                "posoco_table_a": [{"demand_evening_peak": None, "peak_shortage": None, "energy": None, "hydro": None, "wind": None, "solar": None, "energy_shortage": None, "max_demand_day": None, "time_of_max_demand": None}],
-                "posoco_table_g": [{"coal": None, "lignite": None, "hydro": None, "nuclear": None, "gas_naptha_diesel": None, "res_total": None, "total": None}]
-            }
+            "POSOCO": {spec.json_key: [dict.fromkeys(spec.empty_keys)] for spec in POSOCO_TABLES}
         }
         print("⚠️ No valid tables found in PDF. Using empty template.")
 
@@ -432,70 +380,83 @@ def extract_tables_from_pdf(pdf_file, report_dir, timestamp, desired_date=None):
     json_name = f"posoco_{date_compact}.json"
     output_json = os.path.join(report_dir, json_name)
 
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(final_json, f, indent=4, ensure_ascii=False)
+    with timings.stage('json_write'):
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(final_json, f, indent=4, ensure_ascii=False)
 
     print(f"✅ JSON with shortened keys saved successfully at: {output_json}")
 
     return final_json
 
 
+# Model, key field and JSON column -> model field mapping for each POSOCO table
+POSOCO_DB_TABLES = {
+    "posoco_table_a": (PosocoTableA, "category", {
+        "NR": "nr", "WR": "wr", "SR": "sr", "ER": "er", "NER": "ner", "TOTAL": "total",
+    }),
+    "posoco_table_g": (PosocoTableG, "fuel_type", {
+        "NR": "nr", "WR": "wr", "SR": "sr", "ER": "er", "NER": "ner",
+        "All India": "all_india", "% Share": "share_percent",
+    }),
+}
+
+
 def save_to_db(final_json, report_date=None):
-    """Saves the processed JSON data to the Django database."""
+    """Saves the processed JSON data to the Django database (one bulk upsert per table).
+
+    Every table is attempted; TablesNotSaved is raised afterwards if any could not be saved.
+    """
     # If report_date is provided, use that; otherwise use today
     today = report_date or datetime.now().date()
 
-    try:
-        # Save data from Table A
-        table_a_data = final_json.get("POSOCO", {}).get("posoco_table_a", [])
-        if table_a_data and table_a_data[0]:
-            for category, values in table_a_data[0].items():
-                if values is None or not isinstance(values, dict):
-                    continue
-                if all(v is None for v in values.values()):
-                    continue
-                PosocoTableA.objects.update_or_create(
-                    category=category,
-                    report_date=today,
-                    defaults={
-                        'nr': values.get("NR"),
-                        'wr': values.get("WR"),
-                        'sr': values.get("SR"),
-                        'er': values.get("ER"),
-                        'ner': values.get("NER"),
-                        'total': values.get("TOTAL"),
-                    }
-                )
-
-        # Save data from Table G
-        table_g_data = final_json.get("POSOCO", {}).get("posoco_table_g", [])
-        if table_g_data and table_g_data[0]:
-            for fuel, values in table_g_data[0].items():
-                if values is None or not isinstance(values, dict):
-                    continue
-                if all(v is None for v in values.values()):
-                    continue
-                PosocoTableG.objects.update_or_create(
-                    fuel_type=fuel,
-                    report_date=today,
-                    defaults={
-                        'nr': values.get("NR"),
-                        'wr': values.get("WR"),
-                        'sr': values.get("SR"),
-                        'er': values.get("ER"),
-                        'ner': values.get("NER"),
-                        'all_india': values.get("All India"),
-                        'share_percent': values.get("% Share"),
-                    }
-                )
-        print("✅ Data saved to database successfully")
-    except Exception as e:
-        print(f"❌ An error occurred while saving to the database: {e}")
+    save_errors = []
+    saved_tables = 0
+    for spec in POSOCO_TABLES:
+        model, key_field, columns = POSOCO_DB_TABLES[spec.json_key]
+        table_data = final_json.get("POSOCO", {}).get(spec.json_key, [])
+        if not table_data or not table_data[0]:
+            continue
+        rows = []
+        for key, values in table_data[0].items():
+            if values is None or not isinstance(values, dict):
+                continue
+            if all(v is None for v in values.values()):
+                continue
+            row = {field: values.get(column) for column, field in columns.items()}
+            row.update({key_field: key, "report_date": today})
+            # Numbers go to the float columns; markers such as '-' are kept in raw_markers
+            rows.append(split_numeric_fields(row, columns.values()))
+            if key in spec.time_rows:
+                # Time rows (e.g. time_of_max_demand) also get parsed `<region>_at` times
+                fields = list(columns.values())
+                parsed = parse_times(row.get(field) for field in fields)
+                rows[-1].update({f"{field}_at": value for field, value in zip(fields, parsed)})
+        try:
+            result = upsert_with_facts(
+                model, rows, posoco_facts(spec, rows, key_field), spec.metrics.values(), [("posoco", today)],
+                unique_fields=("report_date", key_field),
+            )
+        except Exception as e:
+            print(f"❌ An error occurred while saving {model.__name__} to the database: {e}")
+            save_errors.append(f"{spec.label}: {e}")
+            continue
+        saved_tables += 1
+        if result.inserted or result.updated:
+            record_availability('posoco', today)
+        print(f"💾 {model.__name__}: {result.inserted} created, {result.updated} updated for {today}")
+
+    if save_errors:
+        raise TablesNotSaved(save_errors, saved=saved_tables)
+    print("✅ Data saved to database successfully")
 
 # --- Django Management Command ---
 class Command(BaseCommand):
     help = "Downloads the latest NLDC PSP PDF, extracts key tables with shortened headings, and saves them to a file and the database."
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = StageTimer()
+
     def add_arguments(self, parser):
         """
         Accept --date in YYYY-MM-DD or DD-MM-YYYY (or many other formats parsed by _parse_date_from_string).
@@ -507,7 +468,9 @@ class Command(BaseCommand):
             required=False,
             help='Target report date to fetch (formats: YYYY-MM-DD, DD-MM-YYYY, DDMMYYYY, etc.). If omitted, uses today.'
         )
+        add_extraction_arguments(parser)
 
+    @recorded_run('posoco')
     def handle(self, *args, **options):
         self.stdout.write("🚀 Starting POSOCO report download and processing...")
         # Parse target date from --date if passed
@@ -516,30 +479,43 @@ class Command(BaseCommand):
             parsed_dt = _parse_date_from_string(raw_date)
             if parsed_dt is None:
                 self.stdout.write(self.style.ERROR(f"❌ Could not parse date passed: {raw_date}"))
+                self.pipeline_run.status = PipelineRun.Status.FAILED
+                self.pipeline_run.error = f"Could not parse date passed: {raw_date}"
                 return
             target_date = parsed_dt.date() if isinstance(parsed_dt, datetime) else parsed_dt
         else:
             target_date = datetime.now().date()
+        self.pipeline_run.target_date = target_date
 
         # Make report_dir including target_date so folder names reflect requested date
         report_dir, timestamp = make_report_dir(SAVE_DIR, desired_date=target_date)
 
         # Use the new fetch logic that fills with most-recent available by the requested day
-        pdf_path, meta = fetch_report_for_target_date_with_fill(API_URL, BASE_URL, payload, report_dir, target_date, lookback_days=7)
+        pdf_path, meta = fetch_report_for_target_date_with_fill(
+            API_URL, BASE_URL, payload, report_dir, target_date, lookback_days=7, timings=self.timings
+        )
 
         if pdf_path:
             # pass desired_date to extract_tables_from_pdf so JSON filename uses target_date
-            final_json = extract_tables_from_pdf(pdf_path, report_dir, timestamp, desired_date=target_date)
+            final_json = extract_tables_from_pdf(
+                pdf_path, report_dir, timestamp, desired_date=target_date,
+                engine=options.get('engine'), use_cache=not options.get('no_cache'), timings=self.timings,
+                pdf_sha256=(meta or {}).get('sha256')
+            )
             if final_json and (final_json["POSOCO"]["posoco_table_a"] or final_json["POSOCO"]["posoco_table_g"]):
                 # Save to DB using the actual selected_report_date (meta) so database rows reflect the real report date
                 selected_report_date = meta.get('selected_report_date') if meta else target_date
-                save_to_db(final_json, report_date=selected_report_date)
+                with self.timings.stage('db_write'):
+                    save_to_db(final_json, report_date=selected_report_date)
                 # Also print/save posting_date for auditing
                 if meta and meta.get('selected_posting_date'):
                     print(f"ℹ️ Report posting date (when file was uploaded): {meta.get('selected_posting_date')}")
             else:
                 self.stdout.write(self.style.WARNING("Could not extract any data from the PDF to save."))
+                self.pipeline_run.status = PipelineRun.Status.SKIPPED
         else:
             self.stdout.write(self.style.ERROR("Failed to download PDF. Aborting process."))
+            self.pipeline_run.status = PipelineRun.Status.FAILED
+            self.pipeline_run.error = "Failed to download PDF."
 
         self.stdout.write(self.style.SUCCESS("✅ Process finished."))
\ No newline at end of file
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:53
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def dedupe(apps, schema_editor):
+    """Keep only the newest row (highest id) per (report_date, category/fuel_type)."""
+    for model_name, key in (('PosocoTableA', 'category'), ('PosocoTableG', 'fuel_type')):
+        model = apps.get_model('posoco', model_name)
+        duplicates = (
+            model.objects.values('report_date', key)
+            .annotate(rows=Count('id'), keep_id=Max('id'))
+            .filter(rows__gt=1)
+        )
+        for group in duplicates.iterator():
+            model.objects.filter(
+                report_date=group['report_date'], **{key: group[key]}
+            ).exclude(id=group['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posoco', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='posocotablea',
+            unique_together={('report_date', 'category')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='posocotableg',
+            unique_together={('report_date', 'fuel_type')},
+        ),
+    ]
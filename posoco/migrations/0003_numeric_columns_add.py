@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Step 1 of 3: add float columns next to the text ones (see 0004_numeric_columns_backfill)."""
+
+    dependencies = [
+        ('posoco', '0002_dedupe_and_unique_report_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posocotablea',
+            name='raw_markers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='nr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='wr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='sr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='er_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='ner_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='total_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='raw_markers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='nr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='wr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='sr_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='er_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='ner_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='all_india_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotableg',
+            name='share_percent_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
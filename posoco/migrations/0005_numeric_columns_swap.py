@@ -0,0 +1,131 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Step 3 of 3: drop the text columns and give the float columns their names."""
+
+    dependencies = [
+        ('posoco', '0004_numeric_columns_backfill'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='nr',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='nr_num',
+            new_name='nr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='wr',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='wr_num',
+            new_name='wr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='sr',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='sr_num',
+            new_name='sr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='er',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='er_num',
+            new_name='er',
+        ),
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='ner',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='ner_num',
+            new_name='ner',
+        ),
+        migrations.RemoveField(
+            model_name='posocotablea',
+            name='total',
+        ),
+        migrations.RenameField(
+            model_name='posocotablea',
+            old_name='total_num',
+            new_name='total',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='nr',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='nr_num',
+            new_name='nr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='wr',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='wr_num',
+            new_name='wr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='sr',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='sr_num',
+            new_name='sr',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='er',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='er_num',
+            new_name='er',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='ner',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='ner_num',
+            new_name='ner',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='all_india',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='all_india_num',
+            new_name='all_india',
+        ),
+        migrations.RemoveField(
+            model_name='posocotableg',
+            name='share_percent',
+        ),
+        migrations.RenameField(
+            model_name='posocotableg',
+            old_name='share_percent_num',
+            new_name='share_percent',
+        ),
+    ]
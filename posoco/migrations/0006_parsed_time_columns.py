@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posoco', '0005_numeric_columns_swap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posocotablea',
+            name='er_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='ner_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='nr_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='sr_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='total_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='posocotablea',
+            name='wr_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='posocotablea',
+            index=models.Index(fields=['category', 'total_at'], name='posocoa_category_total_at_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posoco', '0007_backfill_parsed_times'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='posocotablea',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='posocoa_report_date_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='posocotableg',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='posocog_report_date_brin'),
+        ),
+    ]
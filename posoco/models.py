@@ -4,17 +4,28 @@ from django.db import models
 class PosocoTableA(models.Model):
     """Table A - Demand, Energy, Hydro, Wind, etc. by Region"""
     category = models.CharField(max_length=255)
-    nr = models.CharField(max_length=50, null=True, blank=True)
-    wr = models.CharField(max_length=50, null=True, blank=True)
-    sr = models.CharField(max_length=50, null=True, blank=True)
-    er = models.CharField(max_length=50, null=True, blank=True)
-    ner = models.CharField(max_length=50, null=True, blank=True)
-    total = models.CharField(max_length=50, null=True, blank=True)
+    nr = models.FloatField(null=True, blank=True)
+    wr = models.FloatField(null=True, blank=True)
+    sr = models.FloatField(null=True, blank=True)
+    er = models.FloatField(null=True, blank=True)
+    ner = models.FloatField(null=True, blank=True)
+    total = models.FloatField(null=True, blank=True)
     report_date = models.DateField()
+    # Original text of numeric cells that held a marker such as '-' instead of a number
+    raw_markers = models.JSONField(default=dict, blank=True)
+    # Parsed times of day for time rows such as time_of_max_demand (NULL for other rows)
+    nr_at = models.TimeField(null=True, blank=True)
+    wr_at = models.TimeField(null=True, blank=True)
+    sr_at = models.TimeField(null=True, blank=True)
+    er_at = models.TimeField(null=True, blank=True)
+    ner_at = models.TimeField(null=True, blank=True)
+    total_at = models.TimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'posoco_posocotablea'  # 👈 Add this line to specify the exact table name
+        unique_together = ('report_date', 'category')
+        indexes = [models.Index(fields=['category', 'total_at'], name='posocoa_category_total_at_idx')]
 
     def __str__(self):
         return f"TableA | {self.category} | {self.report_date}"
@@ -23,18 +34,21 @@ class PosocoTableA(models.Model):
 class PosocoTableG(models.Model):
     """Table G - Generation mix by fuel type"""
     fuel_type = models.CharField(max_length=255)
-    nr = models.CharField(max_length=50, null=True, blank=True)
-    wr = models.CharField(max_length=50, null=True, blank=True)
-    sr = models.CharField(max_length=50, null=True, blank=True)
-    er = models.CharField(max_length=50, null=True, blank=True)
-    ner = models.CharField(max_length=50, null=True, blank=True)
-    all_india = models.CharField(max_length=50, null=True, blank=True)
-    share_percent = models.CharField(max_length=50, null=True, blank=True)
+    nr = models.FloatField(null=True, blank=True)
+    wr = models.FloatField(null=True, blank=True)
+    sr = models.FloatField(null=True, blank=True)
+    er = models.FloatField(null=True, blank=True)
+    ner = models.FloatField(null=True, blank=True)
+    all_india = models.FloatField(null=True, blank=True)
+    share_percent = models.FloatField(null=True, blank=True)
     report_date = models.DateField()
+    # Original text of numeric cells that held a marker such as '-' instead of a number
+    raw_markers = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = 'posoco_posocotableg'  # 👈 Add this line for the second table as well
+        unique_together = ('report_date', 'fuel_type')
 
     def __str__(self):
         return f"TableG | {self.fuel_type} | {self.report_date}"
\ No newline at end of file
@@ -1,3 +1,39 @@
+import datetime
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from pipeline.facts import upsert_with_facts
+from pipeline.runs import TablesNotSaved
+from posoco.management.commands import posoco
+from posoco.models import PosocoTableA, PosocoTableG
+
+
+class SaveToDbTests(TestCase):
+    day = datetime.date(2025, 1, 15)
+    final_json = {"POSOCO": {
+        "posoco_table_a": [{"energy": {"NR": "1,100", "WR": "1300", "TOTAL": "2400"}}],
+        "posoco_table_g": [{"coal": {"NR": "800", "All India": "-"}}],
+    }}
+
+    def test_saves_both_tables(self):
+        posoco.save_to_db(self.final_json, report_date=self.day)
+
+        self.assertEqual(PosocoTableA.objects.get(category='energy').nr, 1100.0)
+        coal = PosocoTableG.objects.get(fuel_type='coal')
+        self.assertEqual((coal.nr, coal.all_india, coal.raw_markers), (800.0, None, {'all_india': '-'}))
+
+    def test_failed_table_is_reported_after_the_others_are_saved(self):
+        def failing_for_table_a(model, *args, **kwargs):
+            if model is PosocoTableA:
+                raise RuntimeError('connection lost')
+            return upsert_with_facts(model, *args, **kwargs)
+
+        with mock.patch.object(posoco, 'upsert_with_facts', side_effect=failing_for_table_a):
+            with self.assertRaisesMessage(TablesNotSaved, 'Table A: connection lost') as raised:
+                posoco.save_to_db(self.final_json, report_date=self.day)
+
+        self.assertEqual(raised.exception.saved, 1)
+
+        self.assertFalse(PosocoTableA.objects.exists())
+        self.assertTrue(PosocoTableG.objects.filter(fuel_type='coal').exists())
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+
+from django.core.exceptions import ImproperlyConfigured
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
     'tailwind',
     'theme',
     'merger',
+    'pipeline',
 ]
 
 
@@ -57,6 +60,61 @@ INTERNAL_IPS = [
 # Add this line to the end of your settings.py
 NPM_BIN_PATH = "C:/Program Files/nodejs/npm.cmd"
 
+# Tabula extraction worker (python manage.py tabula_worker) keeps the JVM warm between reports.
+# TABULA_MODE: 'auto' (worker if running, else in-process), 'worker', 'local' or 'subprocess'.
+TABULA_MODE = os.getenv('TABULA_MODE', 'auto')
+TABULA_WORKER_ADDRESS = (os.getenv('TABULA_WORKER_HOST', '127.0.0.1'), int(os.getenv('TABULA_WORKER_PORT', '8765')))
+# Shared secret of the worker connection; no default, the worker refuses to start without one
+TABULA_WORKER_AUTHKEY = os.getenv('TABULA_WORKER_AUTHKEY', '')
+
+# Default PDF table engine for the region commands: 'tabula', 'pdfplumber' or 'pypdfium2' (override with --engine)
+PDF_EXTRACTION_ENGINE = os.getenv('PDF_EXTRACTION_ENGINE', 'tabula')
+
+# Cache of extracted PDF tables keyed by PDF content hash (bypass with --no-cache), LRU-evicted past the size limit
+TABLE_CACHE_DIR = os.getenv('TABLE_CACHE_DIR', os.path.join('downloads', 'table_cache'))
+TABLE_CACHE_MAX_BYTES = int(os.getenv('TABLE_CACHE_MAX_MB', '512')) * 1024 * 1024
+
+# Shared HTTP client (pipeline/http_client.py): timeouts in seconds, retry count and backoff, connections per host
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '10'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '1.0'))
+HTTP_BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '30'))
+HTTP_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', '4'))
+
+# Conditional-GET cache of downloaded report PDFs (pipeline/http_cache.py)
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'True').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join('downloads', 'http_cache'))
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_MB', '1024')) * 1024 * 1024
+
+# Opt-in monthly partitioning of the report tables by report_date (pipeline/partitioning.py, PostgreSQL only).
+# run_all keeps PARTITION_MONTHS_AHEAD future months created; `manage_partitions --retain-months N`
+# detaches older months into PARTITION_ARCHIVE_SCHEMA.
+PARTITION_REPORT_TABLES = os.getenv('PARTITION_REPORT_TABLES', 'False').lower() in ('1', 'true', 'yes')
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', '3'))
+PARTITION_ARCHIVE_SCHEMA = os.getenv('PARTITION_ARCHIVE_SCHEMA', 'archive')
+
+# Seconds the dashboard status API reuses its last response (report_dashboard/status.py).
+# The cache is per process and never invalidated, so this is how stale the dashboard may get.
+STATUS_API_CACHE_SECONDS = int(os.getenv('STATUS_API_CACHE_SECONDS', '5'))
+
+# Server-Sent Events job stream (report_dashboard/events.py): new-event check interval, heartbeat and
+# stream lifetime in seconds (the browser reconnects with Last-Event-ID when a stream ends)
+SSE_POLL_SECONDS = float(os.getenv('SSE_POLL_SECONDS', '1'))
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_STREAM_SECONDS = float(os.getenv('SSE_STREAM_SECONDS', '300'))
+
+# Dashboard job queue (manage.py run_job_worker): jobs run at once, and seconds an idle worker waits between queue checks
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', '2'))
+# Hours after which a RUNNING request counts as abandoned at worker startup, whatever host ran it (keep above the longest job)
+JOB_ABANDONED_AFTER_HOURS = float(os.getenv('JOB_ABANDONED_AFTER_HOURS', '6'))
+# Fork a fresh child of the warmed-up worker parent per job (pipeline/forkserver.py) instead of reusing worker processes
+JOB_FORK_PER_JOB = os.getenv('JOB_FORK_PER_JOB', 'False').lower() in ('1', 'true', 'yes')
+
+# Seconds each region may run under `manage.py run_all` before it is terminated
+RUN_ALL_REGION_TIMEOUT = int(os.getenv('RUN_ALL_REGION_TIMEOUT', '900'))
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -100,9 +158,29 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'Frcst$2025'),
         'HOST': os.getenv('POSTGRES_HOST', '172.16.7.119'),
         'PORT': int(os.getenv('POSTGRES_PORT', '8010')),
+        'OPTIONS': {'connect_timeout': int(os.getenv('POSTGRES_CONNECT_TIMEOUT', '10'))},
     }
 }
 
+# Database connection reuse (benchmark with `manage.py bench_status_api`). POSTGRES_CONN_MODE:
+#   'none'       a new connection for every request (Django's default)
+#   'persistent' keep each process's connection for POSTGRES_CONN_MAX_AGE seconds (default)
+#   'pool'       psycopg 3 connection pool per web process (pip install "psycopg[binary,pool]")
+# Reused connections are health-checked before a request uses them.
+POSTGRES_CONN_MODE = os.getenv('POSTGRES_CONN_MODE', 'persistent').lower()
+if POSTGRES_CONN_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('POSTGRES_CONN_MAX_AGE', '600'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif POSTGRES_CONN_MODE == 'pool':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('POSTGRES_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('POSTGRES_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('POSTGRES_POOL_TIMEOUT', '10')),
+    }
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif POSTGRES_CONN_MODE != 'none':
+    raise ImproperlyConfigured(f"POSTGRES_CONN_MODE must be 'none', 'persistent' or 'pool', not '{POSTGRES_CONN_MODE}'.")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReportDashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'report_dashboard'
+
+    def ready(self):
+        # Connects the post_save receivers that publish dashboard job events
+        from . import events  # noqa: F401
@@ -0,0 +1,169 @@
+"""
+Job updates pushed to the dashboard over Server-Sent Events.
+
+Every AutomationJob save and every DataAvailability record for today is stored
+as a JobEvent (post_save receivers below, connected in apps.ready()), whichever
+process made the change: the web server, a script started from the dashboard or
+run_all. The SSE endpoint streams these events with their id as the SSE event
+id, so a reconnecting EventSource sends Last-Event-ID and receives only what it
+missed; a fresh connection starts with a snapshot of every job.
+
+Open streams in one web process share a single EventBroker thread that checks
+for new events once every settings.SSE_POLL_SECONDS while anyone is connected;
+the streams themselves only query when something changed. Idle streams send a
+heartbeat comment every settings.SSE_HEARTBEAT_SECONDS and end after
+settings.SSE_STREAM_SECONDS, after which the browser reconnects.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import Max
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AutomationJob, DataAvailability, JobEvent
+from .status import AVAILABILITY_SOURCE, format_time, job_statuses
+
+logger = logging.getLogger(__name__)
+
+LOG_TAIL_CHARS = 2000
+RECONNECT_MS = 3000
+EVENT_RETENTION = timedelta(days=1)
+PRUNE_EVERY = 500
+
+
+def publish(script_name, **changes):
+    """Store a JobEvent carrying the changed job fields."""
+    event = JobEvent.objects.create(script_name=script_name, payload={'script_name': script_name, **changes})
+    if event.pk % PRUNE_EVERY == 0:
+        JobEvent.objects.filter(created_at__lt=timezone.now() - EVENT_RETENTION).delete()
+    return event
+
+
+@receiver(post_save, sender=AutomationJob)
+def job_saved(sender, instance, **kwargs):
+    try:
+        publish(
+            instance.script_name,
+            status=instance.status,
+            last_run_time=format_time(instance.last_run_time),
+            last_success_time=format_time(instance.last_success_time),
+            log_message=(instance.log_message or '')[-LOG_TAIL_CHARS:],
+        )
+    except Exception as e:
+        logger.warning("Could not publish job event for %s: %s", instance.script_name, e)
+
+
+@receiver(post_save, sender=DataAvailability)
+def availability_saved(sender, instance, **kwargs):
+    if instance.report_date != timezone.now().date():
+        return
+    scripts = [instance.script_name] + [job for job, source in AVAILABILITY_SOURCE.items() if source == instance.script_name]
+    try:
+        for script_name in scripts:
+            publish(script_name, is_data_available_today=True)
+    except Exception as e:
+        logger.warning("Could not publish availability event for %s: %s", instance.script_name, e)
+
+
+class EventBroker:
+    """Wakes the open streams of this process when a new JobEvent appears."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.latest_id = None
+        self.subscribers = 0
+        self.thread = None
+
+    def subscribe(self):
+        with self.condition:
+            self.subscribers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='job-event-broker', daemon=True)
+                self.thread.start()
+
+    def unsubscribe(self):
+        with self.condition:
+            self.subscribers -= 1
+
+    def wait(self, after_id, timeout):
+        """Block until an event newer than after_id exists or timeout passes; returns the latest id seen."""
+        with self.condition:
+            self.condition.wait_for(lambda: (self.latest_id or 0) > after_id, timeout)
+            return self.latest_id or 0
+
+    def _run(self):
+        interval = getattr(settings, 'SSE_POLL_SECONDS', 1.0)
+        try:
+            while True:
+                with self.condition:
+                    if self.subscribers <= 0:
+                        self.thread = None
+                        return
+                try:
+                    latest = JobEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+                except Exception as e:
+                    logger.warning("Job event poll failed: %s", e)
+                    connections.close_all()
+                else:
+                    with self.condition:
+                        if latest != self.latest_id:
+                            self.latest_id = latest
+                            self.condition.notify_all()
+                time.sleep(interval)
+        finally:
+            connections.close_all()
+
+
+broker = EventBroker()
+
+
+def _message(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _snapshot():
+    # Read the event id first and the statuses fresh (not the cached body), so no change falls in between
+    latest = JobEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+    statuses = job_statuses(timezone.now().date())
+    return latest, _message('snapshot', json.dumps(statuses), latest)
+
+
+def event_stream(last_event_id=None):
+    """Generator of SSE messages: a snapshot or the missed events, then live events and heartbeats."""
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + getattr(settings, 'SSE_STREAM_SECONDS', 300)
+    yield f"retry: {RECONNECT_MS}\n\n"
+
+    oldest = JobEvent.objects.values_list('id', flat=True).first()
+    if last_event_id is None or (oldest is not None and last_event_id < oldest - 1):
+        # New client, or its last event has been pruned: start over from the current state
+        last_event_id, message = _snapshot()
+        yield message
+
+    broker.subscribe()
+    try:
+        while time.monotonic() < deadline:
+            # Hold no database connection while waiting; the broker does the polling
+            connection.close()
+            latest = broker.wait(last_event_id, min(heartbeat, max(0.0, deadline - time.monotonic())))
+            if latest <= last_event_id:
+                yield ": heartbeat\n\n"
+                continue
+            events = list(JobEvent.objects.filter(id__gt=last_event_id).order_by('id')[:200])
+            for event in events:
+                yield _message('job', json.dumps(event.payload), event.id)
+            # Nothing newer to read (e.g. pruned meanwhile): catch up to what the broker saw
+            last_event_id = events[-1].id if events else latest
+    finally:
+        broker.unsubscribe()
@@ -0,0 +1,136 @@
+"""
+Queue of dashboard run requests, worked off by `manage.py run_job_worker`.
+
+enqueue() stores a JobRequest; a second click for the same (script, date) while
+one is queued or running returns that request instead of adding another (a
+conditional unique constraint guarantees it). Workers take the oldest queued
+request with claim_next(), a conditional UPDATE so two workers never run the
+same one, and report the outcome and duration with finish(), which also moves
+the script's AutomationJob to SUCCESS or FAILED. Worker names are
+'<host>:<pid>:<index>'; fail_orphaned() uses them to fail only the requests of
+worker processes that are gone, so several run_job_worker instances can share
+the queue.
+"""
+import os
+import time
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import AutomationJob, JobRequest
+
+# Scripts the dashboard can run, in display order
+SCRIPT_NAMES = [
+    'nrldc_project',    # This must match nrldc_project.py
+    'srldc_project',    # This must match srldc_project.py
+    'wrldc_project',    # This must match wrldc_project.py
+    'posoco',           # This must match posoco.py
+    'merge_reports',    # This must match merge_reports.py
+    'run_all',          # All four regions concurrently, then merge_reports
+]
+
+
+def enqueue(script_name, run_date=''):
+    """Queue script_name for run_date; returns (request, created)."""
+    try:
+        with transaction.atomic():
+            return JobRequest.objects.create(script_name=script_name, run_date=run_date or ''), True
+    except IntegrityError:
+        active = JobRequest.objects.filter(script_name=script_name, run_date=run_date or '', status__in=JobRequest.ACTIVE)
+        request = active.first()
+        if request is None:
+            # Finished between the insert and this lookup
+            return enqueue(script_name, run_date)
+        return request, False
+
+
+def claim_next(worker):
+    """Mark the oldest queued request RUNNING for worker and return it, or None if the queue is empty."""
+    for candidate in JobRequest.objects.filter(status=JobRequest.Status.QUEUED).order_by('id').values_list('id', flat=True)[:10]:
+        claimed = JobRequest.objects.filter(id=candidate, status=JobRequest.Status.QUEUED).update(
+            status=JobRequest.Status.RUNNING, started_at=timezone.now(), worker=worker,
+        )
+        if claimed:
+            request = JobRequest.objects.get(id=candidate)
+            _update_job(request.script_name, AutomationJob.Status.RUNNING, f"Running on {worker} (request #{request.pk})...")
+            return request
+    return None
+
+
+def finish(request, started, error=None):
+    """Store the outcome of request; started is its time.perf_counter() start."""
+    request.duration_seconds = round(time.perf_counter() - started, 3)
+    request.finished_at = timezone.now()
+    request.status = JobRequest.Status.FAILED if error else JobRequest.Status.SUCCESS
+    request.error = error or ''
+    request.save(update_fields=['duration_seconds', 'finished_at', 'status', 'error'])
+
+    if error:
+        _update_job(request.script_name, AutomationJob.Status.FAILED, f"Failed after {request.duration_seconds:.1f}s: {error}")
+    else:
+        _update_job(request.script_name, AutomationJob.Status.SUCCESS, f"Finished in {request.duration_seconds:.1f}s.")
+
+
+def fail_abandoned(reason, worker=None):
+    """Mark RUNNING requests (of worker, or all) FAILED, e.g. after their worker process died."""
+    running = JobRequest.objects.filter(status=JobRequest.Status.RUNNING)
+    if worker is not None:
+        running = running.filter(worker=worker)
+    return _fail(list(running), reason)
+
+
+def fail_orphaned(reason, hostname, max_age):
+    """
+    Mark RUNNING requests FAILED whose worker process on hostname no longer exists, or that
+    started more than max_age (a timedelta) ago on any host. Requests of live workers, such
+    as those of another run_job_worker instance, keep running.
+    """
+    cutoff = timezone.now() - max_age
+    orphaned = [
+        request for request in JobRequest.objects.filter(status=JobRequest.Status.RUNNING)
+        if request.started_at is None or request.started_at < cutoff or _worker_gone(request.worker, hostname)
+    ]
+    return _fail(orphaned, reason)
+
+
+def _worker_gone(worker, hostname):
+    """Whether worker ('<host>:<pid>:<index>') ran on hostname in a process that has exited."""
+    try:
+        host, pid, _ = worker.rsplit(':', 2)
+        pid = int(pid)
+    except ValueError:
+        return False
+    if host != hostname or os.name != 'posix':
+        # Other hosts (and Windows, where os.kill would terminate the process) are left to the age cutoff
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # PermissionError: alive, owned by another user
+        return False
+    return False
+
+
+def _fail(abandoned, reason):
+    for request in abandoned:
+        request.started_at = request.started_at or timezone.now()
+        request.finished_at = timezone.now()
+        request.duration_seconds = (request.finished_at - request.started_at).total_seconds()
+        request.status = JobRequest.Status.FAILED
+        request.error = reason
+        request.save(update_fields=['finished_at', 'duration_seconds', 'status', 'error'])
+        _update_job(request.script_name, AutomationJob.Status.FAILED, reason)
+    return len(abandoned)
+
+
+def _update_job(script_name, status, message):
+    job, _ = AutomationJob.objects.get_or_create(script_name=script_name)
+    job.status = status
+    job.log_message = message
+    if status == AutomationJob.Status.RUNNING:
+        job.last_run_time = timezone.now()
+    elif status == AutomationJob.Status.SUCCESS:
+        job.last_success_time = timezone.now()
+    job.save()
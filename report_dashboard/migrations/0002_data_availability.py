@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:06
+
+import os
+import re
+from datetime import date
+
+from django.db import migrations, models
+
+# Script -> the tables whose rows mean "data stored for that date"
+SCRIPT_TABLES = {
+    'nrldc_project': [('nrldc_app', 'Nrldc2AData'), ('nrldc_app', 'Nrldc2CData')],
+    'srldc_project': [('srldc_app', 'Srldc2AData'), ('srldc_app', 'Srldc2CData')],
+    'wrldc_project': [('wrldc_app', 'Wrldc2AData'), ('wrldc_app', 'Wrldc2CData')],
+    'posoco': [('posoco', 'PosocoTableA'), ('posoco', 'PosocoTableG')],
+}
+MERGED_DIR = os.path.join('downloads', 'overall_json')
+
+
+def backfill_availability(apps, schema_editor):
+    DataAvailability = apps.get_model('report_dashboard', 'DataAvailability')
+    records = set()
+    for script_name, tables in SCRIPT_TABLES.items():
+        for app_label, model_name in tables:
+            model = apps.get_model(app_label, model_name)
+            dates = model.objects.values_list('report_date', flat=True).distinct()
+            records.update((script_name, report_date) for report_date in dates)
+    if os.path.isdir(MERGED_DIR):
+        for filename in os.listdir(MERGED_DIR):
+            match = re.match(r'merged_reports_(\d{4})-(\d{2})-(\d{2})', filename)
+            if match:
+                records.add(('merge_reports', date(*map(int, match.groups()))))
+    DataAvailability.objects.bulk_create(
+        [DataAvailability(script_name=script_name, report_date=report_date) for script_name, report_date in records],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report_dashboard', '0001_initial'),
+        ('nrldc_app', '0008_report_date_brin'),
+        ('srldc_app', '0006_report_date_brin'),
+        ('wrldc_app', '0011_report_date_brin'),
+        ('posoco', '0008_report_date_brin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('script_name', models.CharField(max_length=100)),
+                ('report_date', models.DateField()),
+                ('recorded_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('script_name', 'report_date')},
+            },
+        ),
+        migrations.RunPython(backfill_availability, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('report_dashboard', '0003_job_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('script_name', models.CharField(max_length=100)),
+                ('run_date', models.CharField(blank=True, default='', max_length=10)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('SUCCESS', 'Success'), ('FAILED', 'Failed')], default='QUEUED', max_length=20)),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.FloatField(blank=True, null=True)),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='jobrequest_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['QUEUED', 'RUNNING'])), fields=('script_name', 'run_date'), name='jobrequest_one_active')],
+            },
+        ),
+    ]
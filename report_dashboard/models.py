@@ -18,4 +18,66 @@ class AutomationJob(models.Model):
         return self.script_name
 
     class Meta:
-        ordering = ['script_name']
\ No newline at end of file
+        ordering = ['script_name']
+
+
+class DataAvailability(models.Model):
+    """Written by a script when it has stored data for a report date; read by the status API."""
+    script_name = models.CharField(max_length=100)
+    report_date = models.DateField()
+    recorded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.script_name} - {self.report_date}"
+
+    class Meta:
+        unique_together = ('script_name', 'report_date')
+
+
+class JobEvent(models.Model):
+    """A job change pushed to open dashboards over Server-Sent Events; the id is the SSE event id."""
+    script_name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"#{self.pk} {self.script_name}"
+
+    class Meta:
+        ordering = ['id']
+
+
+class JobRequest(models.Model):
+    """A dashboard run request, executed by `manage.py run_job_worker`."""
+    class Status(models.TextChoices):
+        QUEUED = 'QUEUED', 'Queued'
+        RUNNING = 'RUNNING', 'Running'
+        SUCCESS = 'SUCCESS', 'Success'
+        FAILED = 'FAILED', 'Failed'
+
+    ACTIVE = (Status.QUEUED, Status.RUNNING)
+
+    script_name = models.CharField(max_length=100)
+    run_date = models.CharField(max_length=10, blank=True, default='')  # YYYY-MM-DD, '' = the script's default (today)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"#{self.pk} {self.script_name} {self.run_date or 'today'} ({self.status})"
+
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'id'], name='jobrequest_status_idx')]
+        constraints = [
+            # One queued or running request per (script, date); repeated clicks join it
+            models.UniqueConstraint(
+                fields=['script_name', 'run_date'],
+                condition=models.Q(status__in=['QUEUED', 'RUNNING']),
+                name='jobrequest_one_active',
+            ),
+        ]
@@ -0,0 +1,82 @@
+"""
+Job status served to the polling dashboard.
+
+Scripts call record_availability() once they have stored data for a report date.
+The status API reads every job together with today's availability in one query
+(job_statuses()). It caches the serialized body for settings.STATUS_API_CACHE_SECONDS
+and answers a matching If-None-Match with 304, so idle dashboards cost a cache
+lookup and no rendering. The cache is per process (LocMem) and jobs write from
+commands and workers, so nothing invalidates it: changes show up once the
+entry expires, which is why the TTL is kept to a few seconds.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, CharField, Exists, F, OuterRef, Value, When
+from django.utils import timezone
+
+from .models import AutomationJob, DataAvailability
+
+# Jobs whose data is another script's output
+AVAILABILITY_SOURCE = {'run_all': 'merge_reports'}
+DEFAULT_CACHE_SECONDS = 5
+
+
+def _cache_key(day):
+    return f"dashboard_status:{day.isoformat()}"
+
+
+def record_availability(script_name, report_date):
+    """Mark data stored for script_name on report_date (after the current transaction commits)."""
+    def write():
+        DataAvailability.objects.update_or_create(script_name=script_name, report_date=report_date)
+    transaction.on_commit(write, robust=True)
+
+
+def format_time(value):
+    return value.strftime('%b %d, %Y, %I:%M %p') if value else None
+
+
+def jobs_with_availability(day):
+    """AutomationJob queryset annotated with data_available (data stored for day)."""
+    whens = [When(script_name=job, then=Value(source)) for job, source in AVAILABILITY_SOURCE.items()]
+    return AutomationJob.objects.annotate(
+        availability_script=Case(*whens, default=F('script_name'), output_field=CharField()),
+        data_available=Exists(
+            DataAvailability.objects.filter(script_name=OuterRef('availability_script'), report_date=day)
+        ),
+    )
+
+
+def job_statuses(day):
+    """Status rows of every job with whether its data for day is stored, in one query."""
+    jobs = jobs_with_availability(day).values(
+        'script_name', 'status', 'last_run_time', 'last_success_time', 'data_available', 'log_message'
+    )
+
+    return [
+        {
+            'script_name': job['script_name'],
+            'status': job['status'],
+            'last_run_time': format_time(job['last_run_time']),
+            'last_success_time': format_time(job['last_success_time']),
+            'is_data_available_today': job['data_available'],
+            'log_message': job['log_message'],
+        }
+        for job in jobs
+    ]
+
+
+def status_body():
+    """(etag, JSON bytes) of today's job statuses, cached for a few seconds."""
+    today = timezone.now().date()
+    key = _cache_key(today)
+    cached = cache.get(key)
+    if cached is None:
+        body = json.dumps(job_statuses(today)).encode('utf-8')
+        cached = (f'"{hashlib.md5(body).hexdigest()}"', body)
+        cache.set(key, cached, getattr(settings, 'STATUS_API_CACHE_SECONDS', DEFAULT_CACHE_SECONDS))
+    return cached
@@ -1,3 +1,115 @@
+import datetime
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .jobs import claim_next, enqueue, fail_abandoned, fail_orphaned, finish
+from .models import AutomationJob, JobRequest
+
+
+class StatusApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('dashboard_status_api')
+        AutomationJob.objects.create(script_name='nrldc_project')
+
+    def test_matching_etag_answers_304(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['script_name'], 'nrldc_project')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_changes_show_up_once_the_cache_expires(self):
+        etag = self.client.get(self.url)['ETag']
+        AutomationJob.objects.filter(script_name='nrldc_project').update(status=AutomationJob.Status.RUNNING)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        cache.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()[0]['status'], 'RUNNING')
+
+
+class JobQueueTests(TestCase):
+    def test_duplicate_enqueue_returns_the_active_request(self):
+        first, created = enqueue('nrldc_project', '2025-01-15')
+        self.assertTrue(created)
+
+        self.assertEqual(enqueue('nrldc_project', '2025-01-15'), (first, False))
+        self.assertTrue(enqueue('nrldc_project', '2025-01-16')[1])
+
+        claim_next('worker-1')
+        self.assertEqual(enqueue('nrldc_project', '2025-01-15'), (first, False))
+
+        finish(JobRequest.objects.get(pk=first.pk), time.perf_counter())
+        request, created = enqueue('nrldc_project', '2025-01-15')
+        self.assertTrue(created)
+        self.assertNotEqual(request.pk, first.pk)
+
+    def test_request_is_claimed_once(self):
+        first, _ = enqueue('nrldc_project')
+        second, _ = enqueue('posoco')
+
+        claimed = [claim_next('worker-1'), claim_next('worker-2'), claim_next('worker-3')]
+
+        self.assertEqual([request and request.pk for request in claimed], [first.pk, second.pk, None])
+        self.assertEqual(JobRequest.objects.get(pk=first.pk).worker, 'worker-1')
+        self.assertEqual(AutomationJob.objects.get(script_name='posoco').status, AutomationJob.Status.RUNNING)
+
+    def test_fail_abandoned_for_a_named_worker(self):
+        enqueue('nrldc_project')
+        enqueue('posoco')
+        enqueue('merge_reports')
+        lost = claim_next('worker-1')
+        kept = claim_next('worker-2')
+
+        self.assertEqual(fail_abandoned('Worker exited with code -9.', worker='worker-1'), 1)
+
+        lost.refresh_from_db()
+        kept.refresh_from_db()
+        self.assertEqual((lost.status, lost.error), (JobRequest.Status.FAILED, 'Worker exited with code -9.'))
+        self.assertIsNotNone(lost.finished_at)
+        self.assertEqual(kept.status, JobRequest.Status.RUNNING)
+        self.assertEqual(JobRequest.objects.filter(status=JobRequest.Status.QUEUED).count(), 1)
+        self.assertEqual(AutomationJob.objects.get(script_name='nrldc_project').status, AutomationJob.Status.FAILED)
+
+    @unittest.skipUnless(os.name == 'posix', 'process liveness is only checked on POSIX')
+    def test_fail_orphaned_leaves_live_workers_alone(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        workers = {
+            'live': f"host-a:{os.getpid()}:0",
+            'exited': f"host-a:{exited.pid}:0",
+            'other_host': f"host-b:{exited.pid}:0",
+            'stale': f"host-b:{exited.pid}:1",
+        }
+        requests = {}
+        for name, worker in workers.items():
+            enqueue(name)
+            requests[name] = claim_next(worker)
+        JobRequest.objects.filter(pk=requests['stale'].pk).update(started_at=timezone.now() - datetime.timedelta(hours=7))
+
+        self.assertEqual(fail_orphaned('Worker stopped.', 'host-a', datetime.timedelta(hours=6)), 2)
 
-# Create your tests here.
+        statuses = {name: JobRequest.objects.get(pk=request.pk).status for name, request in requests.items()}
+        self.assertEqual(statuses, {
+            'live': JobRequest.Status.RUNNING, 'exited': JobRequest.Status.FAILED,
+            'other_host': JobRequest.Status.RUNNING, 'stale': JobRequest.Status.FAILED,
+        })
+        # The live request still holds its slot
+        self.assertEqual(enqueue('live')[0].pk, requests['live'].pk)
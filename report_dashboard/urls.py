@@ -3,6 +3,9 @@ from . import views
 
 urlpatterns = [
     path('', views.dashboard_view, name='dashboard'),
+    path('history/', views.pipeline_history_view, name='pipeline_history'),
     path('run/<str:script_name>/', views.run_script_view, name='run_script'),
     path('api/status/', views.dashboard_status_api, name='dashboard_status_api'),
+    path('api/events/', views.dashboard_events, name='dashboard_events'),
+    path('api/rollup/<str:report_date>/', views.daily_rollup_api, name='daily_rollup_api'),
 ]
\ No newline at end of file
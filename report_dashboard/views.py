@@ -1,16 +1,21 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from .models import AutomationJob
-import subprocess
-import sys
-import os
+from .events import event_stream
+from .jobs import SCRIPT_NAMES, enqueue
+from .status import jobs_with_availability, status_body
+import datetime
 
 # Import your data models
-from nrldc_app.models import Nrldc2AData, Nrldc2CData
-from srldc_app.models import Srldc2AData, Srldc2CData 
-from wrldc_app.models import Wrldc2AData, Wrldc2CData
-from posoco.models import PosocoTableA, PosocoTableG
+from pipeline.models import DailyRollup, PipelineRun
+from pipeline.runs import STAGE_FIELDS, stage_summary
+
+HISTORY_DAYS = 30
+HISTORY_RECENT_RUNS = 50
 
 
 def dashboard_view(request):
@@ -19,52 +24,74 @@ def dashboard_view(request):
     """
     jobs = AutomationJob.objects.all()
 
-    script_names = [
-        'nrldc_project',    # This must match nrldc_project.py
-        'srldc_project',    # This must match srldc_project.py
-        'wrldc_project',    # This must match wrldc_project.py
-        'posoco',           # This must match posoco.py
-        'merge_reports'     # This must match merge_reports.py
-    ]
-    if jobs.count() < len(script_names):
+    if jobs.count() < len(SCRIPT_NAMES):
         existing_scripts = list(jobs.values_list('script_name', flat=True))
-        for name in script_names:
+        for name in SCRIPT_NAMES:
             if name not in existing_scripts:
                 AutomationJob.objects.create(script_name=name)
-        jobs = AutomationJob.objects.all()
+    jobs = jobs_with_availability(timezone.now().date())
 
     context = {
         'jobs': jobs
     }
     return render(request, 'report_dashboard/dashboard.html', context)
 
+def pipeline_history_view(request):
+    """
+    Run history of the region commands and merge_reports: p50/p95 per stage over
+    the last ?days= days (default 30), optionally for one ?script=, and the latest runs.
+    """
+    try:
+        days = min(max(int(request.GET.get('days', HISTORY_DAYS)), 1), 365)
+    except ValueError:
+        days = HISTORY_DAYS
+    script_name = request.GET.get('script') or ''
+
+    runs = PipelineRun.objects.filter(started_at__gte=timezone.now() - datetime.timedelta(days=days))
+    if script_name:
+        runs = runs.filter(script_name=script_name)
+
+    summary = stage_summary(runs.values(
+        'script_name', 'status', 'duration_seconds', 'bytes_downloaded', 'rows_written', *STAGE_FIELDS.values()
+    ))
+    context = {
+        'summary': summary,
+        'stages': list(STAGE_FIELDS),
+        'recent_runs': runs[:HISTORY_RECENT_RUNS],
+        'script_names': PipelineRun.objects.order_by('script_name').values_list('script_name', flat=True).distinct(),
+        'selected_script': script_name,
+        'days': days,
+    }
+    return render(request, 'report_dashboard/history.html', context)
+
 # --- THIS FUNCTION HAS BEEN UPDATED ---
 def run_script_view(request, script_name):
     """
-    Triggers a management command via an AJAX request and returns a JSON response.
+    Queues a management command for `manage.py run_job_worker` via an AJAX request
+    and returns a JSON response. A second click for the same script and date while
+    it is still queued or running joins the existing request.
     """
     if request.method == 'POST':
         try:
             job = AutomationJob.objects.get(script_name=script_name)
+
+            run_date = request.POST.get('run_date') or ''
+            if run_date:
+                try:
+                    datetime.datetime.strptime(run_date, '%Y-%m-%d')
+                except ValueError:
+                    return JsonResponse({'status': 'error', 'message': 'Date format is incorrect. Please use YYYY-MM-DD.'}, status=400)
+
+            job_request, created = enqueue(script_name, run_date)
+            if not created:
+                return JsonResponse({'status': 'success', 'message': f'Script {script_name} is already {job_request.get_status_display().lower()} (request #{job_request.pk}).'})
+
             job.status = AutomationJob.Status.RUNNING
             job.last_run_time = timezone.now()
-            job.log_message = "Execution started manually..."
+            job.log_message = f"Queued manually (request #{job_request.pk})..."
             job.save()
 
-            python_executable = sys.executable
-            manage_py_path = 'manage.py'
-            
-            run_date = request.POST.get('run_date')
-             
-            command = [python_executable, manage_py_path, script_name]
-            if run_date:
-                command.extend(['--date', run_date])
-                
-            # Use Popen to run the script in the background without waiting
-            subprocess.Popen(command)
-
-            # CHANGED: Return a JSON response to confirm the script has started
-            return JsonResponse({'status': 'success', 'message': f'Script {script_name} started.'})
+            return JsonResponse({'status': 'success', 'message': f'Script {script_name} queued (request #{job_request.pk}).'})
 
         except AutomationJob.DoesNotExist:
             return JsonResponse({'status': 'error', 'message': 'Job not found.'}, status=404)
@@ -77,53 +104,47 @@ def run_script_view(request, script_name):
 
 def dashboard_status_api(request):
     """
-    API endpoint to provide job statuses. (No changes needed)
+    API endpoint to provide job statuses. Read-only: availability comes from the
+    DataAvailability records the scripts write, cached for a few seconds, and an
+    unchanged status answers the dashboard's If-None-Match with 304.
     """
-    today = timezone.now().date()
-    jobs = AutomationJob.objects.all()
+    etag, body = status_body()
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    # Let the browser keep the body but revalidate on every poll
+    patch_cache_control(response, no_cache=True)
+    return response
+
+def dashboard_events(request):
+    """
+    Server-Sent Events stream of job changes. EventSource reconnects with the
+    Last-Event-ID header and gets only the events it missed.
+    """
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
 
-    for job in jobs:
-        data_exists = False
-        if job.script_name == 'nrldc_project':
-            data_exists = (Nrldc2AData.objects.filter(report_date=today).exists() or 
-                           Nrldc2CData.objects.filter(report_date=today).exists())
-        
-        elif job.script_name == 'srldc_project':
-            data_exists = (Srldc2AData.objects.filter(report_date=today).exists() or 
-                           Srldc2CData.objects.filter(report_date=today).exists())
-
-        elif job.script_name == 'wrldc_project':
-            data_exists = (Wrldc2AData.objects.filter(report_date=today).exists() or 
-                           Wrldc2CData.objects.filter(report_date=today).exists())
-
-        elif job.script_name == 'posoco':
-            data_exists = (PosocoTableA.objects.filter(report_date=today).exists() or 
-                           PosocoTableG.objects.filter(report_date=today).exists())
-
-        elif job.script_name == 'merge_reports':
-            directory_path = "downloads/overall_json/"
-            file_prefix = f"merged_reports_{today.strftime('%Y-%m-%d')}"
-            
-            if os.path.exists(directory_path):
-                for filename in os.listdir(directory_path):
-                    if filename.startswith(file_prefix):
-                        data_exists = True
-                        break
-        
-        if job.is_data_available_today != data_exists:
-            job.is_data_available_today = data_exists
-            job.save()
-    
-    job_values = jobs.values(
-        'script_name', 'status', 'last_run_time', 'last_success_time', 
-        'is_data_available_today', 'log_message'
-    )
-    
-    job_list = list(job_values)
-    for job_data in job_list:
-        if job_data['last_run_time']:
-            job_data['last_run_time'] = job_data['last_run_time'].strftime('%b %d, %Y, %I:%M %p')
-        if job_data['last_success_time']:
-            job_data['last_success_time'] = job_data['last_success_time'].strftime('%b %d, %Y, %I:%M %p')
-
-    return JsonResponse(job_list, safe=False)
\ No newline at end of file
+    response = StreamingHttpResponse(event_stream(last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def daily_rollup_api(request, report_date):
+    """
+    Precomputed all-India totals and per-region subtotals for one day (YYYY-MM-DD).
+    """
+    try:
+        rollup = DailyRollup.objects.get(pk=report_date)
+    except (DailyRollup.DoesNotExist, ValueError, ValidationError):
+        return JsonResponse({'status': 'error', 'message': f'No rollup for {report_date}.'}, status=404)
+
+    data = {field.name: getattr(rollup, field.name) for field in DailyRollup._meta.concrete_fields}
+    data['report_date'] = rollup.report_date.isoformat()
+    data['updated_at'] = rollup.updated_at.isoformat()
+    return JsonResponse(data)
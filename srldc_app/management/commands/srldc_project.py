@@ -1,7 +1,16 @@
 import requests
 import datetime
 import os
-from tabula.io import read_pdf
+from pipeline import http_cache
+from pipeline.extraction import add_extraction_arguments, read_tables_for_markers, resolve_engine
+from pipeline.facts import region_facts, upsert_with_facts
+from pipeline.ingest import add_parsed_times
+from pipeline.models import PipelineRun
+from pipeline.runs import TablesNotSaved, recorded_run
+from pipeline.table_parser import build_marker_index, combine_tables, extract_table, model_defaults, prepare_rows
+from pipeline.table_specs import TABLE_SPECS, region_markers
+from pipeline.timing import StageTimer
+from report_dashboard.status import record_availability
 import pandas as pd
 import json
 import logging
@@ -18,6 +27,7 @@ class Command(BaseCommand):
             help='Date for which to run the report, format: DD-MM-YYYY',
             required=False
         )
+        add_extraction_arguments(parser)
 
     def write(self, message, level='info'):
         self.stdout.write(message)
@@ -41,132 +51,15 @@ class Command(BaseCommand):
             handler.setFormatter(formatter)
             self.logger.addHandler(handler)
 
+        self.timings = StageTimer()
+        # SHA-256 of the downloaded PDF, computed while streaming; reused as the table cache key
+        self.pdf_sha256 = None
+
     help = 'Download today\'s SRLDC report and extract tables 2(A) and 2(C) to a single JSON file and save to DB'
 
-    # List of expected state names for validation
-    SOUTH_INDIAN_STATES = [
-        "ANDHRA PRADESH", "KARNATAKA", "KERALA", "PONDICHERRY", "TAMILNADU", "TELANGANA", "REGION"
-    ]
-    # For Table 2C, states might be abbreviated or slightly different
-    SOUTH_INDIAN_STATES_2C = [
-        "AP", "KAR", "KER", "PONDY", "TN", "TG", "REGION"
-    ]
-
-    def extract_subtable_by_markers(self, df, start_marker, end_marker=None, header_row_count=0, debug_table_name="Unknown Table"):
-        """
-        Extracts a sub-table from a DataFrame based on start and optional end markers.
-        Handles multi-level headers by explicitly taking a specified number of rows after the start marker
-        as header rows and combining them intelligently.
-
-        Args:
-            df (pd.DataFrame): The DataFrame to search within.
-            start_marker (str): The regex pattern to identify the start of the sub-table (usually the table title).
-            end_marker (str, optional): The regex pattern to identify the end of the sub-table.
-                                        If None, extracts from start_marker to the end of the DataFrame.
-            header_row_count (int): The number of rows immediately following the start_marker (or actual data start)
-                                    that constitute the header. These rows will be combined to form column names.
-            debug_table_name (str): A name for the table being processed, used in debug prints.
-
-        Returns:
-            tuple: (pd.DataFrame or None, list or None): The extracted sub-table and its column names,
-            or (None, None) if the start marker is not found.
-        """
-        start_idx = None
-        end_idx = None
-        new_columns = None
-
-        for i, row in df.iterrows():
-            row_str_series = row.astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-            if row_str_series.str.contains(start_marker, regex=True, na=False, case=False).any():
-                start_idx = i
-                break
-
-        if start_idx is None:
-            self.write(self.style.WARNING(f"⚠️ Start marker '{start_marker}' not found for {debug_table_name}."), level='warning')
-            return None, None
-
-        if end_marker:
-            for i in range(start_idx + 1, len(df)):
-                row_str_series = df.iloc[i].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-                if row_str_series.str.contains(end_marker, regex=True, na=False, case=False).any():
-                    end_idx = i
-                    break
-
-        if end_idx is not None:
-            raw_sub_df = df.iloc[start_idx:end_idx].copy().reset_index(drop=True)
-        else:
-            raw_sub_df = df.iloc[start_idx:].copy().reset_index(drop=True)
-
-        data_start_row_in_raw_sub_df = 1 + header_row_count
-
-        if header_row_count > 0 and len(raw_sub_df) >= data_start_row_in_raw_sub_df:
-            headers_df = raw_sub_df.iloc[1 : data_start_row_in_raw_sub_df]
-            new_columns = []
-            if debug_table_name == "Table 2(A)":
-                new_columns = [
-                    'STATE',
-                    'THERMAL',
-                    'HYDRO',
-                    'GAS/DIESEL/NAPTHA',    
-                    'WIND',
-                    'SOLAR',
-                    'OTHERS',
-                    'Net SCH (Net Mu)',
-                    'Drawal (Net Mu)',
-                    'UI (Net Mu)',
-                    'Availability (Net MU)',
-                    'Demand Met (Net MU)',
-                    'Shortage # (Net MU)'
-                ]
-            elif debug_table_name == "Table 2(C)":
-                new_columns = [
-                    'State',
-                    'Maximum Demand Met of the day',
-                    'Time',
-                    'Shortage during maximum demand',
-                    'Requirement at maximum demand',
-                    'Maximum requirement of the day',
-                    'Time.1',
-                    'Shortage during maximum requirement',
-                    'Demand Met at maximum Requirement',
-                    'Min Demand Met',  # This will map to ace_min
-                    'Time.2',          # This will map to time_ace_min
-                    'ACE_MAX',
-                    'Time.3',
-                    # Removed 'ACE_MIN' and 'Time.4' as they don't exist in extracted DF
-                ]
-            else:
-                self.write(self.style.WARNING(f"⚠️ Custom header combination logic not defined for {debug_table_name}. Falling back to generic combination."), level='warning')
-                raw_top_header = headers_df.iloc[0].astype(str).str.replace('\n', ' ', regex=False).str.strip().fillna('')
-                raw_bottom_header = headers_df.iloc[1].astype(str).str.replace('\n', ' ', regex=False).str.strip().fillna('')
-                for idx in range(raw_top_header.shape[0]):
-                    t_col = raw_top_header.iloc[idx].strip()
-                    b_col = raw_bottom_header.iloc[idx].strip()
-                    if not t_col and not b_col:
-                        new_columns.append(f"Unnamed_{idx}")
-                    elif not b_col:
-                        new_columns.append(t_col)
-                    elif not t_col:
-                        new_columns.append(b_col)
-                    elif not b_col.startswith(t_col):
-                        new_columns.append(f"{t_col} {b_col}".strip())
-                    else:
-                        new_columns.append(b_col)
-
-            if new_columns is not None:
-                sub_df_data = raw_sub_df.iloc[data_start_row_in_raw_sub_df:].copy()
-                sub_df_data = sub_df_data.reindex(columns=list(sub_df_data.columns) + [col for col in new_columns if col not in sub_df_data.columns])
-                sub_df_data = sub_df_data.iloc[:, :len(new_columns)]
-                sub_df_data.columns = new_columns
-                sub_df_data = sub_df_data.loc[:, ~sub_df_data.columns.duplicated(keep='first')]
-                sub_df_data.columns = sub_df_data.columns.astype(str).str.strip()
-                sub_df_data.columns = sub_df_data.columns.str.replace(r'\s*\r\s*', ' ', regex=True).str.strip()
-                sub_df_data = sub_df_data.dropna(axis=0, how='all')
-                return sub_df_data.dropna(axis=1, how='all'), new_columns
-            else:
-                return raw_sub_df.iloc[1:].dropna(axis=1, how='all'), None
-        else:
-            return raw_sub_df.iloc[1:].dropna(axis=1, how='all'), None
+    # Tables 2(A) and 2(C) as declared in pipeline/table_specs.py, and the model each one is saved to
+    TABLES = TABLE_SPECS['srldc']
+    MODELS = {'2A': Srldc2AData, '2C': Srldc2CData}
 
     def _safe_float(self, value):
         if pd.isna(value) or value is None:
@@ -192,19 +85,23 @@ class Command(BaseCommand):
         s_val = s_val.replace('\r', ' ')
         return s_val
 
-    def extract_tables_from_pdf(self, pdf_path, output_dir, report_date):
+    def extract_tables_from_pdf(self, pdf_path, output_dir, report_date, engine=None, use_cache=True, pdf_sha256=None):
         self.logger.info("🔍 Extracting tables from PDF...")
 
-        try:
-            tables = read_pdf(
-                pdf_path,
-                pages='all',
-                multiple_tables=True,
-                pandas_options={'header': None},
-                lattice=True
-            )
-        except Exception as e:
-            raise CommandError(f"❌ Tabula extraction failed: {e}")
+        with self.timings.stage('extract'):
+            try:
+                tables = read_tables_for_markers(
+                    pdf_path,
+                    region_markers('srldc'),
+                    engine=engine,
+                    use_cache=use_cache,
+                    pdf_sha256=pdf_sha256,
+                    multiple_tables=True,
+                    pandas_options={'header': None},
+                    lattice=True
+                )
+            except Exception as e:
+                raise CommandError(f"❌ PDF table extraction failed: {e}")
 
         if not tables:
             raise CommandError("❌ No tables found in the PDF.")
@@ -212,248 +109,77 @@ class Command(BaseCommand):
         self.write(self.style.SUCCESS(f"✅ Found {len(tables)} tables."))
         self.logger.info(f"✅ Found {len(tables)} tables.")
 
-        all_content_df = pd.concat(tables, ignore_index=True)
-        all_content_df_cleaned = all_content_df.dropna(axis=0, how='all')
+        with self.timings.stage('parse'):
+            all_content_df_cleaned = combine_tables(tables)
+            marker_index = build_marker_index(all_content_df_cleaned, self.TABLES)
 
         combined_json_data = {}
-
-        # --- Extract Table 2(A) ---
-        sub_2A, headers_2A = self.extract_subtable_by_markers(
-            all_content_df_cleaned,
-            start_marker=r".*2\s*\(A\)State['’]?s\s*Load\s*Deails\s*\(At\s*State\s*Periphery\)\s*in\s*MUs.*",
-            end_marker=r".*2\s*\(B\)\s*State['’]?s\s*Demand\s*Met\s*in\s*MWs\s*and\s*day\s*energy\s*forecast\s*and\s*deviation\s*particulars.*",
-            header_row_count=2,
-            debug_table_name="Table 2(A)"
-        )
-
-        if sub_2A is not None:
-            column_mapping_2A = {
-                'STATE': 'state',
-                'THERMAL': 'thermal',
-                'HYDRO': 'hydro',
-                'GAS/DIESEL/NAPTHA': 'gas_naptha_diesel',
-                'SOLAR': 'solar',
-                'WIND': 'wind',
-                'OTHERS': 'others',
-                'Net SCH (Net Mu)': 'net_sch',
-                'Drawal (Net Mu)': 'drawal',
-                'UI (Net Mu)': 'ui',
-                'Availability (Net MU)': 'availability',
-                'Demand Met (Net MU)': 'demand_met',
-                'Shortage # (Net MU)': 'shortage',
-            }
-            sub_2A_renamed = sub_2A.rename(columns={k: v for k, v in column_mapping_2A.items() if k in sub_2A.columns})
-            self.write(f"Renamed columns: {sub_2A_renamed.columns.tolist()}")
-            self.logger.info(f"Renamed columns: {sub_2A_renamed.columns.tolist()}")
-            self.write(f"Shape after rename: {sub_2A_renamed.shape}")
-            self.logger.info(f"Shape after rename: {sub_2A_renamed.shape}")
-            if 'state' in sub_2A_renamed.columns:
-                normalized_states = [s.strip().upper() for s in self.SOUTH_INDIAN_STATES]
-                sub_2A_filtered = sub_2A_renamed[
-                    sub_2A_renamed['state'].astype(str)
-                                         .str.strip()
-                                         .str.upper()
-                                         .str.replace(r'\s+', ' ', regex=True)
-                                         .str.replace('–', '-', regex=False)
-                                         .isin(normalized_states)
-                ].copy()
-
-                if sub_2A_filtered.empty and not sub_2A_renamed.empty:
-                    self.write(self.style.WARNING("⚠️ Exact state name matching failed for Table 2A. Attempting a more lenient match."), level='warning')
-                    sub_2A_filtered = sub_2A_renamed[
-                        sub_2A_renamed['state'].astype(str)
-                                             .str.strip()
-                                             .str.upper()
-                                             .str.contains('ANDHRA PRADESH|KARNATAKA|KERALA|PONDICHERRY|TAMILNADU|TELANGANA|REGION', case=False, na=False)
-                    ].copy()
-                self.write(f"States found for Table 2A after filtering: {sub_2A_filtered['state'].tolist()}")
-                self.logger.info(f"States found for Table 2A after filtering: {sub_2A_filtered['state'].tolist()}")
-            else:
-                self.write(self.style.WARNING("⚠️ 'state' column not found in Table 2(A) after rename. Skipping row filtering."), level='warning')
-                sub_2A_filtered = sub_2A_renamed.copy()
-
-            model_fields_2A = list(column_mapping_2A.values())
-            sub_2A_final = sub_2A_filtered[[col for col in model_fields_2A if col in sub_2A_filtered.columns]]
-            sub_2A_final = sub_2A_final.dropna(subset=['state']).copy()
-            combined_json_data['srldc_table_2A'] = sub_2A_final.to_dict(orient='records')
-            self.write(self.style.SUCCESS(f"✅ Table 2(A) extracted for combined JSON."))
-
-            for index, row_data in sub_2A_final.iterrows():
-                state_name = self._safe_string(row_data.get('state'))
-                if state_name:
-                    try:
-                        obj, created = Srldc2AData.objects.update_or_create(
-                            report_date=report_date,
-                            state=state_name,
-                            defaults={
-                                'thermal': self._safe_float(row_data.get('thermal')),
-                                'hydro': self._safe_float(row_data.get('hydro')),
-                                'gas_naptha_diesel': self._safe_float(row_data.get('gas_naptha_diesel')),
-                                'solar': self._safe_float(row_data.get('solar')),
-                                'wind': self._safe_float(row_data.get('wind')),
-                                'others': self._safe_float(row_data.get('others')),
-                                # 'total': self._safe_float(row_data.get('total')),
-                                'net_sch': self._safe_float(row_data.get('net_sch')),
-                                'drawal': self._safe_float(row_data.get('drawal')),
-                                'ui': self._safe_float(row_data.get('ui')),
-                                'availability': self._safe_float(row_data.get('availability')),
-                                'demand_met': self._safe_float(row_data.get('demand_met')),
-                                'shortage': self._safe_float(row_data.get('shortage')),
-                            }
-                        )
-                        if created:
-                            self.write(self.style.SUCCESS(f"➕ Created Table 2A entry for {report_date} - {state_name}"))
-                            self.logger.info(f"➕ Created Table 2A entry for {report_date} - {state_name}")
-                        else:
-                            self.write(self.style.SUCCESS(f"🔄 Updated Table 2A entry for {report_date} - {state_name}"))
-                            self.logger.info(f"🔄 Updated Table 2A entry for {report_date} - {state_name}")
-                    except Exception as e:
-                        self.write(self.style.ERROR(f"❌ Error saving Table 2A row to DB (State: {state_name}): {e}"), level='error')
-                        self.logger.error(f"❌ Error saving Table 2A row to DB (State: {state_name}): {e}")
-            self.write(self.style.SUCCESS(f"✅ Table 2(A) data saved to database."))
-            self.logger.info(f"✅ Table 2(A) data saved to database.")
-        else:
-            self.write(self.style.WARNING("⚠️ Table 2(A) not found or extraction failed."), level='warning')
-
-        # --- Extract Table 2(C) ---
-        sub_2C, headers_2C = self.extract_subtable_by_markers(
-            all_content_df_cleaned,
-            start_marker=r"2\s*\(C\)\s*State's\s*Demand\s*Met\s*in\s*MWs.*",
-            end_marker=r"3\s*\(A\)\s*StateEntities\s*Generation:",
-            header_row_count=2,
-            debug_table_name="Table 2(C)"
-        )
-        if sub_2C is not None:
-            self.write("--- RAW DataFrame for Table 2(C) before renaming ---")
-            self.logger.info("--- RAW DataFrame for Table 2(C) before renaming ---")
-            self.write(str(sub_2C))
-            self.logger.info(str(sub_2C))
-            self.write("-----------------------------------------------------")
-            self.logger.info("-----------------------------------------------------")
-
-            # Debug lines still here (optional)
-            self.write("Raw columns in Table 2(C): " + str(sub_2C.columns.tolist()))
-            self.logger.info("Raw columns in Table 2(C): " + str(sub_2C.columns.tolist()))
-            if not sub_2C.empty:
-                self.write("Sample first row data in Table 2(C):")
-                self.logger.info("Sample first row data in Table 2(C):")
-                sample_row = sub_2C.iloc[0].to_dict()
-                for k, v in sample_row.items():
-                    self.write(f"  Column: '{k}' => Value: '{v}'")
-                    self.logger.info(f"  Column: '{k}' => Value: '{v}'")
-            else:
-                self.stdout.write("Table 2(C) extracted DataFrame is empty.")
-
-            # UPDATED mapping here with corrected column mapping
-            column_mapping_2C = {
-                'State': 'state',
-                'Maximum Demand Met of the day': 'max_demand',
-                'Time': 'time',
-                'Shortage during maximum demand': 'shortage_max_demand',
-                'Requirement at maximum demand': 'req_max_demand',
-                'Demand Met at maximum Requirement': 'demand_max_req',
-                'Time.1': 'time_max_req',
-                'Shortage during maximum requirement': 'shortage_max_req',
-                'Maximum requirement of the day': 'max_req_day',
-                'Min Demand Met': 'ace_min',      # Corrected mapping
-                'Time.2': 'time_ace_min',         # Corrected mapping
-                'ACE_MAX': 'ace_max',
-                'Time.3': 'time_ace_max',
-                # Removed ACE_MIN and Time.4 from mapping, do not exist in extracted data
-            }
-            sub_2C_renamed = sub_2C.rename(columns={k: v for k, v in column_mapping_2C.items() if k in sub_2C.columns})
-            self.stdout.write(f"Columns present in Table 2C after renaming: {sub_2C_renamed.columns.tolist()}")
-            self.logger.info(f"Columns present in Table 2C after renaming: {sub_2C_renamed.columns.tolist()}")
-            if 'state' in sub_2C_renamed.columns:
-                normalized_states_2C = [s.strip().upper() for s in self.SOUTH_INDIAN_STATES_2C]
-                sub_2C_filtered = sub_2C_renamed[
-                    sub_2C_renamed['state'].astype(str)
-                                         .str.strip()
-                                         .str.upper()
-                                         .str.replace(r'\s+', ' ', regex=True)
-                                         .str.replace('–', '-', regex=False)
-                                         .isin(normalized_states_2C)
-                ].copy()
-
-                if sub_2C_filtered.empty and not sub_2C_renamed.empty:
-                    self.stdout.write(self.style.WARNING("⚠️ Exact state name matching failed for Table 2C. Attempting a more lenient match."))
-                    sub_2C_filtered = sub_2C_renamed[
-                        sub_2C_renamed['state'].astype(str)
-                                             .str.strip()
-                                             .str.upper()
-                                             .str.contains('AP|KAR|KER|PONDY|TN|TG|REGION', case=False, na=False)
-                    ].copy()
-                self.stdout.write(f"States found for Table 2C after filtering: {sub_2C_filtered['state'].tolist()}")
-                self.logger.info(f"States found for Table 2C after filtering: {sub_2C_filtered['state'].tolist()}")
+        save_errors = []
+        saved_tables = 0
+
+        for spec in self.TABLES:
+            with self.timings.stage('parse'):
+                sub_df = extract_table(all_content_df_cleaned, spec, marker_index)
+            if sub_df is None:
+                self.write(self.style.WARNING(f"⚠️ Start marker '{spec.start_marker}' not found for {spec.label}."), level='warning')
+                self.write(self.style.WARNING(f"⚠️ {spec.label} not found or extraction failed."), level='warning')
+                continue
+
+            self.write(f"Raw columns in {spec.label}: {sub_df.columns.tolist()}")
+            self.write(f"Shape of {spec.label}: {sub_df.shape}")
+
+            with self.timings.stage('parse'):
+                rows, lenient = prepare_rows(sub_df, spec)
+            if lenient:
+                self.write(self.style.WARNING(f"⚠️ Exact state name matching failed for Table {spec.name}. Attempting a more lenient match."), level='warning')
+            if 'state' not in rows.columns:
+                self.write(self.style.WARNING(f"⚠️ 'state' column not found in {spec.label} after rename. Skipping row filtering."), level='warning')
             else:
-                self.stdout.write(self.style.WARNING("⚠️ 'state' column not found in Table 2(C) after rename. Skipping row filtering."))
-                sub_2C_filtered = sub_2C_renamed.copy()
-
-            model_fields_2C = list(column_mapping_2C.values())
-            sub_2C_final = sub_2C_filtered[[col for col in model_fields_2C if col in sub_2C_filtered.columns]]
-            sub_2C_final = sub_2C_final.dropna(subset=['state']).copy()
-
-            combined_json_data['srldc_table_2C'] = sub_2C_final.to_dict(orient='records')
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(C) extracted for combined JSON."))
-
-            for index, row_data in sub_2C_final.iterrows():
-                state_name = self._safe_string(row_data.get('state'))
-                if state_name:
-                    try:
-                        ace_min_val = None
-                        time_ace_min_val = None
-
-                        if 'ace_min' in sub_2C_final.columns:
-                            ace_min_val = self._safe_float(row_data.get('ace_min'))
-
-                        if 'time_ace_min' in sub_2C_final.columns:
-                            time_ace_min_val = self._safe_string(row_data.get('time_ace_min'))
-
-                        obj, created = Srldc2CData.objects.update_or_create(
-                            report_date=report_date,
-                            state=state_name,
-                            defaults={
-                                'max_demand': self._safe_float(row_data.get('max_demand')),
-                                'time': self._safe_string(row_data.get('time')),
-                                'shortage_max_demand': self._safe_float(row_data.get('shortage_max_demand')),
-                                'req_max_demand': self._safe_float(row_data.get('req_max_demand')),
-                                'demand_max_req': self._safe_float(row_data.get('demand_max_req')),
-                                'max_req_day': self._safe_float(row_data.get('max_req_day')),
-                                'time_max_req': self._safe_string(row_data.get('time_max_requirement')),
-                                'shortage_max_req': self._safe_float(row_data.get('shortage_max_req')),
-                                'ace_max': self._safe_float(row_data.get('ace_max')),
-                                'time_ace_max': self._safe_string(row_data.get('time_ace_max')),
-                                'ace_min': ace_min_val,
-                                'time_ace_min': time_ace_min_val,
-                            }
-                        )
-                        if created:
-                            self.stdout.write(self.style.SUCCESS(f"➕ Created Table 2C entry for {report_date} - {state_name}"))
-                            self.logger.info(f"➕ Created Table 2C entry for {report_date} - {state_name}")
-                        else:
-                            self.stdout.write(self.style.SUCCESS(f"🔄 Updated Table 2C entry for {report_date} - {state_name}"))
-                            self.logger.info(f"🔄 Updated Table 2C entry for {report_date} - {state_name}")
-                    except Exception as e:
-                        self.stdout.write(self.style.ERROR(f"❌ Error saving Table 2C row to DB (State: {state_name}): {e}"))
-                        self.logger.error(f"❌ Error saving Table 2C row to DB (State: {state_name}): {e}")
-            
-            # ------- Print ace_min and time_ace_min for all states as aligned table -------
-            self.stdout.write(self.style.HTTP_INFO("\n--- ACE MIN and Time for Each State (Table 2C) ---"))
-            self.stdout.write(f"{'STATE':<12} | {'ACE MIN':>10} | {'TIME':>8}")
-            self.stdout.write("-" * 36)
-            for index, row_data in sub_2C_final.iterrows():
-                state_name = self._safe_string(row_data.get('state')) or '-'
-                ace_min_val = self._safe_float(row_data.get('ace_min')) if 'ace_min' in sub_2C_final.columns else None
-                time_ace_min_val = self._safe_string(row_data.get('time_ace_min')) if 'time_ace_min' in sub_2C_final.columns else None
-                ace_min_str = f"{ace_min_val:.2f}" if ace_min_val is not None else "-"
-                time_str = time_ace_min_val or "-"
-                self.stdout.write(f"{state_name:<12} | {ace_min_str:>10} | {time_str:>8}")
-            # -------------------------------------------------------------------
-
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(C) data saved to database."))
-            self.logger.info(f"✅ Table 2(C) data saved to database.")
-        else:
-            self.stdout.write(self.style.WARNING("⚠️ Table 2(C) not found or extraction failed."))
+                self.write(f"States found for Table {spec.name} after filtering: {rows['state'].tolist()}")
+
+            with self.timings.stage('parse'):
+                records = rows.to_dict(orient='records')
+            combined_json_data[spec.json_key] = records
+            self.write(self.style.SUCCESS(f"✅ {spec.label} extracted for combined JSON."))
+
+            with self.timings.stage('db_write'):
+                db_rows = [
+                    dict(model_defaults(row_data, spec, self._safe_float, self._safe_string),
+                         report_date=report_date, state=self._safe_string(row_data.get('state')))
+                    for row_data in records
+                ]
+                add_parsed_times(db_rows, spec.time_fields)
+                saved = False
+                try:
+                    result = upsert_with_facts(
+                        self.MODELS[spec.name], db_rows, region_facts(spec, db_rows), spec.metrics.values(),
+                        [(spec.region, report_date)],
+                    )
+                    if result.inserted or result.updated:
+                        record_availability('srldc_project', report_date)
+                    self.write(self.style.SUCCESS(f"💾 Table {spec.name}: {result.inserted} created, {result.updated} updated for {report_date}"))
+                    saved = True
+                    saved_tables += 1
+                except Exception as e:
+                    self.write(self.style.ERROR(f"❌ Error saving Table {spec.name} to DB: {e}"), level='error')
+                    save_errors.append(f"Table {spec.name}: {e}")
+
+            if spec.name == '2C':
+                # ------- Print ace_min and time_ace_min for all states as aligned table -------
+                self.stdout.write(self.style.HTTP_INFO("\n--- ACE MIN and Time for Each State (Table 2C) ---"))
+                self.stdout.write(f"{'STATE':<12} | {'ACE MIN':>10} | {'TIME':>8}")
+                self.stdout.write("-" * 36)
+                for row_data in records:
+                    state_name = self._safe_string(row_data.get('state')) or '-'
+                    ace_min_val = self._safe_float(row_data.get('ace_min'))
+                    time_ace_min_val = self._safe_string(row_data.get('time_ace_min'))
+                    ace_min_str = f"{ace_min_val:.2f}" if ace_min_val is not None else "-"
+                    time_str = time_ace_min_val or "-"
+                    self.stdout.write(f"{state_name:<12} | {ace_min_str:>10} | {time_str:>8}")
+                # -------------------------------------------------------------------
+
+            if saved:
+                self.write(self.style.SUCCESS(f"✅ {spec.label} data saved to database."))
 
         if combined_json_data:
             # Try to derive JSON filename from folder name (to match PDF naming derived from folder)
@@ -471,15 +197,19 @@ class Command(BaseCommand):
                 except Exception:
                     json_date_str = datetime.datetime.now().strftime('%d%m%Y')
 
-            combined_json_path = os.path.join(output_dir, f'srldc_{json_date_str}.json')
-            with open(combined_json_path, 'w', encoding='utf-8') as f:
-                json.dump(combined_json_data, f, indent=4, ensure_ascii=False)
+            with self.timings.stage('json_write'):
+                combined_json_path = os.path.join(output_dir, f'srldc_{json_date_str}.json')
+                with open(combined_json_path, 'w', encoding='utf-8') as f:
+                    json.dump(combined_json_data, f, indent=4, ensure_ascii=False)
             self.stdout.write(self.style.SUCCESS(f"✅ Combined tables saved to: {combined_json_path}"))
             self.logger.info(f"✅ Combined tables saved to: {combined_json_path}")
         else:
             self.stdout.write(self.style.WARNING("⚠️ No tables were successfully extracted to create a combined JSON file."))
             self.logger.warning("⚠️ No tables were successfully extracted to create a combined JSON file.")
 
+        if save_errors:
+            raise TablesNotSaved(save_errors, saved=saved_tables)
+
     def download_latest_srldc_pdf(self, base_url="https://www.srldc.in/var/ftp/reports/psp/", base_download_dir="downloads", given_date=None):
         project_name = "SRLDC"  # Add project name here
 
@@ -551,11 +281,12 @@ class Command(BaseCommand):
         self.logger.info(f"🌐 Attempting to download from: {full_url}")
 
         try:
-            response = requests.get(full_url, stream=True)
-            response.raise_for_status()
-            with open(local_file_path, 'wb') as pdf_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    pdf_file.write(chunk)
+            with self.timings.stage('download'):
+                download = http_cache.download(full_url, local_file_path)
+            self.pdf_sha256 = download.sha256
+            if download.from_cache:
+                self.stdout.write(self.style.NOTICE(f"♻️ {full_url} not modified since last download; reused cached copy."))
+            self.stdout.write(f"📦 {http_cache.stats_line()}")
             self.stdout.write(self.style.SUCCESS(f"✅ Successfully downloaded: {local_pdf_filename} to {report_dir}"))
             self.logger.info(f"✅ Successfully downloaded: {local_pdf_filename} to {report_dir}")
             pdf_path = local_file_path
@@ -579,8 +310,9 @@ class Command(BaseCommand):
         self.logger.error("❌ Failed to download the latest PSP report after trying all attempts.")
         return None, None, None
 
+    @recorded_run('srldc_project')
     def handle(self, *args, **options):
-        if "JAVA_HOME" not in os.environ:
+        if resolve_engine(options.get('engine')) == 'tabula' and "JAVA_HOME" not in os.environ:
             self.stdout.write(self.style.WARNING("JAVA_HOME environment variable not set. tabula-py may fail."))
             self.logger.warning("JAVA_HOME environment variable not set. tabula-py may fail.")
 
@@ -591,9 +323,14 @@ class Command(BaseCommand):
         if pdf_path is None:
             self.stdout.write(self.style.WARNING("No PDF report was successfully downloaded or found locally. Exiting."))
             self.logger.warning("No PDF report was successfully downloaded or found locally. Exiting.")
+            self.pipeline_run.status = PipelineRun.Status.SKIPPED
             return
+        self.pipeline_run.target_date = report_date
 
         # Pass the report_date returned by the downloader into extract_tables_from_pdf
-        self.extract_tables_from_pdf(pdf_path, report_output_dir, report_date)
+        self.extract_tables_from_pdf(
+            pdf_path, report_output_dir, report_date,
+            engine=options.get('engine'), use_cache=not options.get('no_cache'), pdf_sha256=self.pdf_sha256
+        )
         self.stdout.write(self.style.SUCCESS(f"Finished processing. Files saved in: {report_output_dir}"))
         self.logger.info(f"Finished processing. Files saved in: {report_output_dir}")
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srldc_app', '0003_remove_srldc2adata_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='srldc2cdata',
+            name='time_ace_max_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='srldc2cdata',
+            name='time_ace_min_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='srldc2cdata',
+            name='time_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='srldc2cdata',
+            name='time_max_req_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='srldc2cdata',
+            index=models.Index(fields=['time_at'], name='srldc2c_time_at_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srldc_app', '0007_report_date_brin_2c'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='srldc2adata',
+            name='srldc2a_report_date_brin',
+        ),
+        migrations.RemoveIndex(
+            model_name='srldc2cdata',
+            name='srldc2c_report_date_brin',
+        ),
+    ]
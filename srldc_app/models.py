@@ -49,6 +49,12 @@ class Srldc2CData(models.Model):
     ace_min = models.FloatField(null=True, blank=True)
     time_ace_min = models.CharField(max_length=50, null=True, blank=True)
 
+    # Parsed times of day of the text time columns (NULL when the text is not a time)
+    time_at = models.TimeField(null=True, blank=True)
+    time_max_req_at = models.TimeField(null=True, blank=True)
+    time_ace_max_at = models.TimeField(null=True, blank=True)
+    time_ace_min_at = models.TimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -57,4 +63,5 @@ class Srldc2CData(models.Model):
     class Meta:
         verbose_name = "Table 2C Data"
         verbose_name_plural = "Table 2C Data"
-        unique_together = ('report_date', 'state')
\ No newline at end of file
+        unique_together = ('report_date', 'state')
+        indexes = [models.Index(fields=['time_at'], name='srldc2c_time_at_idx')]
\ No newline at end of file
@@ -1,7 +1,16 @@
 import requests
 import datetime
 import os
-from tabula.io import read_pdf
+from pipeline import http_cache
+from pipeline.extraction import add_extraction_arguments, read_tables_for_markers, resolve_engine
+from pipeline.facts import region_facts, upsert_with_facts
+from pipeline.ingest import add_parsed_times, split_numeric_fields
+from pipeline.models import PipelineRun
+from pipeline.runs import TablesNotSaved, recorded_run
+from pipeline.table_parser import build_marker_index, combine_tables, extract_table, prepare_rows
+from pipeline.table_specs import TABLE_SPECS, region_markers
+from pipeline.timing import StageTimer
+from report_dashboard.status import record_availability
 import pandas as pd
 import json
 import logging
@@ -16,16 +25,16 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 class Command(BaseCommand):
     help = 'Download the new report and extract tables 2(A) and 2(C) to a single JSON file and save to DB'
 
-    # List of expected state names for validation
-    NEW_STATES = [
-        "BALCO", "CHHATTISGARH", "DNHDDPDCL", "AMNSIL", "GOA", "GUJARAT",
-        "MADHYA PRADESH", "MAHARASHTRA", "RIL JAMNAGAR", "REGION", "WR"
-    ]
-    # For Table 2C, states might be abbreviated or slightly different
-    NEW_STATES_2C = [
-        "BALCO", "CHHATTISGARH", "DNHDDPDCL", "AMNSIL", "GOA", "GUJARAT",
-        "MADHYA PRADESH", "MAHARASHTRA", "RIL JAMNAGAR", "WR"
-    ]
+    # Tables 2(A) and 2(C) as declared in pipeline/table_specs.py, and the model each one is saved to
+    TABLES = TABLE_SPECS['wrldc']
+    MODELS = {'2A': Wrldc2AData, '2C': Wrldc2CData}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = StageTimer()
+        # SHA-256 of the downloaded PDF, computed while streaming; reused as the table cache key
+        self.pdf_sha256 = None
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--date',
@@ -33,6 +42,7 @@ class Command(BaseCommand):
             help='Date for which to run the report, format: DD-MM-YYYY',
             required=False
         )
+        add_extraction_arguments(parser)
     def _safe_value(self, value, is_numeric=False):
         """
         Keeps dash '-' as-is, returns None for real empty values,
@@ -83,271 +93,97 @@ class Command(BaseCommand):
         return df_cleaned
 
 
-    def extract_subtable_by_markers(self, df, start_marker, end_marker=None, header_row_count=0, debug_table_name="Unknown Table"):
-        """
-        Extracts a sub-table from a DataFrame based on start and optional end markers.
-        This function is now simpler and just finds the raw data frame section.
-        """
-        start_idx = None
-        end_idx = None
-
-        for i, row in df.iterrows():
-            row_str_series = row.astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-            if row_str_series.str.contains(start_marker, regex=True, na=False, case=False).any():
-                start_idx = i
-                break
-
-        if start_idx is None:
-            self.stdout.write(self.style.WARNING(f"⚠️ Start marker '{start_marker}' not found for {debug_table_name}."))
-            return pd.DataFrame(), None
-
-        # Start from the row immediately after the header rows
-        data_start_idx = start_idx + header_row_count
-        if data_start_idx >= len(df):
-            self.stdout.write(self.style.WARNING(f"⚠️ Data start index is out of bounds for {debug_table_name}. Returning empty DataFrame."))
-            return pd.DataFrame(), None
-
-        if end_marker:
-            for i in range(data_start_idx, len(df)):
-                row_str_series = df.iloc[i].astype(str).str.strip().str.replace(r'\s+', ' ', regex=True)
-                if row_str_series.str.contains(end_marker, regex=True, na=False, case=False).any():
-                    end_idx = i
-                    break
-
-        if end_idx is not None:
-            raw_sub_df = df.iloc[data_start_idx:end_idx].copy().reset_index(drop=True)
-        else:
-            raw_sub_df = df.iloc[data_start_idx:].copy().reset_index(drop=True)
-
-        # Drop empty columns and rows
-        raw_sub_df = raw_sub_df.dropna(axis=0, how='all').dropna(axis=1, how='all')
-        # Reset index after dropping rows
-        return raw_sub_df.reset_index(drop=True), None
-
-    def extract_tables_from_pdf(self, pdf_path, output_dir, report_date):
+    def extract_tables_from_pdf(self, pdf_path, output_dir, report_date, engine=None, use_cache=True, pdf_sha256=None):
         self.stdout.write("🔍 Extracting tables from PDF...")
 
-        try:
-            tables = read_pdf(
-                pdf_path,
-                pages='all',
-                multiple_tables=True,
-                pandas_options={'header': None},
-                lattice=True
-            )
-        except Exception as e:
-            raise CommandError(f"❌ Tabula extraction failed: {e}")
+        with self.timings.stage('extract'):
+            try:
+                tables = read_tables_for_markers(
+                    pdf_path,
+                    region_markers('wrldc'),
+                    engine=engine,
+                    use_cache=use_cache,
+                    pdf_sha256=pdf_sha256,
+                    multiple_tables=True,
+                    pandas_options={'header': None},
+                    lattice=True
+                )
+            except Exception as e:
+                raise CommandError(f"❌ PDF table extraction failed: {e}")
 
         if not tables:
             raise CommandError("❌ No tables found in the PDF.")
 
         self.stdout.write(self.style.SUCCESS(f"✅ Found {len(tables)} potential tables. Starting table extraction..."))
 
-        all_content_df = pd.concat(tables, ignore_index=True)
-        all_content_df_cleaned = all_content_df.dropna(axis=0, how='all')
-        
-        combined_json_data = {}
-
-        # --- Extract Table 2(A) using the robust subtable function and new marker ---
-        # Using a flexible regex that looks for the table number and key English phrases
-        start_marker_2A = r"2\(A\)\s*.*LOAD DETAILS.*IN MU"
-        # The end marker should be for table 2B, looking for "Demand Met in MW"
-        end_marker_2A = r"2\(B\).*Demand Met in MW"
-        
-        expected_cols_2A = [
-            'State', 'Thermal', 'Hydro', 'Gas', 'Wind', 'Solar', 'Others',
-            'Total', 'Net SCH', 'Drawal', 'UI', 'Availability', 'Requirement', 'Shortage', 'Consumption'
-        ]
-
-        sub_2A_raw, _ = self.extract_subtable_by_markers(
-            all_content_df_cleaned,
-            start_marker=start_marker_2A,
-            end_marker=end_marker_2A,
-            header_row_count=2, # Header is typically 2 rows
-            debug_table_name="Table 2(A)"
-        )
-
-
-        if not sub_2A_raw.empty:
-            self.stdout.write(self.style.NOTICE("\n--- RAW DataFrame for Table 2(A) (before processing) ---"))
-            self.stdout.write(str(sub_2A_raw))
-            self.stdout.write(self.style.NOTICE("---------------------------------------------------------"))
+        with self.timings.stage('parse'):
+            all_content_df_cleaned = combine_tables(tables)
+            marker_index = build_marker_index(all_content_df_cleaned, self.TABLES)
 
-
-            if len(sub_2A_raw.columns) >= len(expected_cols_2A):
-                sub_2A_data = sub_2A_raw.iloc[:, :len(expected_cols_2A)].copy()
-                sub_2A_data.columns = expected_cols_2A
-            else:
-                self.stdout.write(self.style.WARNING(f"⚠️ Column count mismatch for Table 2A. Expected {len(expected_cols_2A)}, got {len(sub_2A_raw.columns)}. This might cause data misalignment."))
-                sub_2A_data = sub_2A_raw.copy()
-            
-            # --- START DEDICATED DATA CLEANING STEP FOR TABLE 2A ---
-            numeric_cols_2A = [
-                'Thermal', 'Hydro', 'Gas', 'Wind', 'Solar', 'Others',
-                'Total', 'Net SCH', 'Drawal', 'UI', 'Availability', 'Requirement',
-                'Shortage', 'Consumption'
-            ]
-            string_cols_2A = ['State']
-            
-            sub_2A_cleaned = self._cleanup_dataframe(sub_2A_data, numeric_cols_2A, string_cols_2A)
-            # --- END DEDICATED DATA CLEANING STEP ---
-            
-            self.stdout.write(self.style.SUCCESS("\n--- Cleaned and filtered data for Table 2(A) ---"))
-            self.stdout.write(str(sub_2A_cleaned))
-            self.stdout.write(self.style.SUCCESS("------------------------------------------------------"))
-
-
-            column_mapping_2A = {
-                'State': 'state', 'Thermal': 'thermal', 'Hydro': 'hydro',
-                'Gas': 'gas', 'Wind': 'wind', 'Solar': 'solar', 'Others': 'others',
-                'Total': 'total', 'Net SCH': 'net_sch', 'Drawal': 'drawal',
-                'UI': 'ui', 'Availability': 'availability', 'Requirement': 'requirement',
-                'Shortage': 'shortage', 'Consumption': 'consumption'
-            }
-
-
-            sub_2A_renamed = sub_2A_cleaned.rename(columns=column_mapping_2A)
-            normalized_states = [s.strip().upper() for s in self.NEW_STATES]
-            sub_2A_filtered = sub_2A_renamed[
-                sub_2A_renamed['state'].astype(str).str.strip().str.upper().isin(normalized_states)
-            ].copy()
-            
-            sub_2A_final = sub_2A_filtered.dropna(subset=['state']).copy()
-            self.stdout.write(f"States found for Table 2A after filtering: {sub_2A_final['state'].tolist()}")
-
-
-            combined_json_data['wrldc_table_2A'] = sub_2A_final.to_dict(orient='records')
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(A) extracted for combined JSON."))
-
-
-            for index, row_data in sub_2A_final.iterrows():
-                try:
-                    Wrldc2AData.objects.update_or_create(
-                        report_date=report_date,
-                        state=row_data['state'],
-                        defaults={
-                            'thermal': row_data.get('thermal'),
-                            'hydro': row_data.get('hydro'),
-                            'gas': row_data.get('gas'),
-                            'solar': row_data.get('solar'),
-                            'wind': row_data.get('wind'),
-                            'others': row_data.get('others'),
-                            'total': row_data.get('total'),
-                            'net_sch': row_data.get('net_sch'),
-                            'drawal': row_data.get('drawal'),
-                            'ui': row_data.get('ui'),
-                            'availability': row_data.get('availability'),
-                            'requirement': row_data.get('requirement'),
-                            'shortage': row_data.get('shortage'),
-                            'consumption': row_data.get('consumption'),
-                        }
-                    )
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"❌ Error saving Table 2A row to DB (State: {row_data.get('state')}): {e}"))
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(A) data saved to database."))
-        else:
-            self.stdout.write(self.style.WARNING("⚠️ Table 2(A) not found or extraction failed."))
-
-
-        # --- Extract Table 2(C) with a more robust, manual column assignment approach ---
-        sub_2C_raw, _ = self.extract_subtable_by_markers(
-            all_content_df_cleaned,
-            start_marker=r"2\(C\)\s*/\s*State's Demand Met in MW.*",
-            end_marker=r"3\(A\)\s*StateEntities\s*Generation:",
-            header_row_count=2,
-            debug_table_name="Table 2(C)"
-        )
-
-
-        if not sub_2C_raw.empty:
-            self.stdout.write(self.style.NOTICE("\n--- RAW DataFrame for Table 2(C) (before processing) ---"))
-            self.stdout.write(str(sub_2C_raw))
+        combined_json_data = {}
+        save_errors = []
+        saved_tables = 0
+
+        for spec in self.TABLES:
+            with self.timings.stage('parse'):
+                sub_df = extract_table(all_content_df_cleaned, spec, marker_index)
+            if sub_df is None:
+                self.stdout.write(self.style.WARNING(f"⚠️ Start marker '{spec.start_marker}' not found for {spec.label}."))
+            if sub_df is None or sub_df.empty:
+                self.stdout.write(self.style.WARNING(f"⚠️ {spec.label} not found or extraction failed."))
+                continue
+
+            self.stdout.write(self.style.NOTICE(f"\n--- RAW DataFrame for {spec.label} (before processing) ---"))
+            self.stdout.write(str(sub_df))
             self.stdout.write(self.style.NOTICE("---------------------------------------------------------"))
 
+            if sub_df.shape[1] < len(spec.columns):
+                self.stdout.write(self.style.WARNING(f"⚠️ Column count mismatch for Table {spec.name}. Expected {len(spec.columns)}, got {sub_df.shape[1]}. This might cause data misalignment."))
 
-            manual_columns = [
-                'state',
-                'max_demand_day',
-                'time',
-                'shortage_max_demand',
-                'req_max_demand',
-                'ace_max',
-                'time_ace_max',
-                'ace_min',
-                'time_ace_min'
-            ]
-
-
-            if len(sub_2C_raw.columns) >= len(manual_columns):
-                sub_2C_data = sub_2C_raw.iloc[:, :len(manual_columns)].copy()
-            else:
-                sub_2C_data = sub_2C_raw.copy()
-
-
-            if len(sub_2C_data.columns) != len(manual_columns):
-                self.stdout.write(self.style.WARNING(f"⚠️ Column count mismatch for Table 2C. Expected {len(manual_columns)}, got {len(sub_2C_data.columns)}. This might cause data misalignment."))
-
-
-            sub_2C_data.columns = manual_columns[:len(sub_2C_data.columns)]
-
-
-            # --- START DEDICATED DATA CLEANING STEP FOR TABLE 2C ---
-            numeric_cols_2C = [
-                'max_demand_day', 'shortage_max_demand',
-                'req_max_demand', 'ace_max', 'ace_min'
-            ]
-            string_cols_2C = ['state', 'time', 'time_ace_max', 'time_ace_min']
-            
-            sub_2C_data_cleaned = self._cleanup_dataframe(sub_2C_data, numeric_cols_2C, string_cols_2C)
-            # --- END DEDICATED DATA CLEANING STEP ---
-
+            with self.timings.stage('parse'):
+                rows, _ = prepare_rows(sub_df, spec)
+                # --- DEDICATED DATA CLEANING STEP ---
+                rows = self._cleanup_dataframe(rows, spec.numeric_fields, spec.string_fields)
+                rows = rows.dropna(subset=['state']).copy()
+                if spec.name == '2C':
+                    rows['state'] = rows['state'].str.strip().str.replace('\r', ' ', regex=False).str.upper()
+                    rows = rows.sort_values(by='state').reset_index(drop=True)
 
-            # Print the cleaned data before saving
-            self.stdout.write(self.style.SUCCESS("\n--- Cleaned and filtered data for Table 2(C) ---"))
-            self.stdout.write(str(sub_2C_data_cleaned))
+            self.stdout.write(self.style.SUCCESS(f"\n--- Cleaned and filtered data for {spec.label} ---"))
+            self.stdout.write(str(rows))
             self.stdout.write(self.style.SUCCESS("------------------------------------------------------"))
-
-
-            normalized_states_2C = [s.strip().upper() for s in self.NEW_STATES_2C]
-            sub_2C_filtered = sub_2C_data_cleaned[
-                sub_2C_data_cleaned['state'].astype(str).str.strip().str.upper().isin(normalized_states_2C)
-            ].copy()
-
-
-            # Final check to drop any rows that ended up with a None state after cleaning
-            sub_2C_final = sub_2C_filtered.dropna(subset=['state']).copy()
-            sub_2C_final['state'] = sub_2C_final['state'].str.strip().str.replace('\r', ' ', regex=False).str.upper()
-            sub_2C_final = sub_2C_final.sort_values(by='state').reset_index(drop=True)
-
-
-            self.stdout.write(f"States found for Table 2C after filtering: {sub_2C_final['state'].tolist()}")
-
-
-            combined_json_data['wrldc_table_2C'] = sub_2C_final.to_dict(orient='records')
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(C) extracted for combined JSON."))
-
-
-            for index, row_data in sub_2C_final.iterrows():
+            self.stdout.write(f"States found for Table {spec.name} after filtering: {rows['state'].tolist()}")
+
+            with self.timings.stage('parse'):
+                records = rows.to_dict(orient='records')
+            combined_json_data[spec.json_key] = records
+            self.stdout.write(self.style.SUCCESS(f"✅ {spec.label} extracted for combined JSON."))
+
+            with self.timings.stage('db_write'):
+                # Numbers go to the float columns; markers such as '-' are kept in raw_markers
+                db_rows = [
+                    split_numeric_fields(
+                        dict({field: row_data.get(field) for field in spec.fields}, report_date=report_date),
+                        spec.numeric_fields,
+                    )
+                    for row_data in records
+                ]
+                add_parsed_times(db_rows, spec.time_fields)
                 try:
-                    Wrldc2CData.objects.update_or_create(
-                        report_date=report_date, state=row_data['state'],
-                        defaults={
-                            'max_demand_day': row_data.get('max_demand_day'),
-                            'time': row_data.get('time'),
-                            'shortage_max_demand': row_data.get('shortage_max_demand'),
-                            'req_max_demand': row_data.get('req_max_demand'),
-                            'ace_max': row_data.get('ace_max'),
-                            'time_ace_max': row_data.get('time_ace_max'),
-                            'ace_min': row_data.get('ace_min'),
-                            'time_ace_min': row_data.get('time_ace_min'),
-                        }
+                    result = upsert_with_facts(
+                        self.MODELS[spec.name], db_rows, region_facts(spec, db_rows), spec.metrics.values(),
+                        [(spec.region, report_date)],
                     )
+                    if result.inserted or result.updated:
+                        record_availability('wrldc_project', report_date)
                 except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"❌ Error saving Table 2C row to DB (State: {row_data.get('state')}): {e}"))
-            self.stdout.write(self.style.SUCCESS(f"✅ Table 2(C) data saved to database."))
-        else:
-            self.stdout.write(self.style.WARNING("⚠️ Table 2(C) not found or extraction failed."))
-
+                    self.stdout.write(self.style.ERROR(f"❌ Error saving Table {spec.name} to DB: {e}"))
+                    save_errors.append(f"Table {spec.name}: {e}")
+                    continue
+                saved_tables += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {spec.label} data saved to database: {result.inserted} created, {result.updated} updated."
+            ))
 
         if combined_json_data:
             # Save JSON file with report_date in DDMMYYYY format (pattern requested: wrldc_DDMMYYYY.json)
@@ -365,13 +201,17 @@ class Command(BaseCommand):
                 except Exception:
                     json_date_str = datetime.datetime.now().strftime('%d%m%Y')
 
-            combined_json_path = os.path.join(output_dir, f'wrldc_{json_date_str}.json')
-            with open(combined_json_path, 'w', encoding='utf-8') as f:
-                json.dump(combined_json_data, f, indent=4, ensure_ascii=False)
+            with self.timings.stage('json_write'):
+                combined_json_path = os.path.join(output_dir, f'wrldc_{json_date_str}.json')
+                with open(combined_json_path, 'w', encoding='utf-8') as f:
+                    json.dump(combined_json_data, f, indent=4, ensure_ascii=False)
             self.stdout.write(self.style.SUCCESS(f"✅ Combined tables saved to: {combined_json_path}"))
         else:
             self.stdout.write(self.style.WARNING("⚠️ No tables were successfully extracted to create a combined JSON file."))
 
+        if save_errors:
+            raise TablesNotSaved(save_errors, saved=saved_tables)
+
     def download_latest_pdf(self, new_base_url, base_download_dir="downloads",given_date = None):
         project_name = "WRLDC"
         base_download_dir = os.path.join(base_download_dir, project_name)
@@ -453,11 +293,12 @@ class Command(BaseCommand):
             # ensure the directory exists right before writing (handles case where it was removed on prior 404)
             os.makedirs(report_dir, exist_ok=True)
 
-            response = requests.get(full_url, stream=True, timeout=30)
-            response.raise_for_status()
-            with open(local_file_path, 'wb') as pdf_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    pdf_file.write(chunk)
+            with self.timings.stage('download'):
+                download = http_cache.download(full_url, local_file_path)
+            self.pdf_sha256 = download.sha256
+            if download.from_cache:
+                self.stdout.write(self.style.NOTICE(f"♻️ {full_url} not modified since last download; reused cached copy."))
+            self.stdout.write(f"📦 {http_cache.stats_line()}")
             self.stdout.write(self.style.SUCCESS(f"✅ Successfully downloaded: {forced_local_pdf_filename} to {report_dir}"))
             logging.info(f"Successfully downloaded: {local_file_path} to {report_dir}")
             pdf_path = local_file_path
@@ -499,8 +340,9 @@ class Command(BaseCommand):
         logging.error("Failed to download the latest report after trying all attempts.")
         return None, None, None
     
+    @recorded_run('wrldc_project')
     def handle(self, *args, **options):
-        if "JAVA_HOME" not in os.environ:
+        if resolve_engine(options.get('engine')) == 'tabula' and "JAVA_HOME" not in os.environ:
             self.stdout.write(self.style.WARNING("JAVA_HOME environment variable not set. tabula-py may fail."))
 
         new_url = "https://reporting.wrldc.in:8081/PSP/"
@@ -509,12 +351,18 @@ class Command(BaseCommand):
         pdf_path, report_content_date, report_output_dir = self.download_latest_pdf(new_url, given_date=options.get('date'))
 
         if pdf_path is None:
-            ...
+            self.stdout.write(self.style.WARNING("No PDF report was successfully downloaded or found locally. Exiting."))
+            self.pipeline_run.status = PipelineRun.Status.SKIPPED
+            return
         # Use the actual date returned by downloader (date of the PDF we downloaded)
         report_date = report_content_date
+        self.pipeline_run.target_date = report_date
 
 
         # Pass the new date to extraction/saving routine
-        self.extract_tables_from_pdf(pdf_path, report_output_dir, report_date)
+        self.extract_tables_from_pdf(
+            pdf_path, report_output_dir, report_date,
+            engine=options.get('engine'), use_cache=not options.get('no_cache'), pdf_sha256=self.pdf_sha256
+        )
         
         self.stdout.write(self.style.SUCCESS(f"Finished processing. Files saved in: {report_output_dir}"))
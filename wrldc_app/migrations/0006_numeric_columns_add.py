@@ -0,0 +1,114 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Step 1 of 3: add float columns next to the text ones (see 0007_numeric_columns_backfill)."""
+
+    dependencies = [
+        ('wrldc_app', '0005_rename_requirement_at_max_demand_wrldc2cdata_req_max_demand_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='raw_markers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='thermal_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='hydro_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='gas_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='solar_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='wind_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='others_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='total_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='net_sch_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='drawal_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='ui_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='availability_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='consumption_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='shortage_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2adata',
+            name='requirement_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='raw_markers',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='shortage_max_demand_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='req_max_demand_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='ace_max_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='ace_min_num',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
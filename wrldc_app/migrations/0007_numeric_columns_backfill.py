@@ -0,0 +1,93 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+import math
+
+from django.db import migrations, transaction
+
+# Text columns converted to floats, per model
+NUMERIC_FIELDS = {
+    'Wrldc2AData': ['thermal', 'hydro', 'gas', 'solar', 'wind', 'others', 'total', 'net_sch', 'drawal', 'ui', 'availability', 'consumption', 'shortage', 'requirement'],
+    'Wrldc2CData': ['shortage_max_demand', 'req_max_demand', 'ace_max', 'ace_min'],
+}
+
+
+def split_numeric(value):
+    """Return (number, raw_text) for one stored text cell; markers such as '-' come back as raw_text."""
+    if value is None:
+        return None, None
+    text = str(value).strip()
+    if not text or text.lower() in ('nan', 'none'):
+        return None, None
+    try:
+        number = float(text.replace(',', '').rstrip('%').strip())
+    except ValueError:
+        return None, text
+    return (None, None) if math.isnan(number) else (number, None)
+
+
+def batches(model, fields, using, batch_size=2000):
+    """Yield model rows in id order, batch_size at a time, each batch inside its own transaction."""
+    last_id = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                model.objects.using(using).filter(id__gt=last_id)
+                .order_by('id').only('id', *fields)[:batch_size]
+            )
+            if not batch:
+                return
+            yield batch
+        last_id = batch[-1].id
+
+
+def backfill_numeric_columns(model, fields, using):
+    """Parse each text column `field` into its `field_num` float column, keeping markers in raw_markers."""
+    num_fields = [f"{field}_num" for field in fields]
+    for batch in batches(model, list(fields) + ['raw_markers'], using):
+        for obj in batch:
+            raw = dict(obj.raw_markers or {})
+            for field in fields:
+                number, text = split_numeric(getattr(obj, field))
+                setattr(obj, f"{field}_num", number)
+                if text is not None:
+                    raw[field] = text
+            obj.raw_markers = raw
+        model.objects.using(using).bulk_update(batch, num_fields + ['raw_markers'])
+
+
+def restore_text_columns(model, fields, using):
+    """Reverse of backfill_numeric_columns(): rebuild the text columns from `field_num` and raw_markers."""
+    num_fields = [f"{field}_num" for field in fields]
+    for batch in batches(model, num_fields + ['raw_markers'], using):
+        for obj in batch:
+            raw = obj.raw_markers or {}
+            for field in fields:
+                number = getattr(obj, f"{field}_num")
+                setattr(obj, field, raw.get(field, None if number is None else str(number)))
+        model.objects.using(using).bulk_update(batch, list(fields))
+
+
+def forwards(apps, schema_editor):
+    for model_name, fields in NUMERIC_FIELDS.items():
+        model = apps.get_model('wrldc_app', model_name)
+        backfill_numeric_columns(model, fields, using=schema_editor.connection.alias)
+
+
+def backwards(apps, schema_editor):
+    for model_name, fields in NUMERIC_FIELDS.items():
+        model = apps.get_model('wrldc_app', model_name)
+        restore_text_columns(model, fields, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+    """Step 2 of 3: parse the text history into the float columns, committing batch by batch."""
+
+    atomic = False
+
+    dependencies = [
+        ('wrldc_app', '0006_numeric_columns_add'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,176 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Step 3 of 3: drop the text columns and give the float columns their names."""
+
+    dependencies = [
+        ('wrldc_app', '0007_numeric_columns_backfill'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='thermal',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='thermal_num',
+            new_name='thermal',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='hydro',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='hydro_num',
+            new_name='hydro',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='gas',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='gas_num',
+            new_name='gas',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='solar',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='solar_num',
+            new_name='solar',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='wind',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='wind_num',
+            new_name='wind',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='others',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='others_num',
+            new_name='others',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='total',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='total_num',
+            new_name='total',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='net_sch',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='net_sch_num',
+            new_name='net_sch',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='drawal',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='drawal_num',
+            new_name='drawal',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='ui',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='ui_num',
+            new_name='ui',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='availability',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='availability_num',
+            new_name='availability',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='consumption',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='consumption_num',
+            new_name='consumption',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='shortage',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='shortage_num',
+            new_name='shortage',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2adata',
+            name='requirement',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2adata',
+            old_name='requirement_num',
+            new_name='requirement',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2cdata',
+            name='shortage_max_demand',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2cdata',
+            old_name='shortage_max_demand_num',
+            new_name='shortage_max_demand',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2cdata',
+            name='req_max_demand',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2cdata',
+            old_name='req_max_demand_num',
+            new_name='req_max_demand',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2cdata',
+            name='ace_max',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2cdata',
+            old_name='ace_max_num',
+            new_name='ace_max',
+        ),
+        migrations.RemoveField(
+            model_name='wrldc2cdata',
+            name='ace_min',
+        ),
+        migrations.RenameField(
+            model_name='wrldc2cdata',
+            old_name='ace_min_num',
+            new_name='ace_min',
+        ),
+    ]
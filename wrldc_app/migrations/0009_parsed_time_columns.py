@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wrldc_app', '0008_numeric_columns_swap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='time_ace_max_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='time_ace_min_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='wrldc2cdata',
+            name='time_at',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='wrldc2cdata',
+            index=models.Index(fields=['time_at'], name='wrldc2c_time_at_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:10
+
+import datetime
+import re
+
+from django.db import migrations, transaction
+
+# 'H:MM', 'HH:MM', 'HH.MM', 'HH:MM:SS', optionally followed by AM/PM ('HHMM' is rewritten to 'HH:MM' first)
+TIME_PATTERN = re.compile(r'^(?P<h>\d{1,2})[:.](?P<m>\d{2})(?::(?P<s>\d{2}))?\s*(?P<ampm>[AaPp]\.?[Mm]\.?)?$')
+
+
+def parse_time(value):
+    """One stored time cell as a datetime.time, or None if unparseable; '24:00' is read as midnight."""
+    text = re.sub(r'^(\d{2})(\d{2})$', r'\1:\2', '' if value is None else str(value).strip())
+    match = TIME_PATTERN.match(text)
+    if not match:
+        return None
+    hours, minutes, seconds = int(match['h']), int(match['m']), int(match['s'] or 0)
+    meridiem = (match['ampm'] or ' ')[0].upper()
+    if meridiem == 'P' and hours < 12:
+        hours += 12
+    elif meridiem == 'A' and hours == 12:
+        hours = 0
+    if (hours, minutes, seconds) == (24, 0, 0):
+        hours = 0
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return None
+    return datetime.time(hours, minutes, seconds)
+
+
+def batches(model, fields, using, batch_size=2000, **filters):
+    """Yield model rows in id order, batch_size at a time, each batch inside its own transaction."""
+    last_id = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                model.objects.using(using).filter(id__gt=last_id, **filters)
+                .order_by('id').only('id', *fields)[:batch_size]
+            )
+            if not batch:
+                return
+            yield batch
+        last_id = batch[-1].id
+
+
+def backfill_time_columns(model, fields, using, text_of=getattr, load_fields=None, **filters):
+    """Fill each `field_at` TimeField from the text in `field` (or text_of(obj, field)), batch by batch."""
+    at_fields = [f"{field}_at" for field in fields]
+    for batch in batches(model, load_fields or list(fields), using, **filters):
+        for obj in batch:
+            for field, at_field in zip(fields, at_fields):
+                setattr(obj, at_field, parse_time(text_of(obj, field)))
+        model.objects.using(using).bulk_update(batch, at_fields)
+
+
+TIME_FIELDS = ['time', 'time_ace_max', 'time_ace_min']
+
+
+def forwards(apps, schema_editor):
+    model = apps.get_model('wrldc_app', 'Wrldc2CData')
+    backfill_time_columns(model, TIME_FIELDS, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+    """Parse the existing text time columns into the new `_at` TimeFields, one committed batch at a time."""
+
+    atomic = False
+
+    dependencies = [
+        ('wrldc_app', '0009_parsed_time_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
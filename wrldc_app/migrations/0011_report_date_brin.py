@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wrldc_app', '0010_backfill_parsed_times'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wrldc2adata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='wrldc2a_report_date_brin'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:24
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wrldc_app', '0011_report_date_brin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wrldc2cdata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['report_date'], name='wrldc2c_report_date_brin'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wrldc_app', '0012_report_date_brin_2c'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='wrldc2adata',
+            name='wrldc2a_report_date_brin',
+        ),
+        migrations.RemoveIndex(
+            model_name='wrldc2cdata',
+            name='wrldc2c_report_date_brin',
+        ),
+    ]
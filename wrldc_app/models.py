@@ -5,20 +5,23 @@ class Wrldc2AData(models.Model):
     report_date = models.DateField()  # Multiple states per day allowed
     state = models.CharField(max_length=100, null=True, blank=True)
 
-    thermal = models.CharField(max_length=50, null=True, blank=True)      
-    hydro = models.CharField(max_length=50, null=True, blank=True)        
-    gas = models.CharField(max_length=50, null=True, blank=True)         
-    solar = models.CharField(max_length=50, null=True, blank=True)        
-    wind = models.CharField(max_length=50, null=True, blank=True)         
-    others = models.CharField(max_length=50, null=True, blank=True)       
-    total = models.CharField(max_length=50, null=True, blank=True)        
-    net_sch = models.CharField(max_length=50, null=True, blank=True)      
-    drawal = models.CharField(max_length=50, null=True, blank=True)       
-    ui = models.CharField(max_length=50, null=True, blank=True)           
-    availability = models.CharField(max_length=50, null=True, blank=True) 
-    consumption = models.CharField(max_length=50, null=True, blank=True)  
-    shortage = models.CharField(max_length=50, null=True, blank=True)     
-    requirement = models.CharField(max_length=50, null=True, blank=True)  
+    thermal = models.FloatField(null=True, blank=True)
+    hydro = models.FloatField(null=True, blank=True)
+    gas = models.FloatField(null=True, blank=True)
+    solar = models.FloatField(null=True, blank=True)
+    wind = models.FloatField(null=True, blank=True)
+    others = models.FloatField(null=True, blank=True)
+    total = models.FloatField(null=True, blank=True)
+    net_sch = models.FloatField(null=True, blank=True)
+    drawal = models.FloatField(null=True, blank=True)
+    ui = models.FloatField(null=True, blank=True)
+    availability = models.FloatField(null=True, blank=True)
+    consumption = models.FloatField(null=True, blank=True)
+    shortage = models.FloatField(null=True, blank=True)
+    requirement = models.FloatField(null=True, blank=True)
+
+    # Original text of numeric cells that held a marker such as '-' instead of a number
+    raw_markers = models.JSONField(default=dict, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -37,13 +40,21 @@ class Wrldc2CData(models.Model):
 
     max_demand_day = models.FloatField(null=True, blank=True)
     time = models.CharField(max_length=50, null=True, blank=True)
-    shortage_max_demand = models.CharField(max_length=50, null=True, blank=True)   
-    req_max_demand = models.CharField(max_length=50, null=True, blank=True)    
-    ace_max = models.CharField(max_length=50, null=True, blank=True)                      
+    shortage_max_demand = models.FloatField(null=True, blank=True)
+    req_max_demand = models.FloatField(null=True, blank=True)
+    ace_max = models.FloatField(null=True, blank=True)
     time_ace_max = models.CharField(max_length=50, null=True, blank=True)
-    ace_min = models.CharField(max_length=50, null=True, blank=True)                      
+    ace_min = models.FloatField(null=True, blank=True)
     time_ace_min = models.CharField(max_length=50, null=True, blank=True)
 
+    # Original text of numeric cells that held a marker such as '-' instead of a number
+    raw_markers = models.JSONField(default=dict, blank=True)
+
+    # Parsed times of day of the text time columns (NULL when the text is not a time)
+    time_at = models.TimeField(null=True, blank=True)
+    time_ace_max_at = models.TimeField(null=True, blank=True)
+    time_ace_min_at = models.TimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
 
@@ -53,4 +64,5 @@ class Wrldc2CData(models.Model):
     class Meta:
         verbose_name = "Table 2C Data"
         verbose_name_plural = "Table 2C Data"
-        unique_together = ('report_date', 'state')
\ No newline at end of file
+        unique_together = ('report_date', 'state')
+        indexes = [models.Index(fields=['time_at'], name='wrldc2c_time_at_idx')]
\ No newline at end of file